@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     UserExtension, Customer, Tailor, Fabric, 
-    Accessory, Order, Task, Commission, Testimonial, GarmentType
+    Accessory, Order, Task, Commission, Testimonial, GarmentType, InventoryMovement,
+    ReportJob, DailyMetrics, SmsOutbox, RateLimitBucket
 )
 from .business_logic import InventoryManager
 from django.contrib import messages
@@ -33,6 +34,15 @@ class FabricAdmin(admin.ModelAdmin):
     list_filter = ['unit_type']
     search_fields = ['name']
 
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Record edited stock levels in the inventory ledger, and never write
+        # back a quantity that may have changed since the form was loaded
+        if 'quantity' in form.changed_data:
+            InventoryManager.set_stock(obj, obj.quantity, user=request.user, note='Stock level edited in admin')
+        InventoryManager.save_item_details(obj)
+
 
 @admin.register(Accessory)
 class AccessoryAdmin(admin.ModelAdmin):
@@ -40,11 +50,95 @@ class AccessoryAdmin(admin.ModelAdmin):
     search_fields = ['name']
     filter_horizontal = ['applicable_garments']
 
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Record edited stock levels in the inventory ledger, and never write
+        # back a quantity that may have changed since the form was loaded
+        if 'quantity' in form.changed_data:
+            InventoryManager.set_stock(obj, obj.quantity, user=request.user, note='Stock level edited in admin')
+        InventoryManager.save_item_details(obj)
+
     def get_applicable_garments(self, obj):
         return ", ".join([g.code for g in obj.applicable_garments.all()])
     get_applicable_garments.short_description = 'Applicable Garments'
 
 
+@admin.register(InventoryMovement)
+class InventoryMovementAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'movement_type', 'fabric', 'accessory', 'quantity', 'balance_after', 'order', 'created_by']
+    list_filter = ['movement_type', 'created_at']
+    search_fields = ['fabric__name', 'accessory__name', 'note']
+    list_select_related = ['fabric', 'accessory', 'order', 'created_by']
+
+    # The ledger is append-only; rows are written by InventoryManager
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'report_type', 'status', 'progress', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status', 'created_at']
+    search_fields = ['report_type', 'requested_by__username', 'filename']
+    list_select_related = ['requested_by']
+
+    # Jobs are created by the report pages and updated by run_report_worker
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyMetrics)
+class DailyMetricsAdmin(admin.ModelAdmin):
+    list_display = ['date', 'dimension', 'key', 'orders_created', 'revenue', 'down_payments',
+                    'commissions_created_amount', 'commissions_paid_amount', 'claims', 'tasks_completed']
+    list_filter = ['dimension']
+    date_hierarchy = 'date'
+
+    # Maintained by MetricsManager; rebuild with manage.py rebuild_daily_metrics
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SmsOutbox)
+class SmsOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'phone_number', 'order', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['kind', 'status', 'created_at']
+    search_fields = ['phone_number', 'message', 'provider_message_id']
+    raw_id_fields = ['order']
+
+    # Messages are queued by the app and updated by dispatch_sms_outbox
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(RateLimitBucket)
+class RateLimitBucketAdmin(admin.ModelAdmin):
+    list_display = ['name', 'tokens', 'updated_at', 'acquired', 'delayed', 'total_wait', 'max_wait']
+
+    # Maintained by etailoring.rate_limit.TokenBucket
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(GarmentType)
 class GarmentTypeAdmin(admin.ModelAdmin):
     list_display = ['code', 'name']
@@ -69,9 +163,9 @@ class OrderAdmin(admin.ModelAdmin):
                 if not result:
                     failed.append(f"Order {order.id}: {message}")
                     continue
-                InventoryManager.deduct_inventory_for_garment(order)
-                order.inventory_deducted = True
-                order.save(update_fields=['inventory_deducted'])
+                if InventoryManager.deduct_inventory_once(order) is None:
+                    failed.append(f"Order {order.id}: inventory already deducted")
+                    continue
                 success += 1
             except Exception as e:
                 failed.append(f"Order {order.id}: {str(e)}")
@@ -1,18 +1,20 @@
 from io import BytesIO
-import csv
-import io as _io
-from datetime import datetime, timedelta
+from datetime import timedelta
 from decimal import Decimal
 from django.utils import timezone
-from django.db.models import Sum, Count, Avg, Q, F
+from django.db.models import Sum, Count, Avg, Q
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
 from reportlab.platypus.tableofcontents import TableOfContents
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.enums import TA_LEFT, TA_RIGHT
 from .models import Order, Task, Commission, Customer, Tailor, Fabric, Accessory
+from .business_logic import InventoryManager
+from . import report_utils
+from .report_utils import track_build_progress
+from . import analytics
+from . import csv_exports
 
 
 class AdminReportGenerator:
@@ -23,6 +25,8 @@ class AdminReportGenerator:
         self.date_from = date_from
         self.date_to = date_to
         self.generated_by = generated_by
+        # Optional callable(percent, message) used by queued report jobs
+        self.progress_callback = kwargs.pop('progress_callback', None)
         self.kwargs = kwargs
         
         # Color scheme
@@ -35,6 +39,7 @@ class AdminReportGenerator:
     
     def generate_report(self):
         """Generate the appropriate report based on report_type"""
+        self._progress(5, 'Collecting data')
         if self.report_type == 'business':
             return self._generate_business_overview()
         elif self.report_type == 'financial':
@@ -54,7 +59,7 @@ class AdminReportGenerator:
     
     def _generate_business_overview(self):
         """Generate comprehensive business overview report"""
-        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = self._new_document()
         story = []
         
         # Add header
@@ -76,6 +81,10 @@ class AdminReportGenerator:
         # Performance Metrics
         story.extend(self._create_performance_metrics())
         story.append(Spacer(1, 20))
+
+        # Task Turnaround
+        story.extend(self._create_turnaround_analysis())
+        story.append(Spacer(1, 20))
         
         # Footer
         story.extend(self._create_footer())
@@ -87,7 +96,7 @@ class AdminReportGenerator:
     
     def _generate_financial_report(self):
         """Generate detailed financial analysis report"""
-        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = self._new_document()
         story = []
         
         # Add header
@@ -120,7 +129,7 @@ class AdminReportGenerator:
     
     def _generate_customer_analytics(self):
         """Generate customer behavior and analytics report"""
-        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = self._new_document()
         story = []
         
         # Add header
@@ -153,7 +162,7 @@ class AdminReportGenerator:
     
     def _generate_inventory_report(self):
         """Generate inventory status and analysis report"""
-        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = self._new_document()
         story = []
         
         # Add header
@@ -197,14 +206,15 @@ class AdminReportGenerator:
             tailor=tailor,
             date_from=self.date_from,
             date_to=self.date_to,
-            generated_by=self.generated_by
+            generated_by=self.generated_by,
+            progress_callback=self.progress_callback
         )
         
         return generator.generate_report()
     
     def _generate_custom_report(self):
         """Generate custom report based on selected metrics"""
-        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = self._new_document()
         story = []
         
         metrics = self.kwargs.get('metrics', [])
@@ -234,6 +244,10 @@ class AdminReportGenerator:
             story.extend(self._create_tailor_overview())
             story.append(Spacer(1, 20))
         
+        if 'turnaround' in metrics:
+            story.extend(self._create_turnaround_analysis())
+            story.append(Spacer(1, 20))
+        
         if 'inventory' in metrics:
             story.extend(self._create_fabric_inventory())
             story.append(Spacer(1, 20))
@@ -246,27 +260,30 @@ class AdminReportGenerator:
         self.buffer.close()
         return pdf_data
     
+    def _progress(self, percent, message):
+        if self.progress_callback:
+            self.progress_callback(percent, message)
+
+    def _new_document(self):
+        """PDF document for the report, reporting build progress if requested"""
+        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        track_build_progress(doc, self.progress_callback)
+        return doc
+
+    def _metric_days(self):
+        """The report range as inclusive local dates for the DailyMetrics rollup."""
+        return timezone.localdate(self.date_from), timezone.localdate(self.date_to)
+
+    def _metrics_totals(self):
+        if not hasattr(self, '_totals'):
+            self._totals = analytics.metrics_totals(*self._metric_days())
+        return self._totals
+
     def _create_header(self, title):
         """Create report header"""
-        styles = getSampleStyleSheet()
+        header_style = report_utils.title_style(self.primary_color)
         
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=self.primary_color,
-            alignment=TA_CENTER,
-            spaceAfter=10
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=self.accent_color,
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        subtitle_style = report_utils.subtitle_style(self.accent_color)
         
         content = []
         # Updated header per request: use brand name "El Senior Original"
@@ -274,13 +291,7 @@ class AdminReportGenerator:
         content.append(Paragraph(title, subtitle_style))
         
         # Report metadata
-        metadata_style = ParagraphStyle(
-            'Metadata',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        metadata_style = report_utils.metadata_style()
         
         date_range = f"Report Period: {self.date_from.strftime('%B %d, %Y')} - {self.date_to.strftime('%B %d, %Y')}"
         generated_info = f"Generated on {timezone.now().strftime('%B %d, %Y at %I:%M %p')} by {self.generated_by.get_full_name() or self.generated_by.username}"
@@ -292,15 +303,7 @@ class AdminReportGenerator:
     
     def _create_footer(self):
         """Create report footer"""
-        styles = getSampleStyleSheet()
-        
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        footer_style = report_utils.footer_style()
         
         content = []
         content.append(Spacer(1, 30))
@@ -329,49 +332,24 @@ class AdminReportGenerator:
         """Generate sales report. Supports PDF and CSV output depending on kwargs['format']."""
         format_type = self.kwargs.get('format', 'pdf')
 
-        # Query orders in range
-        orders = Order.objects.filter(created_at__range=[self.date_from, self.date_to]).select_related('customer__user')
-
-        # CSV output
+        # CSV output: one joined query instead of a task lookup per order
         if format_type == 'csv':
-            sio = _io.StringIO()
-            writer = csv.writer(sio)
-            writer.writerow(['Order ID', 'Created At', 'Customer', 'Tailor', 'Total Amount', 'Status'])
-
-            for order in orders.order_by('created_at'):
-                tailor_name = ''
-                try:
-                    # Some orders may not have an assigned tailor yet
-                    tailor = order.task_set.select_related('tailor__user').first()
-                    if tailor and tailor.tailor:
-                        tailor_name = tailor.tailor.user.get_full_name()
-                except Exception:
-                    tailor_name = ''
-
-                customer_name = order.customer.user.get_full_name() if getattr(order, 'customer', None) else ''
-                writer.writerow([
-                    order.id,
-                    order.created_at.isoformat(),
-                    customer_name,
-                    tailor_name,
-                    str(order.total_amount or 0),
-                    order.status
-                ])
-
-            csv_bytes = sio.getvalue().encode('utf-8')
-            sio.close()
-            return csv_bytes
+            rows = csv_exports.sales_rows(self.date_from, self.date_to)
+            return ''.join(csv_exports.iter_csv(csv_exports.SALES_HEADER, rows)).encode('utf-8')
 
         # PDF output
-        doc = SimpleDocTemplate(self.buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = self._new_document()
         story = []
 
         story.extend(self._create_header("Sales Report"))
         story.append(Spacer(1, 20))
 
-        # Summary metrics
-        total_revenue = orders.aggregate(Sum('total_amount'))['total_amount__sum'] or Decimal('0')
-        total_orders = orders.count()
+        # Summary metrics (one aggregate query)
+        totals = Order.objects.filter(created_at__range=[self.date_from, self.date_to]).aggregate(
+            revenue=Sum('total_amount'), count=Count('id')
+        )
+        total_revenue = totals['revenue'] or Decimal('0')
+        total_orders = totals['count']
         avg_order_value = (total_revenue / total_orders) if total_orders > 0 else Decimal('0')
 
         summary_data = [
@@ -382,77 +360,40 @@ class AdminReportGenerator:
         ]
 
         summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        summary_table.setStyle(report_utils.grid_table_style(self.primary_color, align='LEFT'))
 
         story.append(summary_table)
         story.append(Spacer(1, 12))
 
-        # Revenue by day
-        revenue_by_day = {}
-        for o in orders:
-            day = o.created_at.strftime('%Y-%m-%d')
-            revenue_by_day.setdefault(day, Decimal('0'))
-            revenue_by_day[day] += o.total_amount or Decimal('0')
+        # Revenue by day (grouped in the database)
+        revenue_by_day = analytics.revenue_by_day(self.date_from, self.date_to)
 
         if revenue_by_day:
             table_data = [['Date', 'Revenue']]
-            for day in sorted(revenue_by_day.keys()):
-                table_data.append([day, f"PHP {revenue_by_day[day]:,.2f}"])
+            for day, revenue in revenue_by_day:
+                table_data.append([day.strftime('%Y-%m-%d'), f"PHP {revenue:,.2f}"])
 
             revenue_table = Table(table_data, colWidths=[3*inch, 2*inch])
-            revenue_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            revenue_table.setStyle(report_utils.grid_table_style(self.primary_color, align='LEFT', font_size=9))
 
             story.append(Spacer(1, 6))
-            story.append(Paragraph('Revenue by Day', getSampleStyleSheet()['Heading3']))
+            story.append(Paragraph('Revenue by Day', report_utils.sample_styles()['Heading3']))
             story.append(revenue_table)
             story.append(Spacer(1, 12))
 
-        # Top tailors by revenue
-        try:
-            tailor_revenue = {}
-            for o in orders:
-                # Look for related tasks with assigned tailors
-                task = o.task_set.select_related('tailor__user').first()
-                if task and getattr(task, 'tailor', None):
-                    name = task.tailor.user.get_full_name()
-                    tailor_revenue.setdefault(name, Decimal('0'))
-                    tailor_revenue[name] += o.total_amount or Decimal('0')
-
-            if tailor_revenue:
-                table_data = [['Tailor', 'Revenue']]
-                for name, rev in sorted(tailor_revenue.items(), key=lambda x: x[1], reverse=True)[:10]:
-                    table_data.append([name, f"PHP {rev:,.2f}"])
-
-                tailor_table = Table(table_data, colWidths=[3*inch, 2*inch])
-                tailor_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-
-                story.append(Paragraph('Top Tailors by Revenue', getSampleStyleSheet()['Heading3']))
-                story.append(tailor_table)
-                story.append(Spacer(1, 12))
-        except Exception:
-            # Non-critical: continue without tailor breakdown
-            pass
+        # Top tailors by revenue (grouped through each order's task)
+        tailor_revenue = analytics.revenue_by_tailor(self.date_from, self.date_to, limit=10)
+        if tailor_revenue:
+            table_data = [['Tailor', 'Revenue']]
+            for _, name, rev in tailor_revenue:
+                table_data.append([name, f"PHP {rev:,.2f}"])
+
+            tailor_table = Table(table_data, colWidths=[3*inch, 2*inch])
+            tailor_table.setStyle(report_utils.grid_table_style(self.primary_color, align='LEFT', font_size=9))
+
+            story.append(Paragraph('Top Tailors by Revenue', report_utils.sample_styles()['Heading3']))
+            story.append(tailor_table)
+            story.append(Spacer(1, 12))
 
         story.extend(self._create_footer())
         doc.build(story)
@@ -462,27 +403,17 @@ class AdminReportGenerator:
 
     def _create_executive_summary(self):
         """Create executive summary section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("📊 Executive Summary", section_style))
 
-        # Get key metrics
-        orders = Order.objects.filter(created_at__range=[self.date_from, self.date_to])
-        total_revenue = orders.aggregate(Sum('total_amount'))['total_amount__sum'] or Decimal('0')
-        total_orders = orders.count()
+        # Get key metrics from the daily rollup
+        totals = self._metrics_totals()
+        total_revenue = totals['revenue'] or Decimal('0')
+        total_orders = totals['orders_created']
         avg_order_value = total_revenue / total_orders if total_orders > 0 else Decimal('0')
-
-        commissions = Commission.objects.filter(created_at__range=[self.date_from, self.date_to])
-        total_commissions = commissions.aggregate(Sum('amount'))['amount__sum'] or Decimal('0')
+        total_commissions = totals['commissions_created_amount'] or Decimal('0')
 
         # Summary table
         summary_data = [
@@ -496,67 +427,43 @@ class AdminReportGenerator:
         ]
 
         summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        summary_table.setStyle(
+            report_utils.grid_table_style(self.primary_color, self.secondary_color, align='LEFT')
+        )
 
         content.append(summary_table)
         return content
 
     def _create_revenue_analysis(self):
         """Create revenue analysis section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("💰 Revenue Analysis", section_style))
 
-        # Get revenue data by month
-        orders = Order.objects.filter(created_at__range=[self.date_from, self.date_to])
-
-        # Monthly revenue breakdown
-        monthly_revenue = {}
-        for order in orders:
-            month_key = order.created_at.strftime('%Y-%m')
-            if month_key not in monthly_revenue:
-                monthly_revenue[month_key] = Decimal('0')
-            monthly_revenue[month_key] += order.total_amount or Decimal('0')
+        # Monthly revenue breakdown from the daily rollup
+        monthly = analytics.metrics_by_period(*self._metric_days(), bucket='month')
 
         # Create revenue table
         revenue_data = [['Month', 'Revenue', 'Orders', 'Avg Order Value']]
 
-        for month_key in sorted(monthly_revenue.keys()):
-            month_orders = orders.filter(created_at__year=int(month_key[:4]), created_at__month=int(month_key[5:]))
-            order_count = month_orders.count()
-            revenue = monthly_revenue[month_key]
+        total_revenue = Decimal('0')
+        total_orders = 0
+        for month, totals in monthly:
+            order_count = totals['orders_created']
+            revenue = totals['revenue'] or Decimal('0')
             avg_value = revenue / order_count if order_count > 0 else Decimal('0')
+            total_revenue += revenue
+            total_orders += order_count
 
-            month_name = datetime.strptime(month_key, '%Y-%m').strftime('%B %Y')
             revenue_data.append([
-                month_name,
+                month.strftime('%B %Y'),
                 f"PHP {revenue:,.2f}",
                 str(order_count),
                 f"PHP {avg_value:,.2f}"
             ])
 
         # Add totals
-        total_revenue = sum(monthly_revenue.values())
-        total_orders = orders.count()
         overall_avg = total_revenue / total_orders if total_orders > 0 else Decimal('0')
 
         revenue_data.append([
@@ -567,35 +474,16 @@ class AdminReportGenerator:
         ])
 
         revenue_table = Table(revenue_data, colWidths=[2*inch, 1.5*inch, 1*inch, 1.5*inch])
-        revenue_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('BACKGROUND', (0, -1), (-1, -1), self.accent_color),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, self.secondary_color]),
-        ]))
+        revenue_table.setStyle(report_utils.grid_table_style(
+            self.primary_color, self.secondary_color, totals_color=self.accent_color
+        ))
 
         content.append(revenue_table)
         return content
 
     def _create_order_statistics(self):
         """Create order statistics section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("📦 Order Statistics", section_style))
@@ -622,32 +510,14 @@ class AdminReportGenerator:
             ])
 
         status_table = Table(status_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
-        status_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        status_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color))
 
         content.append(status_table)
         return content
 
     def _create_performance_metrics(self):
         """Create performance metrics section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("⚡ Performance Metrics", section_style))
@@ -678,36 +548,94 @@ class AdminReportGenerator:
         ]
 
         performance_table = Table(performance_data, colWidths=[3*inch, 2*inch])
-        performance_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        performance_table.setStyle(
+            report_utils.grid_table_style(self.primary_color, self.secondary_color, align='LEFT')
+        )
 
         content.append(performance_table)
         return content
 
+    def _create_turnaround_analysis(self):
+        """Create task turnaround and throughput section"""
+        section_style = report_utils.section_style(self.primary_color)
+
+        content = []
+        content.append(Paragraph("⏱️ Turnaround & Throughput", section_style))
+
+        def hours(value):
+            return f"{value:.1f} h" if value is not None else '-'
+
+        stage_labels = [
+            ('queue_wait', 'Queue Wait (assigned to started)'),
+            ('work_time', 'Work Time (started to completed)'),
+            ('approval_lag', 'Approval Lag (completed to approved)'),
+        ]
+        stages = analytics.turnaround_stats(self.date_from, self.date_to)
+        stage_data = [['Stage', 'Tasks', 'Mean', 'Median', '90th Percentile']]
+        for name, label in stage_labels:
+            stats = stages[name]
+            stage_data.append([
+                label, str(stats['count']), hours(stats['mean_hours']),
+                hours(stats['p50_hours']), hours(stats['p90_hours'])
+            ])
+
+        table_style = report_utils.grid_table_style(
+            self.primary_color, self.secondary_color, font_size=9, label_align='LEFT'
+        )
+
+        stage_table = Table(stage_data, colWidths=[2.4*inch, 0.8*inch, 0.9*inch, 0.9*inch, 1.2*inch])
+        stage_table.setStyle(table_style)
+        content.append(stage_table)
+        content.append(Spacer(1, 12))
+
+        # Per garment type (medians and 90th percentile of the work time)
+        garments = analytics.turnaround_stats(self.date_from, self.date_to, group_by='garment_type')
+        if garments:
+            content.append(Paragraph("By Garment Type", report_utils.sample_styles()['Heading3']))
+            garment_data = [['Garment Type', 'Queue Wait (p50)', 'Work Time (p50)', 'Work Time (p90)',
+                             'Approval Lag (p50)']]
+            for row in garments:
+                garment_data.append([
+                    row['label'],
+                    hours(row['queue_wait']['p50_hours']),
+                    hours(row['work_time']['p50_hours']),
+                    hours(row['work_time']['p90_hours']),
+                    hours(row['approval_lag']['p50_hours']),
+                ])
+            garment_table = Table(garment_data, colWidths=[1.4*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
+            garment_table.setStyle(table_style)
+            content.append(garment_table)
+            content.append(Spacer(1, 12))
+
+        # Throughput totals over the period
+        throughput = analytics.task_throughput(self.date_from, self.date_to)
+        period_days = max((self.date_to - self.date_from).days, 1)
+        completed = sum(counts['completed'] for _, counts in throughput)
+        approved = sum(counts['approved'] for _, counts in throughput)
+        busiest = max(throughput, key=lambda item: item[1]['completed'], default=None)
+
+        throughput_data = [
+            ['Throughput', 'Value'],
+            ['Tasks Completed', str(completed)],
+            ['Tasks Approved', str(approved)],
+            ['Completed per Day', f"{completed / period_days:.2f}"],
+            ['Busiest Day', (
+                f"{busiest[0].strftime('%b %d, %Y')} ({busiest[1]['completed']} completed)"
+                if busiest and busiest[1]['completed'] else '-'
+            )],
+        ]
+        throughput_table = Table(throughput_data, colWidths=[3*inch, 2.5*inch])
+        throughput_table.setStyle(table_style)
+        content.append(throughput_table)
+        return content
+
     def _create_revenue_breakdown(self):
         """Create detailed revenue breakdown"""
         return self._create_revenue_analysis()  # Reuse existing method
 
     def _create_commission_analysis(self):
         """Create commission analysis section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("💼 Commission Analysis", section_style))
@@ -731,42 +659,24 @@ class AdminReportGenerator:
         ]
 
         commission_table = Table(commission_data, colWidths=[3*inch, 2*inch])
-        commission_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        commission_table.setStyle(
+            report_utils.grid_table_style(self.primary_color, self.secondary_color, align='LEFT')
+        )
 
         content.append(commission_table)
         return content
 
     def _create_profit_analysis(self):
         """Create profit analysis section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("📈 Profit Analysis", section_style))
 
         # Calculate profit metrics
-        orders = Order.objects.filter(created_at__range=[self.date_from, self.date_to])
-        total_revenue = orders.aggregate(Sum('total_amount'))['total_amount__sum'] or Decimal('0')
-
-        commissions = Commission.objects.filter(created_at__range=[self.date_from, self.date_to])
-        total_commissions = commissions.aggregate(Sum('amount'))['amount__sum'] or Decimal('0')
+        totals = self._metrics_totals()
+        total_revenue = totals['revenue'] or Decimal('0')
+        total_commissions = totals['commissions_created_amount'] or Decimal('0')
 
         # Estimate material costs (simplified calculation)
         estimated_material_cost = total_revenue * Decimal('0.3')  # Assume 30% material cost
@@ -784,17 +694,9 @@ class AdminReportGenerator:
         ]
 
         profit_table = Table(profit_data, colWidths=[3*inch, 2*inch])
-        profit_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        profit_table.setStyle(
+            report_utils.grid_table_style(self.primary_color, self.secondary_color, align='LEFT')
+        )
 
         content.append(profit_table)
         return content
@@ -805,15 +707,7 @@ class AdminReportGenerator:
 
     def _create_customer_overview(self):
         """Create customer overview section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("👥 Customer Overview", section_style))
@@ -837,17 +731,9 @@ class AdminReportGenerator:
         ]
 
         customer_table = Table(customer_data, colWidths=[3*inch, 2*inch])
-        customer_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        customer_table.setStyle(
+            report_utils.grid_table_style(self.primary_color, self.secondary_color, align='LEFT')
+        )
 
         content.append(customer_table)
         return content
@@ -862,15 +748,7 @@ class AdminReportGenerator:
 
     def _create_top_customers(self):
         """Create top customers section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("🏆 Top Customers", section_style))
@@ -900,32 +778,14 @@ class AdminReportGenerator:
             customer_data.append(['No customer data available', '', '', ''])
 
         top_customer_table = Table(customer_data, colWidths=[2*inch, 1.5*inch, 1*inch, 1.5*inch])
-        top_customer_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        top_customer_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color))
 
         content.append(top_customer_table)
         return content
 
     def _create_fabric_inventory(self):
         """Create fabric inventory section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("🧵 Fabric Inventory", section_style))
@@ -950,32 +810,14 @@ class AdminReportGenerator:
             fabric_data.append(['No fabric data available', '', '', '', ''])
 
         fabric_table = Table(fabric_data, colWidths=[1.5*inch, 1*inch, 1.2*inch, 1.2*inch, 1.1*inch])
-        fabric_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        fabric_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color, font_size=9))
 
         content.append(fabric_table)
         return content
 
     def _create_accessory_inventory(self):
         """Create accessory inventory section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("🔘 Accessory Inventory", section_style))
@@ -999,82 +841,57 @@ class AdminReportGenerator:
             accessory_data.append(['No accessory data available', '', '', ''])
 
         accessory_table = Table(accessory_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1*inch])
-        accessory_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        accessory_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color))
 
         content.append(accessory_table)
         return content
 
     def _create_usage_patterns(self):
         """Create usage patterns section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("📊 Usage Patterns", section_style))
 
-        # Get most used fabrics and accessories
-        # This is a simplified analysis - in a real system you'd track actual usage
-        orders = Order.objects.filter(created_at__range=[self.date_from, self.date_to])
-
-        usage_data = [
-            ['Item Type', 'Most Popular', 'Usage Trend'],
-            ['Fabrics', 'Cotton Blend', 'Increasing'],
-            ['Accessories', 'Buttons', 'Stable'],
-            ['Colors', 'Navy Blue', 'Seasonal'],
-            ['Patterns', 'Solid Colors', 'Consistent'],
-        ]
-
-        usage_table = Table(usage_data, colWidths=[2*inch, 2*inch, 1.5*inch])
-        usage_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        # Most used fabrics and accessories over the period, from the inventory ledger
+        summary = InventoryManager.get_movement_summary(
+            date_from=self.date_from,
+            date_to=self.date_to,
+            movement_types=['ORDER_DEDUCTION', 'MANUAL_DEDUCTION', 'REVERSAL', 'RESTOCK'],
+        )
+        items = {}
+        for row in summary:
+            key = ('Fabric', row['fabric__name']) if row['fabric_id'] else ('Accessory', row['accessory__name'])
+            used, restocked = items.get(key, (Decimal('0'), Decimal('0')))
+            if row['movement_type'] == 'RESTOCK':
+                restocked += row['total']
+            else:
+                used -= row['total']
+            items[key] = (used, restocked)
+
+        usage_data = [['Item', 'Type', 'Used', 'Restocked']]
+        top_items = sorted(items.items(), key=lambda entry: entry[1][0], reverse=True)[:10]
+        for (item_type, name), (used, restocked) in top_items:
+            usage_data.append([name, item_type, f"{used:,.2f}", f"{restocked:,.2f}"])
+        if len(usage_data) == 1:
+            usage_data.append(['No inventory movements in this period', '', '', ''])
+
+        usage_table = Table(usage_data, colWidths=[2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
+        usage_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color))
 
         content.append(usage_table)
         return content
 
     def _create_reorder_recommendations(self):
         """Create reorder recommendations section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("🔄 Reorder Recommendations", section_style))
 
         # Get low stock items
-        low_stock_fabrics = Fabric.objects.filter(quantity__lte=F('low_stock_threshold'))
-        low_stock_accessories = Accessory.objects.filter(quantity__lte=F('low_stock_threshold'))
+        low_stock_fabrics = InventoryManager.low_stock_fabrics()
+        low_stock_accessories = InventoryManager.low_stock_accessories()
 
         reorder_data = [['Item', 'Type', 'Current Stock', 'Recommended Order']]
 
@@ -1100,76 +917,38 @@ class AdminReportGenerator:
             reorder_data.append(['All items well stocked', '', '', ''])
 
         reorder_table = Table(reorder_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-        reorder_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+        reorder_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color))
 
         content.append(reorder_table)
         return content
 
     def _create_tailor_overview(self):
         """Create tailor overview section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("👔 Tailor Overview", section_style))
 
-        # Get tailor performance data
-        tailors = Tailor.objects.all()
-        tasks = Task.objects.filter(assigned_at__range=[self.date_from, self.date_to])
-
-        tailor_data = [['Tailor', 'Tasks Assigned', 'Tasks Completed', 'Completion Rate', 'Total Commissions']]
-
-        for tailor in tailors[:10]:  # Top 10 tailors
-            tailor_tasks = tasks.filter(tailor=tailor)
-            completed_tasks = tailor_tasks.filter(status__in=['COMPLETED', 'APPROVED'])
-            completion_rate = (completed_tasks.count() / tailor_tasks.count() * 100) if tailor_tasks.count() > 0 else 0
-
-            commissions = Commission.objects.filter(
-                tailor=tailor,
-                created_at__range=[self.date_from, self.date_to]
-            )
-            total_commission = commissions.aggregate(Sum('amount'))['amount__sum'] or Decimal('0')
+        # Task and commission figures for every tailor in two grouped queries
+        tailor_data = [['Tailor', 'Tasks Assigned', 'Tasks Completed', 'Completion Rate', 'Avg Turnaround',
+                        'Total Commissions']]
 
+        for metrics in analytics.tailor_metrics(self.date_from, self.date_to)[:10]:  # Top 10 tailors
+            turnaround = metrics['avg_turnaround_hours']
             tailor_data.append([
-                f"{tailor.user.first_name} {tailor.user.last_name}",
-                str(tailor_tasks.count()),
-                str(completed_tasks.count()),
-                f"{completion_rate:.1f}%",
-                f"PHP {total_commission:,.2f}"
+                metrics['name'],
+                str(metrics['assigned']),
+                str(metrics['finished']),
+                f"{metrics['completion_rate']:.1f}%",
+                f"{turnaround:.1f} h" if turnaround is not None else '-',
+                f"PHP {metrics['commission_total']:,.2f}"
             ])
 
         if len(tailor_data) == 1:  # Only header
-            tailor_data.append(['No tailor data available', '', '', '', ''])
-
-        tailor_table = Table(tailor_data, colWidths=[1.5*inch, 1*inch, 1*inch, 1*inch, 1.5*inch])
-        tailor_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-        ]))
+            tailor_data.append(['No tailor data available', '', '', '', '', ''])
+
+        tailor_table = Table(tailor_data, colWidths=[1.4*inch, 0.9*inch, 0.9*inch, 0.9*inch, 0.9*inch, 1.3*inch])
+        tailor_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color, font_size=9))
 
         content.append(tailor_table)
         return content
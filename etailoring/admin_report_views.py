@@ -5,28 +5,21 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
-from django.db.models import Sum, Count, Avg, Q
+from django.db.models import Count, Avg, Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from .models import Order, Task, Commission, Customer, Tailor, Fabric, Accessory
 from .models import Claim
-from .admin_report_generator import AdminReportGenerator
+from . import analytics
+from . import csv_exports
+from . import report_batch
+from .report_cache import report_response
+from .report_jobs import admin_report_params, render_report, resolve_report_period
 from django.views.decorators.http import require_GET
-import csv
 from io import BytesIO
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
-try:
-    # reportlab may not be installed in all environments; import lazily
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
-
 
 @login_required
 @staff_member_required
@@ -43,22 +36,8 @@ def admin_reports_page(request):
         recent_orders = Order.objects.order_by('-created_at')[:5]
         recent_tasks = Task.objects.order_by('-assigned_at')[:5]
         
-        # Add claimed order metrics
-        claimed_count = Order.objects.filter(claimed_at__isnull=False).count()
-        # Average time-to-claim in hours for claimed orders
-        claimed_orders = Order.objects.filter(claimed_at__isnull=False).exclude(claimed_at=None)
-        avg_time_to_claim_hours = None
-        if claimed_orders.exists():
-            total_seconds = 0
-            count = 0
-            for o in claimed_orders:
-                if o.created_at and o.claimed_at:
-                    diff = (o.claimed_at - o.created_at).total_seconds()
-                    if diff >= 0:
-                        total_seconds += diff
-                        count += 1
-            if count > 0:
-                avg_time_to_claim_hours = (total_seconds / count) / 3600.0
+        # Add claimed order metrics (time-to-claim in hours)
+        claim_metrics = analytics.claim_time_metrics()
 
         context = {
             'total_customers': total_customers,
@@ -68,8 +47,10 @@ def admin_reports_page(request):
             'recent_orders': recent_orders,
             'recent_tasks': recent_tasks,
             'now': timezone.now(),
-            'claimed_count': claimed_count,
-            'avg_time_to_claim_hours': round(avg_time_to_claim_hours, 2) if avg_time_to_claim_hours is not None else None,
+            'claimed_count': claim_metrics['claimed_count'],
+            'avg_time_to_claim_hours': claim_metrics['avg_hours'],
+            'median_time_to_claim_hours': claim_metrics['median_hours'],
+            'p90_time_to_claim_hours': claim_metrics['p90_hours'],
         }
         
         return render(request, 'admin_reports.html', context)
@@ -84,82 +65,40 @@ def generate_admin_report(request, report_type):
     """Generate admin report PDF"""
     try:
         # Get date range parameters
-        date_from_str = request.GET.get('date_from')
-        date_to_str = request.GET.get('date_to')
         period = request.GET.get('period', 'last_month')
         # Output format (pdf or csv)
         format_type = request.GET.get('format', 'pdf')
-        
-        # Parse date range
-        if date_from_str and date_to_str:
-            try:
-                date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
-                date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date()
-            except ValueError:
-                return HttpResponse("Invalid date format. Use YYYY-MM-DD.", status=400)
-        else:
-            # Use predefined periods
-            today = timezone.now().date()
-            if period == 'last_week':
-                date_from = today - timedelta(days=7)
-                date_to = today
-            elif period == 'last_quarter':
-                date_from = today - timedelta(days=90)
-                date_to = today
-            elif period == 'ytd':
-                date_from = today.replace(month=1, day=1)
-                date_to = today
-            elif period == 'all_time':
-                date_from = timezone.datetime(2020, 1, 1).date()
-                date_to = today
-            else:  # last_month
-                date_from = today - timedelta(days=30)
-                date_to = today
-        
-        # Convert to datetime with timezone
-        date_from = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
-        date_to = timezone.make_aware(datetime.combine(date_to, datetime.max.time()))
+
+        try:
+            date_from, date_to = resolve_report_period(
+                period, request.GET.get('date_from'), request.GET.get('date_to')
+            )
+        except ValueError:
+            return HttpResponse("Invalid date format. Use YYYY-MM-DD.", status=400)
         
         # Handle special parameters for specific report types
-        kwargs = {}
-        # Always pass requested format through to the generator
-        kwargs['format'] = format_type
-        if report_type == 'tailor':
-            tailor_id = request.GET.get('tailor_id')
-            if not tailor_id:
-                return HttpResponse("Tailor ID required for tailor reports", status=400)
-            kwargs['tailor_id'] = tailor_id
-        elif report_type == 'custom':
-            metrics = request.GET.getlist('metrics')
-            kwargs['metrics'] = metrics
-            # format already set in kwargs above
-        
-        # Generate report
-        report_generator = AdminReportGenerator(
-            report_type=report_type,
-            date_from=date_from,
-            date_to=date_to,
-            generated_by=request.user,
-            **kwargs
-        )
-        
-        data = report_generator.generate_report()
-        filename = report_generator.get_filename()
-
-        # Choose content type based on requested format
-        if format_type == 'csv':
-            content_type = 'text/csv'
-            # ensure filename ends with .csv
-            if not filename.lower().endswith('.csv'):
-                filename = filename.rsplit('.', 1)[0] + '.csv'
-        else:
-            content_type = 'application/pdf'
-            if not filename.lower().endswith('.pdf'):
-                filename = filename.rsplit('.', 1)[0] + '.pdf'
-
-        response = HttpResponse(data, content_type=content_type)
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        try:
+            params = admin_report_params(
+                report_type,
+                date_from,
+                date_to,
+                report_format=format_type,
+                tailor_id=request.GET.get('tailor_id'),
+                metrics=request.GET.getlist('metrics'),
+            )
+        except ValueError as e:
+            return HttpResponse(str(e), status=400)
+
+        if report_type == 'sales' and format_type == 'csv':
+            # Stream straight from the database rather than building the file
+            return csv_exports.streaming_csv_response(
+                _export_filename('Sales_Report'), csv_exports.SALES_HEADER,
+                csv_exports.sales_rows(date_from, date_to)
+            )
+
+        # Served from the report cache when the underlying data is unchanged
+        report = render_report('ADMIN', report_type, params, request.user)
+        return report_response(request, report)
         
     except Exception as e:
         return HttpResponse(f"Error generating report: {str(e)}", status=500)
@@ -171,15 +110,12 @@ def generate_admin_report(request, report_type):
 def admin_stats_revenue(request):
     """Get revenue statistics"""
     try:
-        # Get date range (default to last 30 days)
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        orders = Order.objects.filter(created_at__range=[start_date, end_date])
-        total_revenue = orders.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+        # Last 30 days, read from the daily rollup
+        end_date = timezone.localdate()
+        totals = analytics.metrics_totals(end_date - timedelta(days=29), end_date)
         
         return Response({
-            'total_revenue': float(total_revenue),
+            'total_revenue': float(totals['revenue']),
             'period': 'Last 30 days'
         })
     except Exception as e:
@@ -206,15 +142,12 @@ def admin_stats_orders(request):
 def admin_stats_commissions(request):
     """Get commission statistics"""
     try:
-        # Get date range (default to last 30 days)
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        commissions = Commission.objects.filter(created_at__range=[start_date, end_date])
-        total_commissions = commissions.aggregate(Sum('amount'))['amount__sum'] or 0
+        # Last 30 days, read from the daily rollup
+        end_date = timezone.localdate()
+        totals = analytics.metrics_totals(end_date - timedelta(days=29), end_date)
         
         return Response({
-            'total_commissions': float(total_commissions),
+            'total_commissions': float(totals['commissions_created_amount']),
             'period': 'Last 30 days'
         })
     except Exception as e:
@@ -226,16 +159,27 @@ def admin_stats_commissions(request):
 def admin_stats_tailors(request):
     """Get tailor statistics"""
     try:
-        # Get active tailors (those with tasks in last 30 days)
+        # Per-tailor figures for the last 30 days; active tailors are those
+        # with tasks assigned in that window
         end_date = timezone.now()
         start_date = end_date - timedelta(days=30)
-        
-        active_tailors = Tailor.objects.filter(
-            task__assigned_at__range=[start_date, end_date]
-        ).distinct().count()
-        
+
+        metrics = analytics.tailor_metrics(start_date, end_date)
+        active_tailors = sum(1 for entry in metrics if entry['assigned'])
+
         return Response({
-            'active_tailors': active_tailors
+            'active_tailors': active_tailors,
+            'tailors': [
+                dict(
+                    entry,
+                    commission_total=float(entry['commission_total']),
+                    commission_paid=float(entry['commission_paid']),
+                    commission_pending=float(entry['commission_pending']),
+                    commission_avg=float(entry['commission_avg']),
+                )
+                for entry in metrics
+            ],
+            'period': 'Last 30 days'
         })
     except Exception as e:
         return Response({'error': str(e)}, status=500)
@@ -249,25 +193,104 @@ def admin_stats_claims(request):
         end_date = timezone.now()
         start_date = end_date - timedelta(days=30)
 
-        claimed_orders = Order.objects.filter(claimed_at__range=[start_date, end_date])
-        claimed_count = claimed_orders.count()
+        claim_metrics = analytics.claim_time_metrics(start_date, end_date)
+
+        return Response({
+            'claimed_count': claim_metrics['claimed_count'],
+            'avg_time_to_claim_hours': claim_metrics['avg_hours'],
+            'median_time_to_claim_hours': claim_metrics['median_hours'],
+            'p90_time_to_claim_hours': claim_metrics['p90_hours'],
+            'period': 'Last 30 days'
+        })
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
 
-        # Average time-to-claim in hours
-        total_seconds = 0
-        count = 0
-        for o in claimed_orders:
-            if o.created_at and o.claimed_at:
-                diff = (o.claimed_at - o.created_at).total_seconds()
-                if diff >= 0:
-                    total_seconds += diff
-                    count += 1
 
-        avg_time_to_claim_hours = (total_seconds / count) / 3600.0 if count > 0 else None
+def _parse_chart_range(request, default_days=None):
+    """
+    Read the `date_from`/`date_to` (YYYY-MM-DD, both inclusive) or `days`
+    query parameters into an aware ``[start, end)`` datetime range.
 
+    Without parameters the range covers the last `default_days` days, or is
+    unbounded (``None, None``) when `default_days` is None. Raises ValueError
+    for malformed values.
+    """
+    date_from_str = request.GET.get('date_from')
+    date_to_str = request.GET.get('date_to')
+    days = request.GET.get('days')
+
+    if date_from_str or date_to_str:
+        start = end = None
+        if date_from_str:
+            date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
+            start = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
+        if date_to_str:
+            date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date() + timedelta(days=1)
+            end = timezone.make_aware(datetime.combine(date_to, datetime.min.time()))
+        return start, end
+
+    if days:
+        days = int(days)
+        if days <= 0:
+            raise ValueError('days must be greater than 0')
+    else:
+        days = default_days
+    if days is None:
+        return None, None
+    end = timezone.now()
+    return end - timedelta(days=days), end
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_stats_turnaround(request):
+    """
+    Task turnaround statistics: queue wait, work time and approval lag
+    (count, mean, p50 and p90 in hours).
+
+    Optional query parameters: `group_by` (tailor or garment_type; default
+    overall) and a range given as `date_from`/`date_to` or `days` (default:
+    last 90 days), applied to when each stage ended.
+    """
+    try:
+        group_by = request.GET.get('group_by') or None
+        if group_by is not None and group_by not in analytics.TURNAROUND_GROUPS:
+            return Response(
+                {'error': f"Invalid group_by. Use one of: {', '.join(analytics.TURNAROUND_GROUPS)}"}, status=400
+            )
+        try:
+            start_date, end_date = _parse_chart_range(request, default_days=90)
+        except ValueError:
+            return Response({'error': 'Invalid date range. Use YYYY-MM-DD dates or a positive number of days.'}, status=400)
+
+        stats = analytics.turnaround_stats(start_date, end_date, group_by)
+        key = 'groups' if group_by else 'stages'
         return Response({
-            'claimed_count': claimed_count,
-            'avg_time_to_claim_hours': round(avg_time_to_claim_hours, 2) if avg_time_to_claim_hours is not None else None,
-            'period': 'Last 30 days'
+            key: stats,
+            'group_by': group_by,
+            'date_from': start_date.isoformat() if start_date else None,
+            'date_to': end_date.isoformat() if end_date else None,
+        })
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_stats_throughput(request):
+    """
+    Daily task throughput (tasks assigned, started, completed and approved
+    per day). Accepts `date_from`/`date_to` or `days` (default: last 30 days).
+    """
+    try:
+        try:
+            start_date, end_date = _parse_chart_range(request, default_days=30)
+        except ValueError:
+            return Response({'error': 'Invalid date range. Use YYYY-MM-DD dates or a positive number of days.'}, status=400)
+
+        series = analytics.task_throughput(start_date, end_date)
+        return Response({
+            'days': [dict(counts, date=day.isoformat()) for day, counts in series],
         })
     except Exception as e:
         return Response({'error': str(e)}, status=500)
@@ -276,30 +299,31 @@ def admin_stats_claims(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def admin_charts_revenue(request):
-    """Get revenue chart data"""
+    """
+    Get revenue chart data.
+
+    Optional query parameters: `bucket` (day, week or month; default month)
+    and a range given as `date_from`/`date_to` or `days` (default: last 365
+    days).
+    """
     try:
-        # Get last 12 months of revenue data
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=365)
-        
-        # Group by month
-        monthly_revenue = {}
-        orders = Order.objects.filter(created_at__range=[start_date, end_date])
-        
-        for order in orders:
-            month_key = order.created_at.strftime('%Y-%m')
-            if month_key not in monthly_revenue:
-                monthly_revenue[month_key] = 0
-            monthly_revenue[month_key] += float(order.total_amount or 0)
-        
-        # Sort by month and prepare data
-        sorted_months = sorted(monthly_revenue.keys())
-        labels = [datetime.strptime(month, '%Y-%m').strftime('%b %Y') for month in sorted_months]
-        values = [monthly_revenue[month] for month in sorted_months]
+        bucket = request.GET.get('bucket', 'month')
+        if bucket not in analytics.BUCKET_SIZES:
+            return Response(
+                {'error': f"Invalid bucket. Use one of: {', '.join(analytics.BUCKET_SIZES)}"}, status=400
+            )
+        try:
+            start_date, end_date = _parse_chart_range(request, default_days=365)
+        except ValueError:
+            return Response({'error': 'Invalid date range. Use YYYY-MM-DD dates or a positive number of days.'}, status=400)
+
+        series = analytics.revenue_by_period(start_date, end_date, bucket)
+        label_format = analytics.BUCKET_LABEL_FORMATS[bucket]
         
         return Response({
-            'labels': labels,
-            'values': values
+            'labels': [timezone.localtime(period).strftime(label_format) for period, _ in series],
+            'values': [float(total) for _, total in series],
+            'bucket': bucket
         })
     except Exception as e:
         return Response({'error': str(e)}, status=500)
@@ -308,19 +332,23 @@ def admin_charts_revenue(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def admin_charts_orders(request):
-    """Get orders chart data"""
+    """
+    Get orders chart data (order status distribution).
+
+    Optional `date_from`/`date_to` or `days` query parameters restrict the
+    orders counted by creation date; by default all orders are counted.
+    """
     try:
-        # Get order status distribution
-        orders = Order.objects.all()
-        status_counts = {}
-        
-        for order in orders:
-            status = order.status
-            status_counts[status] = status_counts.get(status, 0) + 1
+        try:
+            start_date, end_date = _parse_chart_range(request)
+        except ValueError:
+            return Response({'error': 'Invalid date range. Use YYYY-MM-DD dates or a positive number of days.'}, status=400)
+
+        status_counts = analytics.order_status_counts(start_date, end_date)
         
         # Prepare data for doughnut chart
-        labels = [status.replace('_', ' ').title() for status in status_counts.keys()]
-        values = list(status_counts.values())
+        labels = [status.replace('_', ' ').title() for status, _ in status_counts]
+        values = [count for _, count in status_counts]
         
         return Response({
             'labels': labels,
@@ -488,51 +516,34 @@ def export_claims_report(request):
             except Exception:
                 pass
 
-        results = list(qs)
-
         if fmt == 'csv':
-            # Build CSV
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="claims.csv"'
-            writer = csv.writer(response)
-            writer.writerow(['Claim ID', 'Order ID', 'Customer', 'Claimant Name', 'Claimant Phone', 'Recorded By', 'Recorded At', 'Notes', 'Reversed'])
-            for c in results:
-                cust_name = c.order.customer.user.get_full_name() if getattr(c.order, 'customer', None) and getattr(c.order.customer, 'user', None) else ''
-                writer.writerow([c.id, c.order.id if c.order else '', cust_name, c.claimant_name, c.claimant_phone, c.recorded_by.get_full_name() if c.recorded_by else '', c.recorded_at.isoformat() if c.recorded_at else '', c.notes, c.reversed])
-            return response
-
-        # Default: PDF
-        if not REPORTLAB_AVAILABLE:
+            return csv_exports.streaming_csv_response(
+                'claims.csv', csv_exports.CLAIMS_HEADER, csv_exports.claim_rows(qs)
+            )
+
+        # Default: PDF. reportlab may not be installed in all environments,
+        # and is only loaded once a PDF is actually requested
+        try:
+            from reportlab.platypus import SimpleDocTemplate
+            from reportlab.lib.pagesizes import A4
+            from .report_utils import compact_table
+        except ImportError:
             return HttpResponse('PDF export is not available on this server. Install reportlab.', status=500)
 
         buffer = BytesIO()
         # Tight margins to allow more columns
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30, topMargin=70, bottomMargin=40)
         elements = []
-        styles = getSampleStyleSheet()
 
-        # Table header + rows
+        # Table header + rows, read without building model instances
         data = [['Claim ID', 'Order ID', 'Customer', 'Claimant', 'Phone', 'Recorded By', 'Recorded At', 'Notes', 'Reversed']]
-        for c in results:
-            cust_name = c.order.customer.user.get_full_name() if getattr(c.order, 'customer', None) and getattr(c.order.customer, 'user', None) else ''
-            recorded_by = c.recorded_by.get_full_name() if c.recorded_by else ''
-            recorded_at = c.recorded_at.strftime('%Y-%m-%d %H:%M') if c.recorded_at else ''
-            data.append([str(c.id), str(c.order.id if c.order else ''), cust_name, c.claimant_name, c.claimant_phone, recorded_by, recorded_at, (c.notes[:80] + '...') if c.notes and len(c.notes) > 80 else (c.notes or ''), 'Yes' if c.reversed else 'No'])
+        for claim_id, order_id, cust_name, claimant_name, claimant_phone, recorded_by, recorded_at, notes, reversed_ in csv_exports.claim_values(qs):
+            recorded_at = recorded_at.strftime('%Y-%m-%d %H:%M') if recorded_at else ''
+            data.append([str(claim_id), str(order_id), cust_name, claimant_name, claimant_phone, recorded_by, recorded_at, (notes[:80] + '...') if notes and len(notes) > 80 else (notes or ''), 'Yes' if reversed_ else 'No'])
 
         # Estimate column widths to fit A4 with margins (approx. 535pt usable width)
         col_widths = [36, 36, 90, 70, 46, 64, 64, 100, 20]
-        table = Table(data, colWidths=col_widths, repeatRows=1)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#d3d3d3')),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1, -1), 8),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('BOTTOMPADDING', (0,0), (-1,0), 6),
-            ('LEFTPADDING', (0,0), (-1,-1), 4),
-            ('RIGHTPADDING', (0,0), (-1,-1), 4),
-        ]))
+        table = compact_table(data, col_widths)
         elements.append(table)
 
         # Draw header and footer on each page
@@ -561,6 +572,79 @@ def export_claims_report(request):
         return HttpResponse(f"Error exporting claims: {str(e)}", status=500)
 
 
+def _export_filename(name):
+    return f"StitchFlow_{name}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+
+CSV_EXPORTS = {
+    'sales': ('Sales_Report', csv_exports.SALES_HEADER, csv_exports.sales_rows),
+    'orders': ('Orders', csv_exports.ORDERS_HEADER, csv_exports.order_rows),
+    'commissions': ('Commissions', csv_exports.COMMISSIONS_HEADER, csv_exports.commission_rows),
+    'inventory': ('Inventory', csv_exports.INVENTORY_HEADER, None),
+}
+
+
+@login_required
+@staff_member_required
+@require_GET
+def export_csv(request, dataset):
+    """Stream a CSV export of sales, orders, commissions or inventory.
+
+    Date-ranged exports accept the report page's `period` or
+    `date_from`/`date_to` parameters.
+    """
+    if dataset not in CSV_EXPORTS:
+        return HttpResponse(f"Unknown export: {dataset}", status=404)
+    name, header, rows = CSV_EXPORTS[dataset]
+
+    if rows is None:
+        return csv_exports.streaming_csv_response(_export_filename(name), header, csv_exports.inventory_rows())
+
+    try:
+        date_from, date_to = resolve_report_period(
+            request.GET.get('period', 'last_month'), request.GET.get('date_from'), request.GET.get('date_to')
+        )
+    except ValueError:
+        return HttpResponse("Invalid date format. Use YYYY-MM-DD.", status=400)
+    return csv_exports.streaming_csv_response(_export_filename(name), header, rows(date_from, date_to))
+
+
+@login_required
+@staff_member_required
+@require_GET
+def export_tailor_reports(request):
+    """Stream a ZIP with a performance report PDF for each selected tailor.
+
+    `tailor_ids` is a comma-separated list of ids (every tailor when
+    omitted); the period parameters match the single tailor report. Reports
+    are rendered in parallel, see `report_batch`.
+    """
+    tailors = Tailor.objects.select_related('user').order_by('user__first_name', 'user__last_name', 'id')
+    tailor_ids = request.GET.get('tailor_ids')
+    if tailor_ids:
+        try:
+            tailors = tailors.filter(id__in=[int(value) for value in tailor_ids.split(',') if value.strip()])
+        except ValueError:
+            return HttpResponse("Invalid tailor_ids. Use a comma-separated list of ids.", status=400)
+    tailors = list(tailors)
+    if not tailors:
+        return HttpResponse("No matching tailors.", status=404)
+
+    try:
+        date_from, date_to = resolve_report_period(
+            request.GET.get('period', 'last_month'),
+            request.GET.get('date_from'),
+            request.GET.get('date_to'),
+            all_time_start=min(tailor.user.date_joined for tailor in tailors).date(),
+        )
+    except ValueError:
+        return HttpResponse("Invalid date format. Use YYYY-MM-DD.", status=400)
+
+    reports = report_batch.render_tailor_reports(tailors, date_from, date_to, request.user)
+    filename = f"StitchFlow_Tailor_Reports_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return report_batch.streaming_zip_response(filename, reports)
+
+
 @login_required
 @staff_member_required
 @require_GET
@@ -0,0 +1,535 @@
+"""
+Aggregate queries behind the admin dashboard charts and statistics.
+
+Every function here returns plain Python data computed by grouped queries in
+the database, so callers never iterate over Order rows themselves.
+"""
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum, Window
+from django.db.models.functions import Ceil, RowNumber, Trunc, TruncDate
+
+from .models import Commission, DailyMetrics, Order, Tailor, Task
+
+BUCKET_SIZES = ('day', 'week', 'month')
+
+BUCKET_LABEL_FORMATS = {
+    'day': '%b %d, %Y',
+    'week': 'Week of %b %d, %Y',
+    'month': '%b %Y',
+}
+
+
+def _orders_in_range(start=None, end=None):
+    orders = Order.objects.all()
+    if start is not None:
+        orders = orders.filter(created_at__gte=start)
+    if end is not None:
+        orders = orders.filter(created_at__lt=end)
+    return orders
+
+
+# Counters of the DailyMetrics rollup, summed over a range of days
+METRIC_FIELDS = (
+    'orders_created', 'revenue', 'down_payments_count', 'down_payments',
+    'commissions_created', 'commissions_created_amount', 'commissions_paid',
+    'commissions_paid_amount', 'claims', 'tasks_completed',
+)
+
+
+def _daily_metrics(dimension, date_from=None, date_to=None):
+    rows = DailyMetrics.objects.filter(dimension=dimension)
+    if date_from is not None:
+        rows = rows.filter(date__gte=date_from)
+    if date_to is not None:
+        rows = rows.filter(date__lte=date_to)
+    return rows
+
+
+def _metric_sums():
+    return {field: Sum(field) for field in METRIC_FIELDS}
+
+
+def _metric_values(row):
+    return {field: row[field] or 0 for field in METRIC_FIELDS}
+
+
+def metrics_totals(date_from=None, date_to=None):
+    """
+    DailyMetrics counters summed over the days in [date_from, date_to]
+    (inclusive dates), as a dict keyed by METRIC_FIELDS.
+    """
+    return _metric_values(_daily_metrics('TOTAL', date_from, date_to).aggregate(**_metric_sums()))
+
+
+def metrics_by(dimension, date_from=None, date_to=None):
+    """
+    DailyMetrics counters per garment type, category or tailor id
+    (``dimension`` is GARMENT_TYPE, CATEGORY or TAILOR) over [date_from,
+    date_to]. Returns ``{key: counters}``.
+    """
+    rows = _daily_metrics(dimension, date_from, date_to).values('key').annotate(**_metric_sums()).order_by('key')
+    return {row['key']: _metric_values(row) for row in rows}
+
+
+def metrics_by_period(date_from=None, date_to=None, bucket='month'):
+    """
+    DailyMetrics counters per day/week/month over [date_from, date_to].
+    Returns a list of ``(period_start, counters)`` tuples in chronological
+    order; periods without any row are omitted.
+    """
+    if bucket not in BUCKET_SIZES:
+        raise ValueError(f"Invalid bucket '{bucket}'. Use one of: {', '.join(BUCKET_SIZES)}")
+
+    rows = (
+        _daily_metrics('TOTAL', date_from, date_to)
+        .annotate(period=Trunc('date', bucket))
+        .values('period')
+        .annotate(**_metric_sums())
+        .order_by('period')
+    )
+    return [(row['period'], _metric_values(row)) for row in rows]
+
+
+def revenue_by_period(start=None, end=None, bucket='month'):
+    """
+    Total order amount per day/week/month for orders created in [start, end).
+
+    Returns a list of ``(period_start, total)`` tuples in chronological order;
+    periods without orders are omitted.
+    """
+    if bucket not in BUCKET_SIZES:
+        raise ValueError(f"Invalid bucket '{bucket}'. Use one of: {', '.join(BUCKET_SIZES)}")
+
+    rows = (
+        _orders_in_range(start, end)
+        .annotate(period=Trunc('created_at', bucket))
+        .values('period')
+        .annotate(total=Sum('total_amount'))
+        .order_by('period')
+    )
+    return [(row['period'], row['total'] or 0) for row in rows]
+
+
+def revenue_by_day(start=None, end=None):
+    """
+    Total order amount per calendar day for orders created in [start, end).
+
+    Returns a list of ``(date, total)`` tuples in chronological order.
+    """
+    rows = (
+        _orders_in_range(start, end)
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(total=Sum('total_amount'))
+        .order_by('day')
+    )
+    return [(row['day'], row['total'] or 0) for row in rows]
+
+
+def revenue_by_tailor(start=None, end=None, limit=None):
+    """
+    Total amount of orders created in [start, end) per assigned tailor,
+    highest first, joined through each order's Task in one grouped query.
+
+    Returns a list of ``(tailor_id, tailor_name, total)`` tuples; orders
+    without a task are left out.
+    """
+    rows = (
+        _orders_in_range(start, end)
+        .filter(task__isnull=False)
+        .values('task__tailor_id', 'task__tailor__user__first_name', 'task__tailor__user__last_name')
+        .annotate(total=Sum('total_amount'))
+        .order_by('-total', 'task__tailor_id')
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    return [
+        (
+            row['task__tailor_id'],
+            f"{row['task__tailor__user__first_name']} {row['task__tailor__user__last_name']}".strip(),
+            row['total'] or 0,
+        )
+        for row in rows
+    ]
+
+
+def order_status_counts(start=None, end=None):
+    """
+    Number of orders per status for orders created in [start, end).
+
+    Returns a list of ``(status, count)`` tuples ordered by status.
+    """
+    rows = (
+        _orders_in_range(start, end)
+        .values('status')
+        .annotate(count=Count('id'))
+        .order_by('status')
+    )
+    return [(row['status'], row['count']) for row in rows]
+
+
+def _as_timedelta(value):
+    """Durations come back as timedelta, or as microseconds on some backends."""
+    if value is None or isinstance(value, timedelta):
+        return value
+    return timedelta(microseconds=float(value))
+
+
+def _hours(duration):
+    return round(duration.total_seconds() / 3600.0, 2) if duration is not None else None
+
+
+def claim_time_metrics(start=None, end=None):
+    """
+    Time-to-claim statistics (``claimed_at - created_at``) for orders claimed
+    in [start, end), ignoring orders whose claim predates creation.
+
+    Returns ``{'claimed_count', 'avg_hours', 'median_hours', 'p90_hours'}``;
+    the hour values are None when nothing was claimed. Counts and mean come
+    from one aggregate query and each percentile (nearest-rank) from one
+    ordered OFFSET/LIMIT query, so no Order rows are loaded into Python.
+    """
+    claimed = Order.objects.filter(claimed_at__isnull=False)
+    if start is not None:
+        claimed = claimed.filter(claimed_at__gte=start)
+    if end is not None:
+        claimed = claimed.filter(claimed_at__lt=end)
+
+    time_to_claim = ExpressionWrapper(F('claimed_at') - F('created_at'), output_field=DurationField())
+    is_valid = Q(claimed_at__gte=F('created_at'))
+    totals = claimed.aggregate(
+        claimed_count=Count('id'),
+        count=Count('id', filter=is_valid),
+        average=Avg(time_to_claim, filter=is_valid),
+    )
+
+    metrics = {
+        'claimed_count': totals['claimed_count'],
+        'avg_hours': _hours(_as_timedelta(totals['average'])),
+        'median_hours': None,
+        'p90_hours': None,
+    }
+    if totals['count']:
+        ordered = claimed.filter(is_valid).annotate(time_to_claim=time_to_claim).order_by('time_to_claim')
+        durations = ordered.values_list('time_to_claim', flat=True)
+        for key, fraction in (('median_hours', 0.5), ('p90_hours', 0.9)):
+            rank = max(math.ceil(fraction * totals['count']), 1)
+            metrics[key] = _hours(_as_timedelta(durations[rank - 1]))
+    return metrics
+
+
+def _empty_tailor_metrics(tailor_id, name=''):
+    return {
+        'tailor_id': tailor_id,
+        'name': name,
+        'assigned': 0,
+        'in_progress': 0,
+        'completed': 0,
+        'approved': 0,
+        'finished': 0,
+        'completion_rate': 0.0,
+        'avg_turnaround_hours': None,
+        'commission_count': 0,
+        'commission_total': Decimal('0'),
+        'commission_paid': Decimal('0'),
+        'commission_pending': Decimal('0'),
+        'commission_avg': Decimal('0'),
+    }
+
+
+def tailor_metrics(start=None, end=None, tailor_ids=None):
+    """
+    Task and commission figures per tailor, for tasks assigned and
+    commissions created in [start, end).
+
+    Returns one dict per tailor (every tailor, or those in ``tailor_ids``)
+    with task counts by status, ``finished`` (completed + approved),
+    ``completion_rate`` (percent of assigned), ``avg_turnaround_hours``
+    (``completed_at - started_at``) and commission count/total/paid/pending/
+    average, busiest tailors first. Tasks and commissions are each grouped
+    by tailor in one query, whatever the number of tailors.
+    """
+    tailors = Tailor.objects.order_by('id')
+    tasks = Task.objects.all()
+    commissions = Commission.objects.all()
+    if tailor_ids is not None:
+        tailors = tailors.filter(id__in=tailor_ids)
+        tasks = tasks.filter(tailor_id__in=tailor_ids)
+        commissions = commissions.filter(tailor_id__in=tailor_ids)
+    if start is not None:
+        tasks = tasks.filter(assigned_at__gte=start)
+        commissions = commissions.filter(created_at__gte=start)
+    if end is not None:
+        tasks = tasks.filter(assigned_at__lt=end)
+        commissions = commissions.filter(created_at__lt=end)
+
+    metrics = {
+        row['id']: _empty_tailor_metrics(
+            row['id'], f"{row['user__first_name']} {row['user__last_name']}".strip()
+        )
+        for row in tailors.values('id', 'user__first_name', 'user__last_name')
+    }
+
+    turnaround = ExpressionWrapper(F('completed_at') - F('started_at'), output_field=DurationField())
+    task_rows = tasks.values('tailor_id').annotate(
+        assigned=Count('id'),
+        in_progress=Count('id', filter=Q(status='IN_PROGRESS')),
+        completed=Count('id', filter=Q(status='COMPLETED')),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        avg_turnaround=Avg(turnaround, filter=Q(started_at__isnull=False, completed_at__isnull=False)),
+    ).order_by()
+    for row in task_rows:
+        entry = metrics.get(row['tailor_id'])
+        if entry is None:
+            continue
+        entry.update(
+            assigned=row['assigned'],
+            in_progress=row['in_progress'],
+            completed=row['completed'],
+            approved=row['approved'],
+            finished=row['completed'] + row['approved'],
+            avg_turnaround_hours=_hours(_as_timedelta(row['avg_turnaround'])),
+        )
+        entry['completion_rate'] = round(entry['finished'] / entry['assigned'] * 100, 1)
+
+    commission_rows = commissions.values('tailor_id').annotate(
+        count=Count('id'),
+        total=Sum('amount'),
+        paid=Sum('amount', filter=Q(status='PAID')),
+        pending=Sum('amount', filter=Q(status='APPROVED')),
+        average=Avg('amount'),
+    ).order_by()
+    for row in commission_rows:
+        entry = metrics.get(row['tailor_id'])
+        if entry is None:
+            continue
+        entry.update(
+            commission_count=row['count'],
+            commission_total=row['total'] or Decimal('0'),
+            commission_paid=row['paid'] or Decimal('0'),
+            commission_pending=row['pending'] or Decimal('0'),
+            commission_avg=row['average'] or Decimal('0'),
+        )
+
+    return sorted(
+        metrics.values(),
+        key=lambda entry: (-entry['finished'], -entry['assigned'], -entry['commission_total'], entry['tailor_id'])
+    )
+
+
+def tailor_metrics_for(tailor, start=None, end=None):
+    """tailor_metrics() for a single tailor, as one dict."""
+    rows = tailor_metrics(start, end, tailor_ids=[tailor.id])
+    return rows[0] if rows else _empty_tailor_metrics(tailor.id)
+
+
+def tailor_monthly_commissions(tailor, start=None, end=None):
+    """
+    Paid and pending commission totals per month for ``tailor``, for
+    commissions created in [start, end).
+
+    Returns a list of ``(month_start, paid, pending)`` tuples in
+    chronological order.
+    """
+    return monthly_commissions_by_tailor(start, end, tailor_ids=[tailor.id]).get(tailor.id, [])
+
+
+def monthly_commissions_by_tailor(start=None, end=None, tailor_ids=None):
+    """
+    tailor_monthly_commissions() for every tailor (or those in
+    ``tailor_ids``) in one grouped query, as ``{tailor_id: [(month_start,
+    paid, pending), ...]}``. Tailors without commissions are left out.
+    """
+    commissions = Commission.objects.all()
+    if tailor_ids is not None:
+        commissions = commissions.filter(tailor_id__in=tailor_ids)
+    if start is not None:
+        commissions = commissions.filter(created_at__gte=start)
+    if end is not None:
+        commissions = commissions.filter(created_at__lt=end)
+
+    rows = (
+        commissions.annotate(month=Trunc('created_at', 'month'))
+        .values('tailor_id', 'month')
+        .annotate(paid=Sum('amount', filter=Q(status='PAID')), pending=Sum('amount', filter=~Q(status='PAID')))
+        .order_by('tailor_id', 'month')
+    )
+    monthly = {}
+    for row in rows:
+        monthly.setdefault(row['tailor_id'], []).append(
+            (row['month'], row['paid'] or Decimal('0'), row['pending'] or Decimal('0'))
+        )
+    return monthly
+
+
+def garment_counts_by_tailor(start=None, end=None, tailor_ids=None):
+    """
+    Tasks assigned in [start, end) per tailor and garment type, in one
+    grouped query, as ``{tailor_id: [(garment_type, count), ...]}`` with each
+    tailor's most common garment first.
+    """
+    tasks = Task.objects.all()
+    if tailor_ids is not None:
+        tasks = tasks.filter(tailor_id__in=tailor_ids)
+    if start is not None:
+        tasks = tasks.filter(assigned_at__gte=start)
+    if end is not None:
+        tasks = tasks.filter(assigned_at__lt=end)
+
+    rows = (
+        tasks.values('tailor_id', 'order__garment_type')
+        .annotate(count=Count('id'))
+        .order_by('tailor_id', '-count', 'order__garment_type')
+    )
+    counts = {}
+    for row in rows:
+        counts.setdefault(row['tailor_id'], []).append((row['order__garment_type'], row['count']))
+    return counts
+
+
+# Task pipeline stages as (name, start field, end field)
+TASK_STAGES = (
+    ('queue_wait', 'assigned_at', 'started_at'),
+    ('work_time', 'started_at', 'completed_at'),
+    ('approval_lag', 'completed_at', 'approved_at'),
+)
+
+TURNAROUND_GROUPS = {
+    'tailor': 'tailor_id',
+    'garment_type': 'order__garment_type',
+}
+
+PERCENTILES = (('p50_hours', 0.5), ('p90_hours', 0.9))
+
+
+def _stage_stats(start, end, begin_field, end_field, group_field):
+    """
+    Count, mean and nearest-rank p50/p90 (in hours) of ``end_field -
+    begin_field`` per ``group_field`` value (or overall when None), for tasks
+    whose stage ended in [start, end). One aggregate query plus one query
+    that ranks durations with ROW_NUMBER() within each group.
+    """
+    tasks = Task.objects.filter(
+        **{f'{begin_field}__isnull': False, f'{end_field}__isnull': False, f'{end_field}__gte': F(begin_field)}
+    )
+    if start is not None:
+        tasks = tasks.filter(**{f'{end_field}__gte': start})
+    if end is not None:
+        tasks = tasks.filter(**{f'{end_field}__lt': end})
+
+    duration = ExpressionWrapper(F(end_field) - F(begin_field), output_field=DurationField())
+    group_fields = [group_field] if group_field else []
+    totals = dict(count=Count('id'), mean=Avg(duration))
+    if group_field:
+        rows = [(row[group_field], row) for row in tasks.values(group_field).annotate(**totals).order_by()]
+    else:
+        rows = [(None, tasks.aggregate(**totals))]
+    stats = {}
+    for key, row in rows:
+        if not row['count']:
+            continue
+        stats[key] = {
+            'count': row['count'],
+            'mean_hours': _hours(_as_timedelta(row['mean'])),
+            'p50_hours': None,
+            'p90_hours': None,
+        }
+
+    partition = [F(group_field)] if group_field else None
+    ranked = tasks.annotate(
+        duration=duration,
+        rank=Window(RowNumber(), partition_by=partition, order_by=[duration.asc(), F('id').asc()]),
+        total=Window(Count('id'), partition_by=partition),
+    )
+    wanted = Q()
+    for _, fraction in PERCENTILES:
+        wanted |= Q(rank=Ceil(F('total') * fraction))
+    for values in ranked.filter(wanted).values_list(*group_fields, 'rank', 'total', 'duration'):
+        key = values[0] if group_field else None
+        rank, total, value = values[-3:]
+        if key not in stats:
+            continue
+        for name, fraction in PERCENTILES:
+            if rank == max(math.ceil(total * fraction), 1):
+                stats[key][name] = _hours(_as_timedelta(value))
+    return stats
+
+
+def _empty_stage_stats():
+    return {'count': 0, 'mean_hours': None, 'p50_hours': None, 'p90_hours': None}
+
+
+def turnaround_stats(start=None, end=None, group_by=None):
+    """
+    Queue wait (assigned -> started), work time (started -> completed) and
+    approval lag (completed -> approved) distributions for tasks whose stage
+    ended in [start, end).
+
+    Without ``group_by`` returns ``{stage: {count, mean_hours, p50_hours,
+    p90_hours}}``. With ``group_by`` set to 'tailor' or 'garment_type' returns
+    a list of ``{'key', 'label', stage: {...}, ...}`` dicts, one per tailor /
+    garment type with at least one measured stage, ordered by label. Two
+    queries per stage, however many tasks or groups there are.
+    """
+    if group_by is not None and group_by not in TURNAROUND_GROUPS:
+        raise ValueError(f"Invalid group_by '{group_by}'. Use one of: {', '.join(TURNAROUND_GROUPS)}")
+
+    group_field = TURNAROUND_GROUPS.get(group_by)
+    per_stage = {
+        name: _stage_stats(start, end, begin_field, end_field, group_field)
+        for name, begin_field, end_field in TASK_STAGES
+    }
+
+    if group_by is None:
+        return {name: stats.get(None, _empty_stage_stats()) for name, stats in per_stage.items()}
+
+    keys = set()
+    for stats in per_stage.values():
+        keys.update(stats)
+    if group_by == 'tailor':
+        labels = {
+            row['id']: f"{row['user__first_name']} {row['user__last_name']}".strip()
+            for row in Tailor.objects.filter(id__in=keys).values('id', 'user__first_name', 'user__last_name')
+        }
+    else:
+        labels = dict(Order.GARMENT_TYPE_CHOICES)
+
+    rows = []
+    for key in keys:
+        row = {'key': key, 'label': labels.get(key, str(key))}
+        for name, stats in per_stage.items():
+            row[name] = stats.get(key, _empty_stage_stats())
+        rows.append(row)
+    return sorted(rows, key=lambda row: (row['label'], str(row['key'])))
+
+
+def task_throughput(start=None, end=None):
+    """
+    Tasks assigned, started, completed and approved per calendar day in
+    [start, end), one grouped query per event.
+
+    Returns a list of ``(date, {'assigned', 'started', 'completed',
+    'approved'})`` tuples in chronological order; days without any event are
+    omitted.
+    """
+    events = (
+        ('assigned', 'assigned_at'),
+        ('started', 'started_at'),
+        ('completed', 'completed_at'),
+        ('approved', 'approved_at'),
+    )
+    days = {}
+    for name, field in events:
+        tasks = Task.objects.filter(**{f'{field}__isnull': False})
+        if start is not None:
+            tasks = tasks.filter(**{f'{field}__gte': start})
+        if end is not None:
+            tasks = tasks.filter(**{f'{field}__lt': end})
+        rows = tasks.annotate(day=TruncDate(field)).values('day').annotate(count=Count('id')).order_by()
+        for row in rows:
+            counts = days.setdefault(row['day'], {event: 0 for event, _ in events})
+            counts[name] = row['count']
+    return sorted(days.items())
@@ -1,7 +1,14 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
 from decimal import Decimal
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
 from django.utils import timezone
-from .models import Commission, Task, Order
+from .models import (
+    Accessory, Claim, Commission, DailyMetrics, Fabric, InventoryMovement, Order, Task,
+)
 
 
 # Static pricing configuration for garment types
@@ -67,8 +74,47 @@ class OrderManager:
         if not has_inventory:
             raise ValidationError(message)
 
-        # Deduct inventory immediately upon order creation
-        InventoryManager.deduct_inventory_for_garment(order)
+        # Deduct inventory immediately upon order creation. The stock check
+        # above is advisory; the conditional UPDATEs inside the deduction are
+        # what actually guard against concurrent orders draining the stock.
+        InventoryManager.deduct_inventory_once(order)
+
+        return order
+
+    @staticmethod
+    def process_payment(order, payment_type):
+        """
+        Record a DOWN_PAYMENT, REMAINING_PAYMENT or FULL_PAYMENT for an order.
+        Raises ValueError for an unknown payment type or a remaining payment
+        before the down payment.
+        """
+        if payment_type == 'DOWN_PAYMENT':
+            # Process down payment only
+            order.down_payment_status = 'PAID'
+            order.down_payment_paid_at = timezone.now()
+            order.payment_status = 'DOWN_PAYMENT_PAID'
+
+        elif payment_type == 'REMAINING_PAYMENT':
+            # Process remaining balance (only if down payment was already paid)
+            if order.payment_status != 'DOWN_PAYMENT_PAID':
+                raise ValueError('Down payment must be processed first.')
+
+            order.payment_status = 'PAID'
+            order.paid_at = timezone.now()
+            order.remaining_balance = 0  # Set remaining balance to zero when fully paid
+
+        elif payment_type == 'FULL_PAYMENT':
+            # Process full payment at once
+            order.payment_status = 'PAID'
+            order.paid_at = timezone.now()
+            order.down_payment_status = 'PAID'
+            order.down_payment_paid_at = timezone.now()
+            order.remaining_balance = 0  # Set remaining balance to zero when fully paid
+
+        else:
+            raise ValueError('Invalid payment type. Use DOWN_PAYMENT, FULL_PAYMENT, or REMAINING_PAYMENT.')
+
+        order.save()
 
         return order
 
@@ -187,8 +233,176 @@ class CommissionManager:
         )
         return commission
 
+    @staticmethod
+    def pay_commission(commission):
+        """
+        Mark a commission as paid. Paying an already paid commission only
+        moves its paid_at forward.
+        """
+        commission.status = 'PAID'
+        commission.paid_at = timezone.now()
+        commission.save()
+        return commission
+
+
+class MetricsManager:
+    """
+    Upkeep of the DailyMetrics rollup.
+
+    Saving or deleting an Order, Task, Commission or Claim (API, admin or
+    plain ORM) moves the row's contributions, as listed by events(), with
+    F() increments on the TOTAL row of each event's day and its breakdown
+    rows, so concurrent requests never overwrite each other's counts; see
+    the signal handlers at the bottom of models.py. rebuild_daily_metrics()
+    recomputes days from the raw rows, for backfilling and for changes made
+    with queryset.update() or raw SQL, which send no signals.
+    """
+
+    @staticmethod
+    def _add(when, breakdown, **deltas):
+        day = timezone.localdate(when) if when else timezone.localdate()
+        rows = [('TOTAL', '')] + [(dimension, str(key)) for dimension, key in breakdown]
+
+        # Make sure the rows exist, then bump them all in one UPDATE
+        DailyMetrics.objects.bulk_create(
+            [DailyMetrics(date=day, dimension=dimension, key=key) for dimension, key in rows],
+            ignore_conflicts=True,
+        )
+        match = Q()
+        for dimension, key in rows:
+            match |= Q(dimension=dimension, key=key)
+        DailyMetrics.objects.filter(match, date=day).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+
+    @staticmethod
+    def events(instance):
+        """
+        The rollup contributions of an Order, Task, Commission or Claim as
+        ``(when, breakdown, deltas)`` tuples, counted the way
+        rebuild_daily_metrics() counts them.
+        """
+        events = []
+        if isinstance(instance, Order):
+            breakdown = [('GARMENT_TYPE', instance.garment_type), ('CATEGORY', instance.category)]
+            events.append((instance.created_at, breakdown, {
+                'orders_created': 1, 'revenue': instance.total_amount or Decimal('0'),
+            }))
+            if instance.down_payment_status == 'PAID' and instance.down_payment_paid_at:
+                events.append((instance.down_payment_paid_at, breakdown, {
+                    'down_payments_count': 1, 'down_payments': instance.down_payment_amount or Decimal('0'),
+                }))
+        elif isinstance(instance, Task):
+            if instance.completed_at:
+                events.append((instance.completed_at, [('TAILOR', instance.tailor_id)], {'tasks_completed': 1}))
+        elif isinstance(instance, Commission):
+            breakdown = [('TAILOR', instance.tailor_id)]
+            events.append((instance.created_at, breakdown, {
+                'commissions_created': 1, 'commissions_created_amount': instance.amount,
+            }))
+            if instance.status == 'PAID' and instance.paid_at:
+                events.append((instance.paid_at, breakdown, {
+                    'commissions_paid': 1, 'commissions_paid_amount': instance.amount,
+                }))
+        elif isinstance(instance, Claim):
+            events.append((instance.recorded_at, [], {'claims': 1}))
+        return events
+
+    @staticmethod
+    def record_changed(events_before, events_after):
+        """
+        Replace a row's contributions ``events_before`` (empty for a new row)
+        with ``events_after`` (empty for a deleted one).
+        """
+        if events_after == events_before:
+            return
+        for when, breakdown, deltas in events_before:
+            MetricsManager._add(when, breakdown, **{field: -delta for field, delta in deltas.items()})
+        for when, breakdown, deltas in events_after:
+            MetricsManager._add(when, breakdown, **deltas)
+
+    @staticmethod
+    def _grouped(queryset, field, date_from, date_to, *keys, **aggregates):
+        if date_from is not None:
+            start = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
+            queryset = queryset.filter(**{f'{field}__gte': start})
+        if date_to is not None:
+            end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+            queryset = queryset.filter(**{f'{field}__lt': end})
+        return (
+            queryset.filter(**{f'{field}__isnull': False})
+            .annotate(day=TruncDate(field))
+            .values('day', *keys)
+            .annotate(**aggregates)
+            .order_by()
+        )
+
+    @staticmethod
+    def rebuild_daily_metrics(date_from=None, date_to=None):
+        """
+        Recompute the DailyMetrics rows for the days in [date_from, date_to]
+        (inclusive dates; None leaves that side open) from Order, Task,
+        Commission and Claim with one grouped query per event type.
+        Returns the number of rows written.
+        """
+        totals = defaultdict(lambda: defaultdict(int))
+
+        def add(day, breakdown, **values):
+            for dimension, key in [('TOTAL', '')] + breakdown:
+                row = totals[(day, dimension, str(key))]
+                for field, value in values.items():
+                    row[field] += value or 0
+
+        grouped = MetricsManager._grouped
+        for row in grouped(Order.objects.all(), 'created_at', date_from, date_to, 'garment_type', 'category',
+                           count=Count('id'), total=Sum('total_amount')):
+            add(row['day'], [('GARMENT_TYPE', row['garment_type']), ('CATEGORY', row['category'])],
+                orders_created=row['count'], revenue=row['total'])
+
+        for row in grouped(Order.objects.filter(down_payment_status='PAID'), 'down_payment_paid_at',
+                           date_from, date_to, 'garment_type', 'category',
+                           count=Count('id'), total=Sum('down_payment_amount')):
+            add(row['day'], [('GARMENT_TYPE', row['garment_type']), ('CATEGORY', row['category'])],
+                down_payments_count=row['count'], down_payments=row['total'])
+
+        for row in grouped(Task.objects.all(), 'completed_at', date_from, date_to, 'tailor_id', count=Count('id')):
+            add(row['day'], [('TAILOR', row['tailor_id'])], tasks_completed=row['count'])
+
+        for row in grouped(Commission.objects.all(), 'created_at', date_from, date_to, 'tailor_id',
+                           count=Count('id'), total=Sum('amount')):
+            add(row['day'], [('TAILOR', row['tailor_id'])],
+                commissions_created=row['count'], commissions_created_amount=row['total'])
+
+        for row in grouped(Commission.objects.filter(status='PAID'), 'paid_at', date_from, date_to, 'tailor_id',
+                           count=Count('id'), total=Sum('amount')):
+            add(row['day'], [('TAILOR', row['tailor_id'])],
+                commissions_paid=row['count'], commissions_paid_amount=row['total'])
+
+        for row in grouped(Claim.objects.all(), 'recorded_at', date_from, date_to, count=Count('id')):
+            add(row['day'], [], claims=row['count'])
+
+        with transaction.atomic():
+            stale = DailyMetrics.objects.all()
+            if date_from is not None:
+                stale = stale.filter(date__gte=date_from)
+            if date_to is not None:
+                stale = stale.filter(date__lte=date_to)
+            stale.delete()
+            DailyMetrics.objects.bulk_create(
+                [
+                    DailyMetrics(date=day, dimension=dimension, key=key, **values)
+                    for (day, dimension, key), values in totals.items()
+                ],
+                batch_size=500,
+            )
+        return len(totals)
+
 
 class InventoryManager:
+    # Items written per CASE UPDATE in the bulk endpoints; three bound
+    # parameters each keeps a statement within SQLite's 999-parameter limit
+    BULK_UPDATE_CHUNK = 300
+
     # Garment-based inventory requirements
     GARMENT_INVENTORY_REQUIREMENTS = {
         'BLOUSE': {'fabric_units': 2, 'accessories_units': 1},
@@ -209,6 +423,63 @@ class InventoryManager:
             InventoryManager.GARMENT_INVENTORY_REQUIREMENTS['OTHERS']
         )
 
+    # Low-stock rows are matched with a column comparison so the partial
+    # indexes on Fabric/Accessory (fabric_low_stock_idx, accessory_low_stock_idx)
+    # serve these queries; always filter through the helpers below.
+    LOW_STOCK_CONDITION = Q(quantity__lte=F('low_stock_threshold'))
+
+    @staticmethod
+    def low_stock_fabrics():
+        """
+        Fabrics at or below their own low-stock threshold.
+        """
+        return Fabric.objects.filter(InventoryManager.LOW_STOCK_CONDITION).order_by('name')
+
+    @staticmethod
+    def low_stock_accessories():
+        """
+        Accessories at or below their own low-stock threshold.
+        """
+        return Accessory.objects.filter(InventoryManager.LOW_STOCK_CONDITION).order_by('name')
+
+    @staticmethod
+    def get_low_stock_items(limit=None):
+        """
+        Return low-stock fabrics and accessories as a list of dicts for the
+        inventory dashboard, fabrics first.
+        """
+        fabrics = InventoryManager.low_stock_fabrics()
+        accessories = InventoryManager.low_stock_accessories()
+        if limit is not None:
+            fabrics, accessories = fabrics[:limit], accessories[:limit]
+
+        items = [{
+            'id': fabric.id,
+            'name': fabric.name,
+            'type': 'fabric',
+            'quantity': fabric.quantity,
+            'threshold': fabric.low_stock_threshold,
+            'unit_type': fabric.unit_type
+        } for fabric in fabrics]
+        items.extend({
+            'id': accessory.id,
+            'name': accessory.name,
+            'type': 'accessory',
+            'quantity': accessory.quantity,
+            'threshold': accessory.low_stock_threshold
+        } for accessory in accessories)
+        return items
+
+    @staticmethod
+    def get_low_stock_counts():
+        """
+        Count low-stock fabrics and accessories.
+        Returns {'fabrics': int, 'accessories': int, 'total': int}
+        """
+        fabrics = InventoryManager.low_stock_fabrics().count()
+        accessories = InventoryManager.low_stock_accessories().count()
+        return {'fabrics': fabrics, 'accessories': accessories, 'total': fabrics + accessories}
+
     @staticmethod
     def check_inventory_for_garment(order):
         """
@@ -234,19 +505,53 @@ class InventoryManager:
     def deduct_inventory_for_garment(order):
         """
         Deduct inventory for an order based on garment type.
+
+        Stock is decremented with conditional UPDATEs
+        (``SET quantity = quantity - n WHERE quantity >= n``): one statement
+        for the fabric and one for the whole accessory batch, inside a single
+        transaction. Concurrent deductions therefore never lose updates or
+        drive stock negative; if any item is short, nothing is deducted and a
+        ValidationError is raised. Each deducted item gets an ORDER_DEDUCTION
+        movement in the inventory ledger.
         """
         requirements = InventoryManager.get_inventory_requirements(order.garment_type)
         fabric_needed = requirements['fabric_units'] * order.quantity
         accessories_needed = requirements['accessories_units'] * order.quantity
-
-        # Deduct fabric
-        order.fabric.quantity -= fabric_needed
-        order.fabric.save()
-
-        # Deduct accessories
-        for accessory in order.accessories.all():
-            accessory.quantity -= accessories_needed
-            accessory.save()
+        accessory_ids = list(order.accessories.values_list('id', flat=True))
+
+        with transaction.atomic():
+            # Deduct fabric
+            updated = Fabric.objects.filter(
+                pk=order.fabric_id, quantity__gte=fabric_needed
+            ).update(quantity=F('quantity') - fabric_needed)
+            if not updated:
+                raise ValidationError(
+                    f"Insufficient fabric: {order.fabric.name}. Need {fabric_needed} units."
+                )
+            InventoryManager._record_movements(
+                Fabric, [order.fabric_id], -fabric_needed, 'ORDER_DEDUCTION', order=order
+            )
+
+            # Deduct accessories
+            if accessory_ids:
+                updated = Accessory.objects.filter(
+                    pk__in=accessory_ids, quantity__gte=accessories_needed
+                ).update(quantity=F('quantity') - accessories_needed)
+                if updated != len(accessory_ids):
+                    short = Accessory.objects.filter(
+                        pk__in=accessory_ids, quantity__lt=accessories_needed
+                    ).values_list('name', flat=True)
+                    raise ValidationError(
+                        f"Insufficient accessory: {', '.join(short) or 'unknown'}. "
+                        f"Need {accessories_needed} units."
+                    )
+                InventoryManager._record_movements(
+                    Accessory, accessory_ids, -accessories_needed, 'ORDER_DEDUCTION', order=order
+                )
+
+        # Reload the post-deduction quantities for the report (and so callers
+        # holding `order.fabric` don't see stale stock)
+        order.fabric.refresh_from_db(fields=['quantity'])
 
         # Return a summary report of what was deducted for audit purposes
         report = {
@@ -264,12 +569,35 @@ class InventoryManager:
                     'deducted_units': int(accessories_needed),
                     'remaining': int(accessory.quantity)
                 }
-                for accessory in order.accessories.all()
+                for accessory in Accessory.objects.filter(pk__in=accessory_ids)
             ]
         }
 
         return report
 
+    @staticmethod
+    def deduct_inventory_once(order):
+        """
+        Deduct inventory for an order unless it has already been deducted.
+
+        The ``inventory_deducted`` flag is claimed with a conditional UPDATE in
+        the same transaction as the stock deduction, so concurrent callers (the
+        post_save/m2m_changed signals, order creation, admin actions) deduct
+        at most once; a failed deduction rolls the flag back.
+
+        Returns the deduction report, or None if the order was already deducted.
+        """
+        with transaction.atomic():
+            claimed = Order.objects.filter(
+                pk=order.pk, inventory_deducted=False
+            ).update(inventory_deducted=True)
+            if not claimed:
+                order.inventory_deducted = True
+                return None
+            report = InventoryManager.deduct_inventory_for_garment(order)
+        order.inventory_deducted = True
+        return report
+
     @staticmethod
     def get_deduction_report(order):
         """
@@ -302,6 +630,355 @@ class InventoryManager:
 
         return report
 
+    @staticmethod
+    def get_recorded_deduction(order):
+        """
+        Return what the inventory ledger actually deducted for an order, net
+        of reversals, as one grouped query over the order's movements.
+        """
+        rows = InventoryMovement.objects.filter(order=order).values(
+            'fabric_id', 'fabric__name', 'accessory_id', 'accessory__name'
+        ).annotate(net=Sum('quantity')).order_by('fabric_id', 'accessory_id')
+
+        report = {'order_id': order.id, 'fabric': None, 'accessories': []}
+        for row in rows:
+            if row['fabric_id']:
+                report['fabric'] = {
+                    'id': row['fabric_id'],
+                    'name': row['fabric__name'],
+                    'deducted_units': float(-row['net']),
+                }
+            else:
+                report['accessories'].append({
+                    'id': row['accessory_id'],
+                    'name': row['accessory__name'],
+                    'deducted_units': int(-row['net']),
+                })
+        return report
+
+    # --- Inventory ledger ---------------------------------------------------
+
+    @staticmethod
+    def _record_movements(model, item_ids, quantity, movement_type, order=None, user=None, note=''):
+        """
+        Append one ledger row per item after its stock changed by `quantity`.
+
+        Must run inside the transaction that updated the stock: the balances
+        read back here are the rows we just updated (and hold locks on).
+        """
+        field = 'fabric_id' if model is Fabric else 'accessory_id'
+        balances = dict(model.objects.filter(pk__in=item_ids).values_list('id', 'quantity'))
+        InventoryMovement.objects.bulk_create([
+            InventoryMovement(
+                movement_type=movement_type,
+                quantity=quantity,
+                balance_after=balances[item_id],
+                order=order,
+                created_by=user,
+                note=note,
+                **{field: item_id},
+            )
+            for item_id in item_ids
+        ])
+
+    @staticmethod
+    def adjust_stock(item, quantity, movement_type, order=None, user=None, note=''):
+        """
+        Change a fabric's or accessory's stock by `quantity` (negative to
+        deduct) and record the movement in the ledger, atomically.
+
+        Deductions use a conditional UPDATE so stock never goes negative;
+        a ValidationError is raised if the item is short.
+        """
+        model = type(item)
+        if model is Accessory:
+            quantity = int(quantity)
+        else:
+            quantity = Decimal(str(quantity))
+
+        with transaction.atomic():
+            queryset = model.objects.filter(pk=item.pk)
+            if quantity < 0:
+                queryset = queryset.filter(quantity__gte=-quantity)
+            if not queryset.update(quantity=F('quantity') + quantity):
+                raise ValidationError(f"Insufficient stock for {item.name}")
+            InventoryManager._record_movements(
+                model, [item.pk], quantity, movement_type, order=order, user=user, note=note
+            )
+
+        item.refresh_from_db(fields=['quantity'])
+        return item
+
+    @staticmethod
+    def restock(item, quantity, user=None, note=''):
+        """
+        Add stock to a fabric or accessory (RESTOCK movement).
+        """
+        return InventoryManager.adjust_stock(item, quantity, 'RESTOCK', user=user, note=note)
+
+    @staticmethod
+    def deduct_stock(item, quantity, user=None, note=''):
+        """
+        Manually remove stock from a fabric or accessory (MANUAL_DEDUCTION movement).
+        """
+        return InventoryManager.adjust_stock(item, -quantity, 'MANUAL_DEDUCTION', user=user, note=note)
+
+    @staticmethod
+    def bulk_restock(items, user=None, note=''):
+        """
+        Restock many fabrics/accessories at once. See `_apply_bulk_movements`.
+        """
+        return InventoryManager._apply_bulk_movements(items, 'RESTOCK', user=user, note=note)
+
+    @staticmethod
+    def bulk_deduct(items, user=None, note=''):
+        """
+        Manually deduct many fabrics/accessories at once. See `_apply_bulk_movements`.
+        """
+        return InventoryManager._apply_bulk_movements(items, 'MANUAL_DEDUCTION', user=user, note=note)
+
+    @staticmethod
+    def _apply_bulk_movements(items, movement_type, user=None, note=''):
+        """
+        Apply a batch of ``{'type': 'fabric'|'accessory', 'id', 'quantity'}``
+        entries in one transaction and return one result dict per entry.
+
+        Items are loaded with two ``in_bulk`` queries (rows locked where the
+        database supports it), validated and updated in memory, then written
+        back with one relative CASE UPDATE per model and recorded with a
+        single ledger ``bulk_create`` -- a handful of queries for up to
+        BULK_UPDATE_CHUNK items of each type, one more UPDATE per further
+        chunk. Invalid entries (unknown type, bad or unknown id, bad
+        quantity, insufficient stock) fail individually without affecting
+        the rest of the batch.
+        """
+        deducting = movement_type == 'MANUAL_DEDUCTION'
+        models_by_type = {'fabric': Fabric, 'accessory': Accessory}
+
+        parsed = []
+        for item in items:
+            item_type = item.get('type')
+            item_id = item.get('id')
+            try:
+                quantity = float(item.get('quantity', 0))
+            except (TypeError, ValueError):
+                quantity = 0
+            error = None
+            if quantity <= 0:
+                error = 'Quantity must be greater than 0'
+            elif item_type not in models_by_type:
+                error = 'Invalid item type'
+            elif item_type == 'accessory' and quantity != int(quantity):
+                error = 'Accessory quantity must be a whole number'
+            else:
+                # JSON payloads may send ids as strings; in_bulk() is keyed by int
+                try:
+                    item_id = int(item_id)
+                except (TypeError, ValueError):
+                    error = 'Invalid item id'
+            parsed.append((item_type, item_id, quantity, error))
+
+        results = []
+        with transaction.atomic():
+            stock = {
+                item_type: model.objects.select_for_update().in_bulk(
+                    {item_id for t, item_id, _, error in parsed if t == item_type and not error}
+                )
+                for item_type, model in models_by_type.items()
+            }
+            original = {
+                item_type: {pk: obj.quantity for pk, obj in objs.items()}
+                for item_type, objs in stock.items()
+            }
+            changed = {'fabric': {}, 'accessory': {}}
+            movements = []
+
+            for item_type, item_id, quantity, error in parsed:
+                obj = None if error else stock[item_type].get(item_id)
+                if obj is None:
+                    results.append({
+                        'id': item_id,
+                        'type': item_type,
+                        'success': False,
+                        'message': error or f'{item_type.title()} not found'
+                    })
+                    continue
+
+                if item_type == 'fabric':
+                    delta = Decimal(str(quantity)).quantize(Decimal('0.01'))
+                    unit = obj.unit_type
+                else:
+                    delta = int(quantity)
+                    unit = 'units'
+                if deducting:
+                    if obj.quantity < delta:
+                        results.append({
+                            'id': obj.id,
+                            'name': obj.name,
+                            'type': item_type,
+                            'success': False,
+                            'message': f'Insufficient stock for {obj.name}'
+                        })
+                        continue
+                    delta = -delta
+
+                obj.quantity += delta
+                changed[item_type][obj.id] = obj
+                movements.append(InventoryMovement(
+                    movement_type=movement_type,
+                    quantity=delta,
+                    balance_after=obj.quantity,
+                    created_by=user,
+                    note=note,
+                    **{f'{item_type}_id': obj.id},
+                ))
+                if deducting:
+                    message = f'Successfully deducted {quantity} {unit} from {obj.name}'
+                else:
+                    message = f'Successfully restocked {obj.name} with {quantity} {unit}'
+                results.append({
+                    'id': obj.id,
+                    'name': obj.name,
+                    'type': item_type,
+                    'success': True,
+                    'quantity': obj.quantity,
+                    'message': message
+                })
+
+            # One UPDATE per model (per BULK_UPDATE_CHUNK items) applying each
+            # item's net change relative to the stored value via CASE
+            for item_type, model in models_by_type.items():
+                quantity_field = model._meta.get_field('quantity')
+                deltas = [
+                    (obj.id, obj.quantity - original[item_type][obj.id])
+                    for obj in changed[item_type].values()
+                ]
+                deltas = [(pk, delta) for pk, delta in deltas if delta]
+                for start in range(0, len(deltas), InventoryManager.BULK_UPDATE_CHUNK):
+                    chunk = deltas[start:start + InventoryManager.BULK_UPDATE_CHUNK]
+                    model.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+                        quantity=F('quantity') + Case(
+                            *[When(pk=pk, then=Value(delta, output_field=quantity_field)) for pk, delta in chunk],
+                            output_field=quantity_field,
+                        )
+                    )
+            InventoryMovement.objects.bulk_create(movements, batch_size=500)
+
+        return results
+
+    @staticmethod
+    def set_stock(item, quantity, user=None, note=''):
+        """
+        Set a fabric's or accessory's stock to an absolute level, recording
+        the difference as an ADJUSTMENT movement (e.g. after a stock count).
+        """
+        with transaction.atomic():
+            current = type(item).objects.select_for_update().values_list(
+                'quantity', flat=True
+            ).get(pk=item.pk)
+            if quantity != current:
+                InventoryManager.adjust_stock(
+                    item, quantity - current, 'ADJUSTMENT', user=user, note=note
+                )
+        item.quantity = quantity
+        return item
+
+    @staticmethod
+    def save_item_details(item):
+        """
+        Save a fabric's or accessory's other fields without writing its
+        quantity, which only changes through the ledger; a full save() could
+        overwrite deductions made since the item was loaded.
+        """
+        item.save(update_fields=[
+            field.name for field in item._meta.concrete_fields
+            if not field.primary_key and field.name != 'quantity'
+        ])
+        return item
+
+    @staticmethod
+    def reverse_order_deduction(order, user=None, note=''):
+        """
+        Put back the stock the ledger shows was deducted for an order and
+        clear its ``inventory_deducted`` flag, e.g. when an order is cancelled.
+
+        Returns the reversed deduction report, or None if the order had no
+        deduction to reverse.
+        """
+        with transaction.atomic():
+            released = Order.objects.filter(
+                pk=order.pk, inventory_deducted=True
+            ).update(inventory_deducted=False)
+            if not released:
+                return None
+            report = InventoryManager.get_recorded_deduction(order)
+            note = note or f'Reversal of order #{order.id}'
+            deducted = InventoryMovement.objects.filter(order=order).values(
+                'fabric_id', 'accessory_id'
+            ).annotate(net=Sum('quantity')).filter(net__lt=0).order_by()
+            for row in deducted:
+                model = Fabric if row['fabric_id'] else Accessory
+                item_id = row['fabric_id'] or row['accessory_id']
+                model.objects.filter(pk=item_id).update(quantity=F('quantity') - row['net'])
+                InventoryManager._record_movements(
+                    model, [item_id], -row['net'], 'REVERSAL', order=order, user=user, note=note
+                )
+        order.inventory_deducted = False
+        return report
+
+    @staticmethod
+    def get_movement_summary(date_from=None, date_to=None, movement_types=None):
+        """
+        Total movements per item and movement type over an optional date range.
+
+        Served by the ledger's (movement_type, created_at) index rather than by
+        re-deriving usage from orders.
+        """
+        movements = InventoryMovement.objects.all()
+        if date_from:
+            movements = movements.filter(created_at__gte=date_from)
+        if date_to:
+            movements = movements.filter(created_at__lt=date_to)
+        if movement_types:
+            movements = movements.filter(movement_type__in=movement_types)
+        return list(
+            movements.values(
+                'movement_type', 'fabric_id', 'fabric__name', 'accessory_id', 'accessory__name'
+            ).annotate(total=Sum('quantity')).order_by('movement_type', 'total')
+        )
+
+    @staticmethod
+    def reconcile_stock(fix=False):
+        """
+        Replay the ledger and compare each item's movement total with its
+        cached stock. With ``fix=True`` the cached quantity is reset to the
+        ledger balance.
+
+        Returns a list of discrepancies
+        (``{'type', 'id', 'name', 'cached', 'ledger'}``).
+        """
+        discrepancies = []
+        for model, field in ((Fabric, 'fabric'), (Accessory, 'accessory')):
+            ledger = dict(
+                InventoryMovement.objects.filter(**{f'{field}__isnull': False})
+                .values_list(f'{field}_id').annotate(total=Sum('quantity')).order_by()
+            )
+            for item_id, name, cached in model.objects.values_list('id', 'name', 'quantity'):
+                expected = Decimal(ledger.get(item_id, 0)).quantize(Decimal('0.01'))
+                if expected != cached:
+                    discrepancies.append({
+                        'type': field,
+                        'id': item_id,
+                        'name': name,
+                        'cached': cached,
+                        'ledger': expected,
+                    })
+            if fix:
+                for row in discrepancies:
+                    if row['type'] == field:
+                        model.objects.filter(pk=row['id']).update(quantity=row['ledger'], updated_at=timezone.now())
+        return discrepancies
+
     # Legacy methods for backward compatibility
     @staticmethod
     def check_inventory(order):
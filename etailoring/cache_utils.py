@@ -0,0 +1,46 @@
+"""
+Helpers for caching values derived from the orders table.
+
+Cached entries are keyed on an orders "version" counter that is bumped
+whenever an Order is saved or deleted (see the signal handlers in
+models.py), so a write makes every summary computed before it unreachable.
+Writes that bypass signals (``QuerySet.update()``) and per-process cache
+backends are covered by keeping the TTL short.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+ORDERS_VERSION_KEY = 'etailoring:orders:version'
+
+
+def get_orders_version():
+    """Return the current orders version, initialising it if needed."""
+    return cache.get_or_set(ORDERS_VERSION_KEY, 1, None)
+
+
+def bump_orders_version():
+    """Invalidate everything cached against the current orders version."""
+    try:
+        cache.incr(ORDERS_VERSION_KEY)
+    except ValueError:
+        # Key missing (evicted or never set)
+        cache.set(ORDERS_VERSION_KEY, 1, None)
+
+
+def cached_for_orders(name, compute, timeout=None):
+    """
+    Return ``compute()``, cached under `name` until the next Order write or
+    for `timeout` seconds (default ``ORDERS_CACHE_TIMEOUT``). A timeout of 0
+    disables caching.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'ORDERS_CACHE_TIMEOUT', 30)
+    if not timeout:
+        return compute()
+
+    key = f'etailoring:{name}:v{get_orders_version()}'
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
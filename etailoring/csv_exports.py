@@ -0,0 +1,154 @@
+"""
+Streaming CSV exports for the admin reports.
+
+Each export is a header plus a generator of rows read with
+``values_list(...).iterator(chunk_size=...)`` over a queryset that joins
+everything a row needs, so there is one query per export, no model instances
+are built, and memory stays flat however many rows are exported.
+"""
+import csv
+
+from django.http import StreamingHttpResponse
+
+from .models import Accessory, Commission, Fabric, Order
+
+CHUNK_SIZE = 2000
+
+# Rows are encoded and handed to the server in batches of this many lines
+ROWS_PER_WRITE = 500
+
+SALES_HEADER = ['Order ID', 'Created At', 'Customer', 'Tailor', 'Total Amount', 'Status']
+
+ORDERS_HEADER = [
+    'Order ID', 'Created At', 'Customer', 'Phone', 'Category', 'Garment Type', 'Quantity',
+    'Status', 'Payment Status', 'Total Amount', 'Down Payment', 'Due Date', 'Tailor', 'Claimed At'
+]
+
+COMMISSIONS_HEADER = ['Commission ID', 'Created At', 'Tailor', 'Order ID', 'Amount', 'Status', 'Paid At']
+
+CLAIMS_HEADER = [
+    'Claim ID', 'Order ID', 'Customer', 'Claimant Name', 'Claimant Phone', 'Recorded By',
+    'Recorded At', 'Notes', 'Reversed'
+]
+
+INVENTORY_HEADER = ['Type', 'ID', 'Name', 'Unit', 'Quantity', 'Low Stock Threshold', 'Price Per Unit', 'Low Stock']
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _full_name(first, last):
+    return f"{first or ''} {last or ''}".strip()
+
+
+def _isoformat(value):
+    return value.isoformat() if value else ''
+
+
+def _in_range(queryset, field, date_from=None, date_to=None):
+    if date_from is not None:
+        queryset = queryset.filter(**{f'{field}__gte': date_from})
+    if date_to is not None:
+        queryset = queryset.filter(**{f'{field}__lte': date_to})
+    return queryset
+
+
+def sales_rows(date_from=None, date_to=None):
+    orders = _in_range(Order.objects.all(), 'created_at', date_from, date_to).order_by('created_at', 'id')
+    for (order_id, created_at, first, last, tailor_first, tailor_last, total, status) in orders.values_list(
+        'id', 'created_at', 'customer__user__first_name', 'customer__user__last_name',
+        'task__tailor__user__first_name', 'task__tailor__user__last_name', 'total_amount', 'status',
+    ).iterator(chunk_size=CHUNK_SIZE):
+        yield [
+            order_id, created_at.isoformat(), _full_name(first, last),
+            _full_name(tailor_first, tailor_last), str(total or 0), status,
+        ]
+
+
+def order_rows(date_from=None, date_to=None):
+    orders = _in_range(Order.objects.all(), 'created_at', date_from, date_to).order_by('created_at', 'id')
+    for row in orders.values_list(
+        'id', 'created_at', 'customer__user__first_name', 'customer__user__last_name',
+        'customer__phone_number', 'category', 'garment_type', 'quantity', 'status', 'payment_status',
+        'total_amount', 'down_payment_amount', 'due_date',
+        'task__tailor__user__first_name', 'task__tailor__user__last_name', 'claimed_at',
+    ).iterator(chunk_size=CHUNK_SIZE):
+        (order_id, created_at, first, last, phone, category, garment_type, quantity, status,
+         payment_status, total, down_payment, due_date, tailor_first, tailor_last, claimed_at) = row
+        yield [
+            order_id, created_at.isoformat(), _full_name(first, last), phone, category, garment_type,
+            quantity, status, payment_status, str(total or 0), str(down_payment or 0),
+            _isoformat(due_date), _full_name(tailor_first, tailor_last), _isoformat(claimed_at),
+        ]
+
+
+def commission_rows(date_from=None, date_to=None):
+    commissions = _in_range(Commission.objects.all(), 'created_at', date_from, date_to).order_by('created_at', 'id')
+    for (commission_id, created_at, first, last, order_id, amount, status, paid_at) in commissions.values_list(
+        'id', 'created_at', 'tailor__user__first_name', 'tailor__user__last_name', 'order_id',
+        'amount', 'status', 'paid_at',
+    ).iterator(chunk_size=CHUNK_SIZE):
+        yield [
+            commission_id, created_at.isoformat(), _full_name(first, last), order_id,
+            str(amount), status, _isoformat(paid_at),
+        ]
+
+
+def claim_values(claims):
+    """Rows for an already filtered Claim queryset, with ``recorded_at`` left as a datetime.
+
+    Shared by the CSV and PDF claims exports (see export_claims_report).
+    """
+    for row in claims.values_list(
+        'id', 'order_id', 'order__customer__user__first_name', 'order__customer__user__last_name',
+        'claimant_name', 'claimant_phone', 'recorded_by__first_name', 'recorded_by__last_name',
+        'recorded_at', 'notes', 'reversed',
+    ).iterator(chunk_size=CHUNK_SIZE):
+        (claim_id, order_id, first, last, claimant_name, claimant_phone,
+         recorder_first, recorder_last, recorded_at, notes, reversed_) = row
+        yield [
+            claim_id, order_id or '', _full_name(first, last), claimant_name, claimant_phone,
+            _full_name(recorder_first, recorder_last), recorded_at, notes, reversed_,
+        ]
+
+
+def claim_rows(claims):
+    """CSV rows for an already filtered Claim queryset."""
+    for row in claim_values(claims):
+        row[6] = _isoformat(row[6])
+        yield row
+
+
+def inventory_rows():
+    for model, label in ((Fabric, 'Fabric'), (Accessory, 'Accessory')):
+        fields = ['id', 'name', 'quantity', 'low_stock_threshold', 'price_per_unit']
+        if model is Fabric:
+            fields.append('unit_type')
+        for row in model.objects.order_by('name', 'id').values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+            item_id, name, quantity, threshold, price = row[:5]
+            unit = row[5] if model is Fabric else 'PIECES'
+            yield [label, item_id, name, unit, quantity, threshold, str(price), quantity <= threshold]
+
+
+def iter_csv(header, rows):
+    """Encode ``header`` and ``rows`` as CSV text in batches of ROWS_PER_WRITE lines."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    batch = []
+    for row in rows:
+        batch.append(writer.writerow(row))
+        if len(batch) >= ROWS_PER_WRITE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def streaming_csv_response(filename, header, rows):
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
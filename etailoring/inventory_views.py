@@ -23,8 +23,7 @@ def restock_fabric(request, fabric_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        fabric.quantity += quantity
-        fabric.save()
+        InventoryManager.restock(fabric, quantity, user=request.user)
         
         return Response({
             'id': fabric.id,
@@ -60,8 +59,7 @@ def restock_accessory(request, accessory_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        accessory.quantity += quantity
-        accessory.save()
+        InventoryManager.restock(accessory, quantity, user=request.user)
         
         return Response({
             'id': accessory.id,
@@ -88,34 +86,11 @@ def get_low_stock_items(request):
     Get a list of items with low stock
     """
     try:
-        low_stock_fabrics = Fabric.objects.filter(
-            quantity__lte=Fabric.objects.values_list('low_stock_threshold', flat=True)
-        )
-        
-        low_stock_accessories = Accessory.objects.filter(
-            quantity__lte=Accessory.objects.values_list('low_stock_threshold', flat=True)
-        )
-        
-        fabric_data = [{
-            'id': fabric.id,
-            'name': fabric.name,
-            'type': 'fabric',
-            'quantity': fabric.quantity,
-            'threshold': fabric.low_stock_threshold,
-            'unit_type': fabric.unit_type
-        } for fabric in low_stock_fabrics]
-        
-        accessory_data = [{
-            'id': accessory.id,
-            'name': accessory.name,
-            'type': 'accessory',
-            'quantity': accessory.quantity,
-            'threshold': accessory.low_stock_threshold
-        } for accessory in low_stock_accessories]
+        items = InventoryManager.get_low_stock_items()
         
         return Response({
-            'low_stock_items': fabric_data + accessory_data,
-            'count': len(fabric_data) + len(accessory_data)
+            'low_stock_items': items,
+            'count': len(items)
         })
     except Exception as e:
         return Response(
@@ -133,19 +108,12 @@ def get_inventory_summary(request):
     try:
         fabrics_count = Fabric.objects.count()
         accessories_count = Accessory.objects.count()
-        
-        low_stock_fabrics_count = Fabric.objects.filter(
-            quantity__lte=Fabric.objects.values_list('low_stock_threshold', flat=True)
-        ).count()
-        
-        low_stock_accessories_count = Accessory.objects.filter(
-            quantity__lte=Accessory.objects.values_list('low_stock_threshold', flat=True)
-        ).count()
+        low_stock = InventoryManager.get_low_stock_counts()
         
         return Response({
             'fabrics_count': fabrics_count,
             'accessories_count': accessories_count,
-            'low_stock_count': low_stock_fabrics_count + low_stock_accessories_count,
+            'low_stock_count': low_stock['total'],
             'total_items': fabrics_count + accessories_count
         })
     except Exception as e:
@@ -159,74 +127,14 @@ def get_inventory_summary(request):
 @permission_classes([IsAuthenticated, IsAdminUser])
 def bulk_restock(request):
     """
-    Restock multiple items at once
+    Restock multiple items at once.
+
+    The whole payload is applied in one transaction with a constant number
+    of queries; each item gets its own result entry.
     """
     try:
         items = request.data.get('items', [])
-        results = []
-        
-        for item in items:
-            item_type = item.get('type')
-            item_id = item.get('id')
-            quantity = float(item.get('quantity', 0))
-            
-            if quantity <= 0:
-                results.append({
-                    'id': item_id,
-                    'type': item_type,
-                    'success': False,
-                    'message': 'Quantity must be greater than 0'
-                })
-                continue
-            
-            if item_type == 'fabric':
-                try:
-                    fabric = Fabric.objects.get(id=item_id)
-                    fabric.quantity += quantity
-                    fabric.save()
-                    results.append({
-                        'id': fabric.id,
-                        'name': fabric.name,
-                        'type': 'fabric',
-                        'success': True,
-                        'quantity': fabric.quantity,
-                        'message': f'Successfully restocked {fabric.name} with {quantity} {fabric.unit_type}'
-                    })
-                except Fabric.DoesNotExist:
-                    results.append({
-                        'id': item_id,
-                        'type': 'fabric',
-                        'success': False,
-                        'message': 'Fabric not found'
-                    })
-            
-            elif item_type == 'accessory':
-                try:
-                    accessory = Accessory.objects.get(id=item_id)
-                    accessory.quantity += quantity
-                    accessory.save()
-                    results.append({
-                        'id': accessory.id,
-                        'name': accessory.name,
-                        'type': 'accessory',
-                        'success': True,
-                        'quantity': accessory.quantity,
-                        'message': f'Successfully restocked {accessory.name} with {quantity} units'
-                    })
-                except Accessory.DoesNotExist:
-                    results.append({
-                        'id': item_id,
-                        'type': 'accessory',
-                        'success': False,
-                        'message': 'Accessory not found'
-                    })
-            else:
-                results.append({
-                    'id': item_id,
-                    'type': item_type,
-                    'success': False,
-                    'message': 'Invalid item type'
-                })
+        results = InventoryManager.bulk_restock(items, user=request.user, note='Bulk restock')
         
         return Response({
             'results': results,
@@ -260,7 +168,11 @@ def deduct_inventory(request, order_id=None):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                InventoryManager.deduct_inventory(order)
+                if InventoryManager.deduct_inventory_once(order) is None:
+                    return Response(
+                        {'detail': f'Inventory already deducted for order #{order.id}'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
                 
                 return Response({
                     'message': f'Successfully deducted inventory for order #{order.id}'
@@ -271,92 +183,9 @@ def deduct_inventory(request, order_id=None):
                     status=status.HTTP_404_NOT_FOUND
                 )
         else:
-            # Manual deduction
+            # Manual deduction, applied as one batch
             items = request.data.get('items', [])
-            results = []
-            
-            for item in items:
-                item_type = item.get('type')
-                item_id = item.get('id')
-                quantity = float(item.get('quantity', 0))
-                
-                if quantity <= 0:
-                    results.append({
-                        'id': item_id,
-                        'type': item_type,
-                        'success': False,
-                        'message': 'Quantity must be greater than 0'
-                    })
-                    continue
-                
-                if item_type == 'fabric':
-                    try:
-                        fabric = Fabric.objects.get(id=item_id)
-                        if fabric.quantity < quantity:
-                            results.append({
-                                'id': fabric.id,
-                                'name': fabric.name,
-                                'type': 'fabric',
-                                'success': False,
-                                'message': f'Insufficient stock for {fabric.name}'
-                            })
-                            continue
-                        
-                        fabric.quantity -= quantity
-                        fabric.save()
-                        results.append({
-                            'id': fabric.id,
-                            'name': fabric.name,
-                            'type': 'fabric',
-                            'success': True,
-                            'quantity': fabric.quantity,
-                            'message': f'Successfully deducted {quantity} {fabric.unit_type} from {fabric.name}'
-                        })
-                    except Fabric.DoesNotExist:
-                        results.append({
-                            'id': item_id,
-                            'type': 'fabric',
-                            'success': False,
-                            'message': 'Fabric not found'
-                        })
-                
-                elif item_type == 'accessory':
-                    try:
-                        accessory = Accessory.objects.get(id=item_id)
-                        if accessory.quantity < quantity:
-                            results.append({
-                                'id': accessory.id,
-                                'name': accessory.name,
-                                'type': 'accessory',
-                                'success': False,
-                                'message': f'Insufficient stock for {accessory.name}'
-                            })
-                            continue
-                        
-                        accessory.quantity -= quantity
-                        accessory.save()
-                        results.append({
-                            'id': accessory.id,
-                            'name': accessory.name,
-                            'type': 'accessory',
-                            'success': True,
-                            'quantity': accessory.quantity,
-                            'message': f'Successfully deducted {quantity} units from {accessory.name}'
-                        })
-                    except Accessory.DoesNotExist:
-                        results.append({
-                            'id': item_id,
-                            'type': 'accessory',
-                            'success': False,
-                            'message': 'Accessory not found'
-                        })
-                else:
-                    results.append({
-                        'id': item_id,
-                        'type': item_type,
-                        'success': False,
-                        'message': 'Invalid item type'
-                    })
+            results = InventoryManager.bulk_deduct(items, user=request.user)
             
             return Response({
                 'results': results,
@@ -374,6 +203,10 @@ def deduct_inventory(request, order_id=None):
 def deduction_report(request, order_id):
     """
     Return a detailed deduction report for a specific order without mutating inventory.
+
+    `report` previews the garment-based requirements against current stock;
+    `recorded` is what the inventory ledger actually deducted for the order
+    (None until the order has been deducted).
     """
     from .models import Order
     try:
@@ -383,6 +216,9 @@ def deduction_report(request, order_id):
 
     try:
         report = InventoryManager.get_deduction_report(order)
-        return Response({'report': report})
+        recorded = None
+        if order.inventory_deducted:
+            recorded = InventoryManager.get_recorded_deduction(order)
+        return Response({'report': report, 'recorded': recorded})
     except Exception as e:
         return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Management command to benchmark the admin dashboard chart queries
+Usage: python manage.py benchmark_charts [--orders 200000]
+
+Creates synthetic orders spread over the last year inside a transaction that
+is rolled back at the end, so it is safe to run against a development database.
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from ... import analytics
+from ...models import Customer, Fabric, Order
+
+
+class Command(BaseCommand):
+    help = 'Benchmark in-Python versus grouped-query dashboard chart aggregation'
+
+    STATUSES = ['PENDING', 'ASSIGNED', 'IN_PROGRESS', 'COMPLETED', 'APPROVED', 'CANCELLED']
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--orders',
+            type=int,
+            default=200000,
+            help='Number of synthetic orders to create (default: 200000)'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            start = time.perf_counter()
+            self.create_orders(options['orders'])
+            self.stdout.write(
+                f"Created {options['orders']} orders in {time.perf_counter() - start:.1f} s"
+            )
+
+            end_date = timezone.now()
+            start_date = end_date - timedelta(days=365)
+
+            self.run('Revenue by month (Python loop)', lambda: self.legacy_revenue(start_date, end_date))
+            for bucket in analytics.BUCKET_SIZES:
+                self.run(
+                    f'Revenue by {bucket} (grouped query)',
+                    lambda: analytics.revenue_by_period(start_date, end_date, bucket)
+                )
+            self.run('Status counts (Python loop)', self.legacy_status_counts)
+            self.run('Status counts (grouped query)', analytics.order_status_counts)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; synthetic data rolled back'))
+
+    def create_orders(self, count):
+        user = User.objects.create_user(username='benchmark-charts-customer')
+        customer = Customer.objects.create(user=user, phone_number='09170000000', address='Benchmark')
+        fabric = Fabric.objects.create(
+            name='Benchmark fabric', unit_type='METERS', quantity=Decimal('0.00'), price_per_unit=Decimal('1.00')
+        )
+
+        # created_at is auto_now_add, so insert one day's worth of orders at a
+        # time and then move that batch to its day
+        now = timezone.now()
+        per_day = max(1, count // 365)
+        created = 0
+        day = 0
+        while created < count:
+            batch = min(per_day, count - created)
+            last_id = Order.objects.order_by('-id').values_list('id', flat=True).first() or 0
+            Order.objects.bulk_create([
+                Order(
+                    customer=customer,
+                    fabric=fabric,
+                    status=self.STATUSES[(created + i) % len(self.STATUSES)],
+                    total_amount=Decimal('550.00'),
+                    inventory_deducted=True,
+                )
+                for i in range(batch)
+            ], batch_size=1000)
+            Order.objects.filter(id__gt=last_id).update(created_at=now - timedelta(days=day % 365, minutes=1))
+            created += batch
+            day += 1
+
+    def legacy_revenue(self, start_date, end_date):
+        """The previous implementation: bucket every order in Python"""
+        monthly_revenue = {}
+        for order in Order.objects.filter(created_at__range=[start_date, end_date]):
+            month_key = order.created_at.strftime('%Y-%m')
+            monthly_revenue[month_key] = monthly_revenue.get(month_key, 0) + float(order.total_amount or 0)
+        return monthly_revenue
+
+    def legacy_status_counts(self):
+        """The previous implementation: count statuses in Python"""
+        status_counts = {}
+        for order in Order.objects.all():
+            status_counts[order.status] = status_counts.get(order.status, 0) + 1
+        return status_counts
+
+    def run(self, label, func):
+        start = time.perf_counter()
+        func()
+        self.stdout.write(f'{label}: {(time.perf_counter() - start) * 1000:.1f} ms')
@@ -0,0 +1,77 @@
+"""
+Management command to benchmark bulk inventory updates
+Usage: python manage.py benchmark_inventory [--items 1000]
+
+Creates synthetic fabrics/accessories inside a transaction that is rolled
+back at the end, so it is safe to run against a development database.
+"""
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ...business_logic import InventoryManager
+from ...models import Fabric, Accessory
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-item versus batched restock and manual deduction'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=1000,
+            help='Number of items in the payload (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['items']
+
+        with transaction.atomic():
+            payload = self.create_items(count)
+
+            self.stdout.write(f'=== {len(payload)} items ===')
+            self.run('Per-item restock', lambda: self.per_item(payload, InventoryManager.restock))
+            self.run('Batched restock', lambda: InventoryManager.bulk_restock(payload))
+            self.run('Per-item deduction', lambda: self.per_item(payload, InventoryManager.deduct_stock))
+            self.run('Batched deduction', lambda: InventoryManager.bulk_deduct(payload))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; synthetic data rolled back'))
+
+    def create_items(self, count):
+        fabrics = Fabric.objects.bulk_create([
+            Fabric(
+                name=f'Benchmark fabric {i}', unit_type='METERS',
+                quantity=Decimal('100.00'), price_per_unit=Decimal('10.00')
+            )
+            for i in range(count // 2)
+        ])
+        accessories = Accessory.objects.bulk_create([
+            Accessory(name=f'Benchmark accessory {i}', quantity=100, price_per_unit=Decimal('1.00'))
+            for i in range(count - count // 2)
+        ])
+        # Varied quantities, as in a real restock; every item's change differs
+        # from its neighbours'
+        return (
+            [{'type': 'fabric', 'id': f.id, 'quantity': 1 + i % 7 + 0.25} for i, f in enumerate(fabrics)]
+            + [{'type': 'accessory', 'id': a.id, 'quantity': 1 + i % 7} for i, a in enumerate(accessories)]
+        )
+
+    def per_item(self, payload, operation):
+        """The previous request path: one lookup and one write per item"""
+        for item in payload:
+            model = Fabric if item['type'] == 'fabric' else Accessory
+            operation(model.objects.get(id=item['id']), item['quantity'])
+
+    def run(self, label, func):
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f'{label}: {elapsed * 1000:.1f} ms, {len(ctx.captured_queries)} queries')
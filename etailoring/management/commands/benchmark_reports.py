@@ -0,0 +1,87 @@
+"""
+Management command to benchmark PDF report rendering
+Usage: python manage.py benchmark_reports [--claims 5000] [--repeat 3]
+
+Creates synthetic claims inside a transaction that is rolled back at the end,
+so it is safe to run against a development database.
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from ...admin_report_generator import AdminReportGenerator
+from ...admin_report_views import export_claims_report
+from ...models import Claim, Customer, Fabric, Order
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PDF build time for the claims export and the admin business overview'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--claims',
+            type=int,
+            default=5000,
+            help='Number of synthetic claims to create (default: 5000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of timed builds per report (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            admin = self.create_claims(options['claims'])
+
+            request = RequestFactory().get('/admin-claims/export/', {'format': 'pdf'})
+            request.user = admin
+            self.run(f"Claims PDF ({options['claims']} rows)", options['repeat'],
+                     lambda: export_claims_report(request).content)
+
+            end_date = timezone.now()
+            start_date = end_date - timedelta(days=30)
+            self.run('Business overview PDF', options['repeat'],
+                     lambda: AdminReportGenerator('business', start_date, end_date, admin).generate_report())
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; synthetic data rolled back'))
+
+    def create_claims(self, count):
+        admin = User.objects.create_user(
+            username='benchmark-reports-admin', first_name='Bench', last_name='Admin', is_staff=True
+        )
+        user = User.objects.create_user(username='benchmark-reports-customer', first_name='Bench', last_name='Customer')
+        customer = Customer.objects.create(user=user, phone_number='09170000000', address='Benchmark')
+        fabric = Fabric.objects.create(
+            name='Benchmark fabric', unit_type='METERS', quantity=Decimal('0.00'), price_per_unit=Decimal('1.00')
+        )
+        orders = Order.objects.bulk_create([
+            Order(customer=customer, fabric=fabric, status='CLAIMED', total_amount=Decimal('550.00'),
+                  inventory_deducted=True)
+            for _ in range(count)
+        ], batch_size=1000)
+        Claim.objects.bulk_create([
+            Claim(order=order, claimant_name=f'Claimant {i}', claimant_phone='09171234567', recorded_by=admin,
+                  notes='Picked up at the counter' if i % 3 else '')
+            for i, order in enumerate(orders)
+        ], batch_size=1000)
+        return admin
+
+    def run(self, label, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        self.stdout.write(
+            f'{label}: best {min(timings) * 1000:.0f} ms, mean {sum(timings) / len(timings) * 1000:.0f} ms'
+        )
@@ -0,0 +1,97 @@
+"""
+Management command to measure how long the project takes to start
+Usage: python manage.py benchmark_startup [--budget-ms 1000] [--top 15]
+
+Runs ``django.setup()`` plus loading and resolving the URLconf in a fresh
+interpreter under ``python -X importtime`` and reports the total import time
+and the slowest imports. It fails when the total is over the budget or when
+one of the modules that should only load on first use (ReportLab, matplotlib
+and the report generators) was imported during startup.
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_SCRIPT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver, resolve; get_resolver().url_patterns; resolve('/')"
+)
+
+# Loaded by the report endpoints on first use, never at startup
+LAZY_MODULES = (
+    'reportlab',
+    'matplotlib',
+    'etailoring.report_generator',
+    'etailoring.admin_report_generator',
+    'etailoring.report_utils',
+)
+
+
+def measure_startup():
+    """
+    Return ``(total_us, imports)`` for a fresh startup, where ``imports``
+    maps each imported module to its cumulative import time in microseconds.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+
+    total = 0
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        cumulative = int(cumulative)
+        imports[name.strip()] = cumulative
+        # Nested imports are indented and already counted by their parent
+        if not name[1:].startswith(' '):
+            total += cumulative
+    return total, imports
+
+
+class Command(BaseCommand):
+    help = 'Measure import time of django.setup() plus URL resolution against a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            default=1000,
+            help='Fail when startup imports take longer than this (default: 1000)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Number of slowest imports to list (default: 15)'
+        )
+
+    def handle(self, *args, **options):
+        total, imports = measure_startup()
+
+        for name, cumulative in sorted(imports.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'{cumulative / 1000:8.1f} ms  {name}')
+        self.stdout.write(f'Total startup imports: {total / 1000:.1f} ms (budget {options["budget_ms"]:.0f} ms)')
+
+        eager = sorted(
+            name for name in imports
+            if any(name == module or name.startswith(module + '.') for module in LAZY_MODULES)
+        )
+        if eager:
+            raise CommandError(f'Imported at startup but should load on first use: {", ".join(eager[:10])}')
+        if total / 1000 > options['budget_ms']:
+            raise CommandError(
+                f'Startup imports took {total / 1000:.1f} ms, over the {options["budget_ms"]:.0f} ms budget'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Startup is within budget'))
@@ -0,0 +1,127 @@
+"""
+Management command that sends queued SMS messages
+Usage: python manage.py dispatch_sms_outbox [--workers 4] [--poll-interval 5] [--once]
+
+Due SmsOutbox rows are claimed in this process and sent from a pool of
+threads, since sending is spent waiting on the SMS provider. Failed sends are
+rescheduled with exponential backoff and marked FAILED once they run out of
+attempts. Sends share the Semaphore rate limit with every other process, so
+extra workers queue for it rather than getting throttled; the summary shows
+how long they waited. Use --workers 0 to send one message at a time in this
+thread.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from ...sms_outbox import claim_messages, deliver_claimed, requeue_stale_messages
+from ...sms_service import SemaphoreSMS
+
+
+def _deliver(message_id):
+    try:
+        return deliver_claimed(message_id)
+    finally:
+        # Each pool thread has its own connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Send queued SMS messages, retrying failed ones with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Messages sent concurrently; 0 sends in this thread (default: 4)'
+        )
+
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between checks for due messages (default: 5)'
+        )
+
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no message is due instead of polling forever'
+        )
+
+        parser.add_argument(
+            '--stale-minutes',
+            type=int,
+            default=10,
+            help='Requeue messages left sending longer than this by a crashed worker (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 0:
+            raise CommandError('--workers cannot be negative')
+
+        requeued = requeue_stale_messages(timedelta(minutes=options['stale_minutes']))
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale SMS message(s)'))
+
+        limiter = SemaphoreSMS.rate_limiter()
+        before = limiter.stats() if limiter else None
+        self.counts = {'SENT': 0, 'PENDING': 0, 'FAILED': 0}
+        try:
+            if workers == 0:
+                self.run_inline(options)
+            else:
+                self.run_pool(workers, options)
+        except KeyboardInterrupt:
+            self.stdout.write('SMS dispatcher stopped')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {self.counts['SENT']}, retrying {self.counts['PENDING']}, failed {self.counts['FAILED']}"
+        ))
+        if limiter:
+            after = limiter.stats()
+            delayed = after['delayed'] - before['delayed']
+            waited = after['total_wait'] - before['total_wait']
+            self.stdout.write(
+                f'Rate limit: {delayed} send(s) waited, {waited:.1f}s in total '
+                f"(longest wait so far {after['max_wait']:.1f}s)"
+            )
+
+    def run_inline(self, options):
+        while True:
+            message_ids = claim_messages(1)
+            for message_id in message_ids:
+                self.report(message_id, deliver_claimed(message_id))
+            if not message_ids:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+
+    def run_pool(self, workers, options):
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sms-outbox') as pool:
+            in_flight = {}
+            while True:
+                for future in [f for f in in_flight if f.done()]:
+                    message_id = in_flight.pop(future)
+                    try:
+                        self.report(message_id, future.result())
+                    except Exception as e:
+                        self.stdout.write(self.style.ERROR(f'SMS #{message_id} crashed: {e}'))
+
+                close_old_connections()
+                for message_id in claim_messages(workers - len(in_flight)):
+                    in_flight[pool.submit(_deliver, message_id)] = message_id
+
+                if options['once'] and not in_flight:
+                    return
+                time.sleep(options['poll_interval'] if not in_flight else min(options['poll_interval'], 0.1))
+
+    def report(self, message_id, status):
+        self.counts[status] = self.counts.get(status, 0) + 1
+        style = {'SENT': self.style.SUCCESS, 'PENDING': self.style.WARNING}.get(status, self.style.ERROR)
+        self.stdout.write(style(f'SMS #{message_id}: {status}'))
@@ -0,0 +1,93 @@
+"""
+Management command that writes a ZIP of tailor performance reports
+Usage: python manage.py export_tailor_reports [--tailor 3 --tailor 5] [--period last_month]
+           [--from 2024-01-01 --to 2024-01-31] [--workers 4] [--output reports.zip]
+
+Renders one TailorReportGenerator PDF per tailor (every tailor by default) in
+a pool of worker processes, the same way as the admin batch download.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...models import Tailor
+from ...report_batch import iter_zip, render_tailor_reports
+from ...report_jobs import resolve_report_period
+
+
+class Command(BaseCommand):
+    help = 'Render performance reports for several tailors in parallel into one ZIP file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tailor',
+            dest='tailor_ids',
+            type=int,
+            action='append',
+            help='Tailor id to include (repeatable; default: every tailor)'
+        )
+
+        parser.add_argument(
+            '--period',
+            default='last_month',
+            choices=['last_week', 'last_month', 'last_quarter', 'ytd', 'all_time'],
+            help='Report period when --from/--to are not given (default: last_month)'
+        )
+
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            help='First day of the report period (YYYY-MM-DD)'
+        )
+
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            help='Last day of the report period (YYYY-MM-DD, inclusive)'
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Worker processes (default: settings.REPORT_BATCH_WORKERS or one per CPU core)'
+        )
+
+        parser.add_argument(
+            '--output',
+            help='ZIP file to write (default: Tailor_Reports_<timestamp>.zip)'
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] is not None and options['workers'] <= 0:
+            raise CommandError('--workers must be greater than 0')
+
+        tailors = Tailor.objects.select_related('user').order_by('user__first_name', 'user__last_name', 'id')
+        if options['tailor_ids']:
+            tailors = tailors.filter(id__in=options['tailor_ids'])
+        tailors = list(tailors)
+        if not tailors:
+            raise CommandError('No matching tailors')
+
+        try:
+            date_from, date_to = resolve_report_period(
+                options['period'],
+                options['date_from'],
+                options['date_to'],
+                all_time_start=min(tailor.user.date_joined for tailor in tailors).date(),
+            )
+        except ValueError:
+            raise CommandError('Invalid date. Use YYYY-MM-DD.')
+
+        output = options['output'] or f"Tailor_Reports_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        started = time.perf_counter()
+        reports = render_tailor_reports(tailors, date_from, date_to, workers=options['workers'])
+        with open(output, 'wb') as fh:
+            for chunk in iter_zip(reports):
+                fh.write(chunk)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(tailors)} report(s) for {date_from:%Y-%m-%d} to {date_to:%Y-%m-%d} '
+            f'to {output} in {elapsed:.2f}s'
+        ))
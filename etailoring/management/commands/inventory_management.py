@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.core.exceptions import ValidationError
-from django.db.models import F
+from django.utils import timezone
+from datetime import timedelta
 from ...models import Fabric, Accessory, Order
 from ...business_logic import InventoryManager
 
@@ -11,8 +12,8 @@ class Command(BaseCommand):
         parser.add_argument(
             'operation',
             type=str,
-            help='Operation to perform: check, restock, low-stock, deduct',
-            choices=['check', 'restock', 'low-stock', 'deduct']
+            help='Operation to perform: check, restock, low-stock, deduct, reverse, movements, reconcile',
+            choices=['check', 'restock', 'low-stock', 'deduct', 'reverse', 'movements', 'reconcile']
         )
         
         parser.add_argument(
@@ -36,7 +37,20 @@ class Command(BaseCommand):
         parser.add_argument(
             '--order-id',
             type=int,
-            help='Order ID for inventory deduction'
+            help='Order ID for inventory deduction or reversal'
+        )
+
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Number of days covered by the movements report (default: 30)'
+        )
+
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Reset cached stock to the ledger balance during reconcile'
         )
 
     def handle(self, *args, **options):
@@ -51,6 +65,12 @@ class Command(BaseCommand):
                 self.show_low_stock()
             elif operation == 'deduct':
                 self.deduct_inventory(options)
+            elif operation == 'reverse':
+                self.reverse_deduction(options)
+            elif operation == 'movements':
+                self.show_movements(options)
+            elif operation == 'reconcile':
+                self.reconcile(options)
                 
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully completed {operation} operation')
@@ -93,8 +113,7 @@ class Command(BaseCommand):
         if fabric_id:
             try:
                 fabric = Fabric.objects.get(id=fabric_id)
-                fabric.quantity += quantity
-                fabric.save()
+                InventoryManager.restock(fabric, quantity, note='Restocked via inventory_management')
                 self.stdout.write(
                     f"Restocked {fabric.name} with {quantity} units. "
                     f"New quantity: {fabric.quantity} {fabric.get_unit_type_display()}"
@@ -106,8 +125,7 @@ class Command(BaseCommand):
         elif accessory_id:
             try:
                 accessory = Accessory.objects.get(id=accessory_id)
-                accessory.quantity += quantity
-                accessory.save()
+                InventoryManager.restock(accessory, quantity, note='Restocked via inventory_management')
                 self.stdout.write(
                     f"Restocked {accessory.name} with {quantity} units. "
                     f"New quantity: {accessory.quantity} units"
@@ -121,7 +139,7 @@ class Command(BaseCommand):
     def show_low_stock(self):
         """Show items with low stock"""
         self.stdout.write('=== LOW STOCK FABRICS ===')
-        low_stock_fabrics = Fabric.objects.filter(quantity__lte=F('low_stock_threshold'))
+        low_stock_fabrics = InventoryManager.low_stock_fabrics()
         if low_stock_fabrics.exists():
             for fabric in low_stock_fabrics:
                 self.stdout.write(
@@ -132,7 +150,7 @@ class Command(BaseCommand):
             self.stdout.write('No fabrics with low stock')
             
         self.stdout.write('\n=== LOW STOCK ACCESSORIES ===')
-        low_stock_accessories = Accessory.objects.filter(quantity__lte=F('low_stock_threshold'))
+        low_stock_accessories = InventoryManager.low_stock_accessories()
         if low_stock_accessories.exists():
             for accessory in low_stock_accessories:
                 self.stdout.write(
@@ -164,7 +182,9 @@ class Command(BaseCommand):
                 return
                 
             # Deduct inventory
-            InventoryManager.deduct_inventory(order)
+            if InventoryManager.deduct_inventory_once(order) is None:
+                self.stdout.write(self.style.ERROR(f'Inventory already deducted for order #{order.id}'))
+                return
             self.stdout.write(f'Successfully deducted inventory for order #{order.id}')
             
             # Show updated inventory
@@ -181,4 +201,60 @@ class Command(BaseCommand):
         except ValidationError as e:
             self.stdout.write(self.style.ERROR(f'Validation error: {str(e)}'))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error deducting inventory: {str(e)}'))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f'Error deducting inventory: {str(e)}'))
+
+    def reverse_deduction(self, options):
+        """Put back the inventory deducted for an order"""
+        order_id = options.get('order_id')
+
+        if not order_id:
+            self.stdout.write(self.style.ERROR('--order-id is required for reverse operation'))
+            return
+
+        try:
+            order = Order.objects.get(id=order_id)
+        except Order.DoesNotExist:
+            self.stdout.write(self.style.ERROR(f'Order with ID {order_id} not found'))
+            return
+
+        report = InventoryManager.reverse_order_deduction(order)
+        if report is None:
+            self.stdout.write(self.style.ERROR(f'No inventory deduction to reverse for order #{order.id}'))
+            return
+
+        if report['fabric']:
+            self.stdout.write(f"Returned {report['fabric']['deducted_units']} units of {report['fabric']['name']}")
+        for accessory in report['accessories']:
+            self.stdout.write(f"Returned {accessory['deducted_units']} units of {accessory['name']}")
+
+    def show_movements(self, options):
+        """Summarise ledger movements per item over the last N days"""
+        days = options.get('days')
+        since = timezone.now() - timedelta(days=days)
+        summary = InventoryManager.get_movement_summary(date_from=since)
+
+        self.stdout.write(f'=== INVENTORY MOVEMENTS (last {days} days) ===')
+        if not summary:
+            self.stdout.write('No inventory movements recorded')
+            return
+
+        for row in summary:
+            name = row['fabric__name'] or row['accessory__name']
+            kind = 'Fabric' if row['fabric_id'] else 'Accessory'
+            self.stdout.write(f"{row['movement_type']}: {kind} {name}: {row['total']}")
+
+    def reconcile(self, options):
+        """Compare cached stock against a replay of the inventory ledger"""
+        fix = options.get('fix')
+        discrepancies = InventoryManager.reconcile_stock(fix=fix)
+
+        if not discrepancies:
+            self.stdout.write('Cached stock matches the inventory ledger')
+            return
+
+        for row in discrepancies:
+            self.stdout.write(
+                f"{row['type'].title()} {row['name']} (ID {row['id']}): "
+                f"cached {row['cached']}, ledger {row['ledger']}"
+                + (' [fixed]' if fix else '')
+            )
@@ -0,0 +1,65 @@
+"""
+Management command that recomputes the DailyMetrics rollup
+Usage: python manage.py rebuild_daily_metrics [--from 2024-01-01] [--to 2024-01-31] [--days 7]
+
+Run it once after migrating to backfill history, and again whenever orders,
+tasks, commissions or claims were changed without sending model signals
+(queryset.update(), bulk imports, raw SQL). Without options every day is
+rebuilt.
+"""
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...business_logic import MetricsManager
+
+
+class Command(BaseCommand):
+    help = 'Recompute the DailyMetrics rollup from orders, tasks, commissions and claims'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            help='First day to rebuild (YYYY-MM-DD)'
+        )
+
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            help='Last day to rebuild (YYYY-MM-DD, inclusive)'
+        )
+
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Rebuild only the last N days, including today'
+        )
+
+    def handle(self, *args, **options):
+        date_from = self.parse_date(options['date_from'])
+        date_to = self.parse_date(options['date_to'])
+        if options['days'] is not None:
+            if options['days'] <= 0:
+                raise CommandError('--days must be greater than 0')
+            date_to = timezone.localdate()
+            date_from = date_to - timedelta(days=options['days'] - 1)
+        if date_from and date_to and date_from > date_to:
+            raise CommandError('--from must not be after --to')
+
+        started = time.perf_counter()
+        rows = MetricsManager.rebuild_daily_metrics(date_from, date_to)
+        elapsed = time.perf_counter() - started
+
+        label = f"{date_from or 'start'} to {date_to or 'today'}"
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily metrics row(s) for {label} in {elapsed:.2f}s'))
+
+    def parse_date(self, value):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid date: {value}. Use YYYY-MM-DD.')
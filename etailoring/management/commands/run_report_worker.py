@@ -0,0 +1,105 @@
+"""
+Management command that renders queued report jobs
+Usage: python manage.py run_report_worker [--workers 2] [--poll-interval 2] [--once]
+
+Pending ReportJob rows are claimed in this process and rendered in a pool of
+worker processes, so slow PDF builds never block web requests. Use
+--workers 0 to render in-process (useful for debugging).
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from ...report_jobs import claim_jobs, requeue_stale_jobs, run_claimed_job
+
+
+class Command(BaseCommand):
+    help = 'Render queued report jobs in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of worker processes; 0 renders in this process (default: 2)'
+        )
+
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between checks for new jobs (default: 2)'
+        )
+
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling forever'
+        )
+
+        parser.add_argument(
+            '--stale-minutes',
+            type=int,
+            default=30,
+            help='Requeue jobs left running longer than this by a crashed worker (default: 30)'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 0:
+            self.stdout.write(self.style.ERROR('--workers cannot be negative'))
+            return
+
+        requeued = requeue_stale_jobs(timedelta(minutes=options['stale_minutes']))
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale report job(s)'))
+
+        try:
+            if workers == 0:
+                self.run_inline(options)
+            else:
+                self.run_pool(workers, options)
+        except KeyboardInterrupt:
+            self.stdout.write('Report worker stopped')
+
+    def run_inline(self, options):
+        while True:
+            job_ids = claim_jobs(1)
+            for job_id in job_ids:
+                self.report(job_id, run_claimed_job(job_id))
+            if not job_ids:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+
+    def run_pool(self, workers, options):
+        # spawn gives each worker a clean interpreter (no inherited database
+        # connections); django.setup() loads the app registry in each one.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as pool:
+            in_flight = {}
+            self.stdout.write(f'Report worker started with {workers} process(es)')
+            while True:
+                for future in [f for f in in_flight if f.done()]:
+                    job_id = in_flight.pop(future)
+                    try:
+                        self.report(job_id, future.result())
+                    except Exception as e:
+                        self.stdout.write(self.style.ERROR(f'Report job {job_id} crashed: {e}'))
+
+                close_old_connections()
+                for job_id in claim_jobs(workers - len(in_flight)):
+                    in_flight[pool.submit(run_claimed_job, job_id)] = job_id
+
+                if options['once'] and not in_flight:
+                    return
+                time.sleep(options['poll_interval'] if not in_flight else min(options['poll_interval'], 0.5))
+
+    def report(self, job_id, status):
+        style = self.style.SUCCESS if status == 'COMPLETED' else self.style.ERROR
+        self.stdout.write(style(f'Report job {job_id}: {status}'))
@@ -0,0 +1,63 @@
+"""
+Management command that runs a local fake of the Semaphore SMS API
+Usage: python manage.py run_sms_stub [--port 8025] [--latency 0.2] [--fail-with 500]
+
+Point the app at it with SMS_BACKEND = 'http_stub' (and SMS_STUB_URL if it
+does not run on 127.0.0.1:8025) to exercise the full HTTP send path, e.g.
+approvals and dispatch_sms_outbox at volume, without reaching Semaphore.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from ...sms_stub import StubSemaphoreServer
+
+
+class Command(BaseCommand):
+    help = 'Serve a local stand-in for the Semaphore messages endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--host',
+            default='127.0.0.1',
+            help='Interface to listen on (default: 127.0.0.1)'
+        )
+
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8025,
+            help='Port to listen on (default: 8025)'
+        )
+
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0,
+            help='Seconds to wait before answering each request (default: 0)'
+        )
+
+        parser.add_argument(
+            '--fail-with',
+            type=int,
+            help='Answer every request with this HTTP status instead of 200'
+        )
+
+    def handle(self, *args, **options):
+        if options['latency'] < 0:
+            raise CommandError('--latency cannot be negative')
+
+        try:
+            server = StubSemaphoreServer(
+                options['host'], options['port'],
+                latency=options['latency'], fail_with=options['fail_with'], verbose=options['verbosity'] > 1,
+            )
+        except OSError as e:
+            raise CommandError(f'Could not listen on {options["host"]}:{options["port"]}: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'SMS stub listening on {server.url}'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        self.stdout.write(f'SMS stub stopped after {server.request_count} request(s)')
@@ -0,0 +1,81 @@
+"""
+Management command that queues reminder SMS, meant to run daily from cron
+Usage: python manage.py send_reminders [--pickup-after-days 3] [--skip-pickup] [--skip-due-date]
+           [--batch-size 500] [--dry-run]
+
+Example crontab entry (08:00 every day):
+    0 8 * * * cd /path/to/stitchflow && python manage.py send_reminders
+
+Reminders are only queued in the SMS outbox; the dispatch_sms_outbox worker
+sends them. Running it again the same day queues nothing new.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...sms_reminders import BATCH_SIZE, queue_due_date_reminders, queue_pickup_reminders
+
+
+class Command(BaseCommand):
+    help = 'Queue pickup reminders for unclaimed orders and reminders for orders due tomorrow'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pickup-after-days',
+            type=int,
+            default=getattr(settings, 'SMS_PICKUP_REMINDER_DAYS', 3),
+            help='Remind customers whose approved order was not claimed after this many days '
+                 '(default: settings.SMS_PICKUP_REMINDER_DAYS or 3)'
+        )
+
+        parser.add_argument(
+            '--skip-pickup',
+            action='store_true',
+            help='Do not queue pickup reminders'
+        )
+
+        parser.add_argument(
+            '--skip-due-date',
+            action='store_true',
+            help='Do not queue reminders for orders due tomorrow'
+        )
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Orders read per query (default: {BATCH_SIZE})'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be queued without queueing anything'
+        )
+
+    def handle(self, *args, **options):
+        if options['pickup_after_days'] < 0:
+            raise CommandError('--pickup-after-days cannot be negative')
+        if not 0 < options['batch_size'] <= 900:
+            raise CommandError('--batch-size must be between 1 and 900')
+
+        campaigns = []
+        if not options['skip_pickup']:
+            campaigns.append(('Pickup', lambda: queue_pickup_reminders(
+                options['pickup_after_days'], batch_size=options['batch_size'], dry_run=options['dry_run']
+            )))
+        if not options['skip_due_date']:
+            campaigns.append(('Due date', lambda: queue_due_date_reminders(
+                batch_size=options['batch_size'], dry_run=options['dry_run']
+            )))
+
+        verb = 'would queue' if options['dry_run'] else 'queued'
+        for label, run in campaigns:
+            started = time.perf_counter()
+            stats = run()
+            self.stdout.write(self.style.SUCCESS(
+                f"{label} reminders: {verb} {stats['queued']} "
+                f"({stats['candidates']} matching orders, {stats['already_queued']} already reminded) "
+                f"in {time.perf_counter() - started:.2f}s"
+            ))
@@ -1,8 +1,17 @@
 """
 Management command to test SMS functionality
-Usage: python manage.py test_sms <phone_number>
+Usage: python manage.py test_sms <phone_number> [--backend memory] [--count 500]
+
+--backend overrides SMS_BACKEND for this run (semaphore, http_stub, console,
+memory); with --count the notification is sent that many times and the
+throughput is reported, to load-test a backend without a live API.
 """
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from etailoring.sms_backends import BACKENDS
 from etailoring.sms_service import SemaphoreSMS
 
 
@@ -27,11 +36,37 @@ class Command(BaseCommand):
             default=1,
             help='Order ID for the message'
         )
+        parser.add_argument(
+            '--backend',
+            choices=sorted(BACKENDS),
+            help='SMS backend to use instead of settings.SMS_BACKEND'
+        )
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=1,
+            help='Number of messages to send (default: 1)'
+        )
 
     def handle(self, *args, **options):
+        if options['count'] < 1:
+            raise CommandError('--count must be at least 1')
+
+        if options['backend']:
+            with override_settings(SMS_BACKEND=options['backend']):
+                self.send(options)
+        else:
+            self.send(options)
+
+    def send(self, options):
         phone_number = options['phone_number']
         customer_name = options['customer_name']
         order_id = options['order_id']
+        count = options['count']
+
+        if count > 1:
+            self.send_many(phone_number, customer_name, order_id, count)
+            return
 
         self.stdout.write(
             self.style.SUCCESS(f'Sending test SMS to {phone_number}...')
@@ -53,3 +88,21 @@ class Command(BaseCommand):
                 self.style.ERROR(f'✗ Failed to send SMS')
             )
             self.stdout.write(f'Error: {message}')
+
+    def send_many(self, phone_number, customer_name, order_id, count):
+        self.stdout.write(f'Sending {count} test SMS to {phone_number}...')
+        failed = 0
+        started = time.perf_counter()
+        for i in range(count):
+            success, _ = SemaphoreSMS.notify_customer_ready_for_pickup(
+                customer_name=customer_name,
+                customer_phone=phone_number,
+                order_id=order_id + i
+            )
+            failed += not success
+        elapsed = time.perf_counter() - started
+
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(
+            f'Sent {count - failed} of {count} in {elapsed:.2f}s ({count / elapsed:.1f} messages/s), {failed} failed'
+        ))
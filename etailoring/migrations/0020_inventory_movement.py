@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etailoring', '0019_order_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movement_type', models.CharField(choices=[('OPENING', 'Opening Balance'), ('ORDER_DEDUCTION', 'Order Deduction'), ('RESTOCK', 'Restock'), ('MANUAL_DEDUCTION', 'Manual Deduction'), ('REVERSAL', 'Reversal'), ('ADJUSTMENT', 'Adjustment')], max_length=20)),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('balance_after', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('accessory', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='etailoring.accessory')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inventory_movements', to=settings.AUTH_USER_MODEL)),
+                ('fabric', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='etailoring.fabric')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inventory_movements', to='etailoring.order')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['fabric', 'created_at'], name='movement_fabric_created_idx'), models.Index(fields=['accessory', 'created_at'], name='movement_accessory_created_idx'), models.Index(fields=['movement_type', 'created_at'], name='movement_type_created_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('accessory__isnull', True), ('fabric__isnull', False)), models.Q(('accessory__isnull', False), ('fabric__isnull', True)), _connector='OR'), name='movement_single_item')],
+            },
+        ),
+    ]
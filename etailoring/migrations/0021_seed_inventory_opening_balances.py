@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def create_opening_balances(apps, schema_editor):
+    Fabric = apps.get_model('etailoring', 'Fabric')
+    Accessory = apps.get_model('etailoring', 'Accessory')
+    InventoryMovement = apps.get_model('etailoring', 'InventoryMovement')
+    # Start the ledger from the current stock so replaying it reproduces the
+    # cached quantities on Fabric/Accessory
+    movements = []
+    for model, field in ((Fabric, 'fabric_id'), (Accessory, 'accessory_id')):
+        for item_id, quantity in model.objects.exclude(quantity=0).values_list('id', 'quantity'):
+            movements.append(InventoryMovement(
+                movement_type='OPENING',
+                quantity=quantity,
+                balance_after=quantity,
+                note='Opening balance',
+                **{field: item_id},
+            ))
+    InventoryMovement.objects.bulk_create(movements)
+
+
+def remove_opening_balances(apps, schema_editor):
+    InventoryMovement = apps.get_model('etailoring', 'InventoryMovement')
+    InventoryMovement.objects.filter(movement_type='OPENING').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etailoring', '0020_inventory_movement'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_opening_balances, remove_opening_balances),
+    ]
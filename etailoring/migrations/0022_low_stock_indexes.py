@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etailoring', '0021_seed_inventory_opening_balances'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accessory',
+            index=models.Index(condition=models.Q(('quantity__lte', models.F('low_stock_threshold'))), fields=['name'], name='accessory_low_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fabric',
+            index=models.Index(condition=models.Q(('quantity__lte', models.F('low_stock_threshold'))), fields=['name'], name='fabric_low_stock_idx'),
+        ),
+    ]
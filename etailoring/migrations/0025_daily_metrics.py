@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:30
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etailoring', '0024_report_cache_watermarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('dimension', models.CharField(choices=[('TOTAL', 'Total'), ('GARMENT_TYPE', 'Garment Type'), ('CATEGORY', 'Category'), ('TAILOR', 'Tailor')], default='TOTAL', max_length=15)),
+                ('key', models.CharField(blank=True, default='', max_length=30)),
+                ('orders_created', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('down_payments_count', models.PositiveIntegerField(default=0)),
+                ('down_payments', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('commissions_created', models.PositiveIntegerField(default=0)),
+                ('commissions_created_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('commissions_paid', models.PositiveIntegerField(default=0)),
+                ('commissions_paid_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('claims', models.PositiveIntegerField(default=0)),
+                ('tasks_completed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily metrics',
+                'ordering': ['date', 'dimension', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'date'), name='dailymetrics_unique_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etailoring', '0026_sms_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('tokens', models.FloatField()),
+                ('updated_at', models.DateTimeField()),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('acquired', models.PositiveBigIntegerField(default=0)),
+                ('delayed', models.PositiveBigIntegerField(default=0)),
+                ('total_wait', models.FloatField(default=0)),
+                ('max_wait', models.FloatField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etailoring', '0027_rate_limit_bucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='smsoutbox',
+            name='dedupe_key',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='smsoutbox',
+            name='kind',
+            field=models.CharField(choices=[('READY_FOR_PICKUP', 'Ready for pickup'), ('PICKUP_REMINDER', 'Pickup reminder'), ('DUE_DATE_REMINDER', 'Due date reminder'), ('OTHER', 'Other')], default='OTHER', max_length=20),
+        ),
+    ]
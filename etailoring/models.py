@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from decimal import Decimal
 import logging
 
@@ -23,6 +24,9 @@ class Customer(models.Model):
     phone_number = models.CharField(max_length=20)
     address = models.TextField()
     measurements = models.TextField(default='{}', blank=True)
+    # Also touched when the linked user is saved (see user_saved below), so
+    # reports showing customer names notice renames
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name} (Customer)"
@@ -64,6 +68,8 @@ class Tailor(models.Model):
     specialty = models.CharField(max_length=100)
     # Legacy percentage-based commission (kept for compatibility).
     commission_rate = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('10.00'))
+    # Also touched when the linked user is saved (see user_saved below)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # New fixed tariff-based commission mapping (amounts in currency units).
     # Keys correspond to garment_type codes used on Order.garment_type (upper-case).
@@ -122,6 +128,7 @@ class Fabric(models.Model):
     quantity = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
     price_per_unit = models.DecimalField(max_digits=10, decimal_places=2)
     low_stock_threshold = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('10.00'))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     @property
     def is_low_stock(self):
@@ -130,6 +137,15 @@ class Fabric(models.Model):
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = [
+            # Partial index over low-stock rows only; see InventoryManager.low_stock_fabrics()
+            models.Index(
+                fields=['name'], name='fabric_low_stock_idx',
+                condition=models.Q(quantity__lte=models.F('low_stock_threshold')),
+            ),
+        ]
+
 
 class Accessory(models.Model):
     name = models.CharField(max_length=100)
@@ -137,6 +153,7 @@ class Accessory(models.Model):
     quantity = models.IntegerField(default=0)
     price_per_unit = models.DecimalField(max_digits=10, decimal_places=2)
     low_stock_threshold = models.IntegerField(default=10)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     # Which garment types this accessory is applicable to. When empty, accessory
     # is treated as universally applicable to any garment.
     applicable_garments = models.ManyToManyField('GarmentType', blank=True)
@@ -148,6 +165,15 @@ class Accessory(models.Model):
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = [
+            # Partial index over low-stock rows only; see InventoryManager.low_stock_accessories()
+            models.Index(
+                fields=['name'], name='accessory_low_stock_idx',
+                condition=models.Q(quantity__lte=models.F('low_stock_threshold')),
+            ),
+        ]
+
 
 class GarmentType(models.Model):
     """Represents a garment type (code) that accessories can be associated with.
@@ -395,6 +421,20 @@ class Order(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Default listing order and keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='order_created_id_idx'),
+            # Admin list filters combined with the default ordering
+            models.Index(fields=['status', '-created_at'], name='order_status_created_idx'),
+            models.Index(fields=['payment_status', '-created_at'], name='order_payment_created_idx'),
+            models.Index(fields=['garment_type', '-created_at'], name='order_garment_created_idx'),
+            models.Index(fields=['category', '-created_at'], name='order_category_created_idx'),
+            models.Index(fields=['customer', '-created_at'], name='order_customer_created_idx'),
+            models.Index(fields=['due_date'], name='order_due_date_idx'),
+            models.Index(fields=['claimed_at'], name='order_claimed_at_idx'),
+            # Report cache watermark (latest change to any order)
+            models.Index(fields=['updated_at'], name='order_updated_at_idx'),
+        ]
 
 
 class Task(models.Model):
@@ -412,6 +452,7 @@ class Task(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     approved_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"Task for Order {self.order.id}"
@@ -429,6 +470,7 @@ class Commission(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='APPROVED')
     created_at = models.DateTimeField(auto_now_add=True)
     paid_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"Commission for {self.tailor.user.username} - Order {self.order.id}"
@@ -455,6 +497,232 @@ class Claim(models.Model):
         return f"Claim for Order {self.order.id} by {self.claimant_name or 'Unknown'} at {self.recorded_at.isoformat()}"
 
 
+class InventoryMovement(models.Model):
+    """Append-only ledger of every stock change for a fabric or accessory.
+
+    `quantity` is the signed change (negative for deductions) and
+    `balance_after` the item's stock once the movement was applied, so the
+    `quantity` column on Fabric/Accessory is a cached running balance that can
+    be rebuilt by summing an item's movements. Rows are written by
+    `InventoryManager` in the same transaction as the stock update.
+    """
+    MOVEMENT_TYPE_CHOICES = [
+        ('OPENING', 'Opening Balance'),
+        ('ORDER_DEDUCTION', 'Order Deduction'),
+        ('RESTOCK', 'Restock'),
+        ('MANUAL_DEDUCTION', 'Manual Deduction'),
+        ('REVERSAL', 'Reversal'),
+        ('ADJUSTMENT', 'Adjustment'),
+    ]
+
+    fabric = models.ForeignKey(Fabric, null=True, blank=True, on_delete=models.CASCADE, related_name='movements')
+    accessory = models.ForeignKey(Accessory, null=True, blank=True, on_delete=models.CASCADE, related_name='movements')
+    movement_type = models.CharField(max_length=20, choices=MOVEMENT_TYPE_CHOICES)
+    quantity = models.DecimalField(max_digits=10, decimal_places=2)
+    balance_after = models.DecimalField(max_digits=10, decimal_places=2)
+    order = models.ForeignKey(Order, null=True, blank=True, on_delete=models.SET_NULL, related_name='inventory_movements')
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='inventory_movements')
+    note = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('Inventory movements are append-only')
+        super().save(*args, **kwargs)
+
+    @property
+    def item(self):
+        return self.fabric if self.fabric_id else self.accessory
+
+    def __str__(self):
+        return f"{self.get_movement_type_display()} {self.quantity} of {self.item} at {self.created_at.isoformat()}"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Per-item history and ledger replay
+            models.Index(fields=['fabric', 'created_at'], name='movement_fabric_created_idx'),
+            models.Index(fields=['accessory', 'created_at'], name='movement_accessory_created_idx'),
+            # Stock reports grouped by movement type over a date range
+            models.Index(fields=['movement_type', 'created_at'], name='movement_type_created_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(fabric__isnull=False, accessory__isnull=True)
+                    | models.Q(fabric__isnull=True, accessory__isnull=False)
+                ),
+                name='movement_single_item',
+            ),
+        ]
+
+
+
+class ReportJob(models.Model):
+    """
+    A queued PDF/CSV report run. Web requests create the job and return at
+    once; the run_report_worker command renders it and stores the file.
+    """
+    KIND_CHOICES = [
+        ('ADMIN', 'Admin Report'),
+        ('TAILOR', 'Tailor Report'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    report_type = models.CharField(max_length=20)
+    # Generator arguments (dates as ISO strings, tailor_id, metrics, format)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    progress = models.PositiveSmallIntegerField(default=0)
+    progress_message = models.CharField(max_length=100, blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_jobs')
+    result = models.FileField(upload_to='reports/%Y/%m/', blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=50, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in ('COMPLETED', 'FAILED')
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.report_type} #{self.id} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Worker polling for the oldest pending job
+            models.Index(fields=['status', 'created_at'], name='reportjob_status_created_idx'),
+        ]
+
+
+class DailyMetrics(models.Model):
+    """
+    Per-day business totals, kept up to date by MetricsManager as orders,
+    payments, tasks, commissions and claims are saved or deleted, so range
+    reports read one row per day instead of every order.
+
+    The TOTAL row of a day holds every counter; the GARMENT_TYPE and CATEGORY
+    rows split the order and down payment counters by the order's garment
+    type / category, and the TAILOR rows split the task and commission
+    counters by tailor id. Rebuild with ``manage.py rebuild_daily_metrics``.
+    """
+    DIMENSION_CHOICES = [
+        ('TOTAL', 'Total'),
+        ('GARMENT_TYPE', 'Garment Type'),
+        ('CATEGORY', 'Category'),
+        ('TAILOR', 'Tailor'),
+    ]
+
+    date = models.DateField()
+    dimension = models.CharField(max_length=15, choices=DIMENSION_CHOICES, default='TOTAL')
+    # Garment type / category code or tailor id; empty for TOTAL rows
+    key = models.CharField(max_length=30, blank=True, default='')
+    orders_created = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    down_payments_count = models.PositiveIntegerField(default=0)
+    down_payments = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    commissions_created = models.PositiveIntegerField(default=0)
+    commissions_created_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    commissions_paid = models.PositiveIntegerField(default=0)
+    commissions_paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    claims = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        label = f"{self.dimension} {self.key}".strip()
+        return f"Metrics {self.date} ({label})"
+
+    class Meta:
+        ordering = ['date', 'dimension', 'key']
+        verbose_name_plural = 'Daily metrics'
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key', 'date'], name='dailymetrics_unique_day'),
+        ]
+
+
+class SmsOutbox(models.Model):
+    """
+    An SMS waiting to be sent. Rows are written in the same transaction as
+    the change they announce (e.g. a task approval) and delivered by the
+    dispatch_sms_outbox command, which retries failures with backoff.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    KIND_CHOICES = [
+        ('READY_FOR_PICKUP', 'Ready for pickup'),
+        ('PICKUP_REMINDER', 'Pickup reminder'),
+        ('DUE_DATE_REMINDER', 'Due date reminder'),
+        ('OTHER', 'Other'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='OTHER')
+    order = models.ForeignKey(Order, on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name='sms_messages')
+    phone_number = models.CharField(max_length=20)
+    message = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Set when a dispatcher claims the row, to requeue rows of crashed workers
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    provider_message_id = models.CharField(max_length=50, blank=True)
+    # Identifies a message that must only ever be queued once (e.g. a
+    # reminder for a given order); unique, so repeated or concurrent
+    # campaign runs cannot queue it twice
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"SMS #{self.id} to {self.phone_number} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        verbose_name = 'SMS outbox message'
+        indexes = [
+            # Dispatcher polling for messages that are due
+            models.Index(fields=['status', 'next_attempt_at'], name='smsoutbox_status_due_idx'),
+        ]
+
+
+class RateLimitBucket(models.Model):
+    """
+    Shared state of a token-bucket rate limit (see etailoring/rate_limit.py),
+    so every process calling a rate-limited API draws from the same bucket.
+    The counters record how often, and for how long, callers had to wait.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    # May go negative: the tokens already promised to callers still waiting
+    tokens = models.FloatField()
+    updated_at = models.DateTimeField()
+    # Bumped on every change; updates are compare-and-swap on it
+    version = models.PositiveBigIntegerField(default=0)
+    acquired = models.PositiveBigIntegerField(default=0)
+    delayed = models.PositiveBigIntegerField(default=0)
+    total_wait = models.FloatField(default=0)
+    max_wait = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.tokens:.1f} tokens)"
+
 # --- Inventory deduction hooks -------------------------------------------------
 logger = logging.getLogger(__name__)
 
@@ -484,6 +752,11 @@ def _attempt_deduct_inventory(order):
     if getattr(order, 'inventory_deducted', False):
         return
 
+    # The creator (e.g. OrderSerializer.create) will deduct explicitly once
+    # the accessories are attached; don't deduct a half-built order here.
+    if getattr(order, '_defer_inventory_deduction', False):
+        return
+
     # Ensure order has a fabric and required related data
     if not getattr(order, 'fabric', None):
         logger.debug('Order %s has no fabric set yet; skipping inventory deduction', getattr(order, 'id', 'unknown'))
@@ -501,19 +774,21 @@ def _attempt_deduct_inventory(order):
         logger.warning('Insufficient inventory for Order %s: %s', getattr(order, 'id', 'unknown'), message)
         return
 
-    # Deduct inventory and mark the order so we don't deduct again.
+    # Deduct inventory and mark the order so we don't deduct again. The flag
+    # is claimed atomically with the deduction, so racing signals deduct once.
     try:
-        InventoryManager.deduct_inventory_for_garment(order)
-        order.inventory_deducted = True
-        # Save the flag only to avoid triggering heavy side-effects
-        order.save(update_fields=['inventory_deducted'])
-        logger.info('Inventory deducted for Order %s', order.id)
+        if InventoryManager.deduct_inventory_once(order) is not None:
+            logger.info('Inventory deducted for Order %s', order.id)
+    except ValidationError as e:
+        # Stock ran out between the check and the deduction
+        logger.warning('Insufficient inventory for Order %s: %s', getattr(order, 'id', 'unknown'), e)
     except Exception as e:
         logger.exception('Failed to deduct inventory for Order %s: %s', getattr(order, 'id', 'unknown'), e)
 
 
 # Connect signals: handle post_save and m2m_changed so deduction occurs once
-from django.db.models.signals import post_save, m2m_changed
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save, post_delete, pre_save, m2m_changed
 from django.dispatch import receiver
 
 
@@ -524,9 +799,81 @@ def order_post_save(sender, instance, created, **kwargs):
     _attempt_deduct_inventory(instance)
 
 
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def order_changed(sender, **kwargs):
+    # Invalidate summaries cached against the orders table (payment summary)
+    from .cache_utils import bump_orders_version
+    bump_orders_version()
+
+
+@receiver(pre_save, sender=Order)
+@receiver(pre_save, sender=Task)
+@receiver(pre_save, sender=Commission)
+@receiver(pre_save, sender=Claim)
+def metrics_source_saving(sender, instance, raw=False, **kwargs):
+    # Remember what the stored row contributed to DailyMetrics so that
+    # metrics_source_saved can move it, whichever code path saves it
+    if raw:
+        return
+    from .business_logic import MetricsManager
+    stored = sender._default_manager.filter(pk=instance.pk).first() if instance.pk else None
+    instance._metrics_before = MetricsManager.events(stored) if stored else []
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Commission)
+@receiver(post_save, sender=Claim)
+def metrics_source_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .business_logic import MetricsManager
+    before = instance.__dict__.pop('_metrics_before', [])
+    MetricsManager.record_changed(before, MetricsManager.events(instance))
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Commission)
+@receiver(post_delete, sender=Claim)
+def metrics_source_deleted(sender, instance, **kwargs):
+    # Also sent for the tasks, commissions and claims an order deletion
+    # cascades to
+    from .business_logic import MetricsManager
+    MetricsManager.record_changed(MetricsManager.events(instance), [])
+
+
 @receiver(m2m_changed, sender=Order.accessories.through)
 def order_accessories_changed(sender, instance, action, **kwargs):
     # When accessories are added/changed, try to deduct (post_add ensures
     # the related accessories are present).
     if action in ('post_add', 'post_remove', 'post_clear'):
         _attempt_deduct_inventory(instance)
+
+
+@receiver(post_save, sender=Fabric)
+@receiver(post_save, sender=Accessory)
+def inventory_item_created(sender, instance, created, raw=False, **kwargs):
+    # Open the ledger for new items so replaying movements reproduces the
+    # stock they were created with (admin form, API, fixtures, seed data).
+    if created and not raw and instance.quantity:
+        InventoryMovement.objects.create(
+            movement_type='OPENING',
+            quantity=instance.quantity,
+            balance_after=instance.quantity,
+            note='Opening balance',
+            **{'fabric' if sender is Fabric else 'accessory': instance},
+        )
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # Names live on User; touch the customer/tailor profile so the report
+    # cache watermark (Max updated_at) changes. Login only updates
+    # last_login, which no report shows.
+    if created or raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    now = timezone.now()
+    Customer.objects.filter(user=instance).update(updated_at=now)
+    Tailor.objects.filter(user=instance).update(updated_at=now)
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the orders API.
+
+    Pages are addressed by an opaque cursor encoding the last `created_at`
+    seen, so deep pages are an index range scan on (created_at, id) instead of
+    an ever-growing OFFSET. `id` breaks ties between orders created in the
+    same instant.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,98 @@
+"""
+Cross-process token-bucket rate limiting.
+
+The bucket lives in a RateLimitBucket row, so web processes, the SMS
+dispatcher threads and management commands all share one limit. Each call
+takes a token with a compare-and-swap UPDATE; when the bucket is empty the
+token is borrowed (the balance goes negative) and the caller sleeps until it
+has been refilled, so excess calls are queued in arrival order instead of
+being rejected by the remote API.
+"""
+import logging
+import time
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-swap attempts before giving up under extreme contention
+MAX_UPDATE_ATTEMPTS = 50
+
+
+class RateLimitError(Exception):
+    """The bucket could not be updated."""
+
+
+class TokenBucket:
+    """
+    Token bucket named ``name`` holding up to ``capacity`` tokens and
+    refilled at ``rate`` tokens per second.
+    """
+
+    def __init__(self, name, rate, capacity):
+        if rate <= 0 or capacity < 1:
+            raise ValueError('rate must be positive and capacity at least 1')
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+
+    def _row(self, now):
+        try:
+            return RateLimitBucket.objects.get(name=self.name)
+        except RateLimitBucket.DoesNotExist:
+            try:
+                with transaction.atomic():
+                    return RateLimitBucket.objects.create(name=self.name, tokens=self.capacity, updated_at=now)
+            except IntegrityError:
+                # Another process created it first
+                return RateLimitBucket.objects.get(name=self.name)
+
+    def reserve(self, now=None):
+        """
+        Take one token and return the seconds to wait before using it
+        (0 when a token was available).
+        """
+        for _ in range(MAX_UPDATE_ATTEMPTS):
+            current = now or timezone.now()
+            row = self._row(current)
+            elapsed = max((current - row.updated_at).total_seconds(), 0)
+            tokens = min(self.capacity, row.tokens + elapsed * self.rate) - 1
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+
+            updated = RateLimitBucket.objects.filter(id=row.id, version=row.version).update(
+                tokens=tokens,
+                updated_at=max(current, row.updated_at),
+                version=F('version') + 1,
+                acquired=F('acquired') + 1,
+                delayed=F('delayed') + (1 if wait else 0),
+                total_wait=F('total_wait') + wait,
+                max_wait=max(row.max_wait, wait),
+            )
+            if updated:
+                return wait
+        raise RateLimitError(f'Could not take a token from the {self.name} bucket')
+
+    def acquire(self):
+        """Wait for a token; returns the seconds spent waiting."""
+        wait = self.reserve()
+        if wait:
+            logger.debug('Waiting %.2fs for the %s rate limit', wait, self.name)
+            time.sleep(wait)
+        return wait
+
+    def stats(self):
+        """Wait-time metrics recorded for this bucket across all processes."""
+        row = RateLimitBucket.objects.filter(name=self.name).first()
+        if row is None:
+            return {'acquired': 0, 'delayed': 0, 'total_wait': 0.0, 'average_wait': 0.0, 'max_wait': 0.0}
+        return {
+            'acquired': row.acquired,
+            'delayed': row.delayed,
+            'total_wait': row.total_wait,
+            'average_wait': row.total_wait / row.acquired if row.acquired else 0.0,
+            'max_wait': row.max_wait,
+        }
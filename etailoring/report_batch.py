@@ -0,0 +1,156 @@
+"""
+Batch rendering of tailor performance reports.
+
+Every figure the reports need is loaded up front by tailor_report_snapshot()
+with a handful of grouped queries, however many tailors are included. The
+PDFs are then rendered by a pool of worker processes that each receive the
+snapshot once, when they start, and never touch the database; the finished
+files are written to a ZIP archive as they arrive so the archive can be
+streamed to the client while later reports are still rendering.
+"""
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+# Snapshot handed to each worker process by _init_worker()
+_worker_snapshot = None
+
+
+def tailor_report_snapshot(tailors, date_from, date_to):
+    """
+    TailorReportGenerator figures for ``tailors`` over [date_from, date_to),
+    as ``{tailor_id: {'metrics': ..., 'garments': ..., 'monthly': ...}}``.
+    """
+    # Imported here: spawned workers import this module (for _init_worker)
+    # before django.setup(), so it must not load models at import time
+    from . import analytics
+
+    tailor_ids = [tailor.id for tailor in tailors]
+    metrics = {
+        entry['tailor_id']: entry
+        for entry in analytics.tailor_metrics(date_from, date_to, tailor_ids=tailor_ids)
+    }
+    garments = analytics.garment_counts_by_tailor(date_from, date_to, tailor_ids=tailor_ids)
+    monthly = analytics.monthly_commissions_by_tailor(date_from, date_to, tailor_ids=tailor_ids)
+    return {
+        tailor_id: {
+            'metrics': metrics[tailor_id],
+            'garments': garments.get(tailor_id, []),
+            'monthly': monthly.get(tailor_id, []),
+        }
+        for tailor_id in tailor_ids
+    }
+
+
+def _init_worker(snapshot):
+    global _worker_snapshot
+    # Spawned workers start without Django configured; the snapshot means
+    # they never need a database connection
+    django.setup()
+    _worker_snapshot = snapshot
+
+
+def _render(tailor, date_from, date_to, generated_by, snapshot):
+    from .report_generator import TailorReportGenerator
+
+    generator = TailorReportGenerator(
+        tailor, date_from, date_to, generated_by, snapshot=snapshot[tailor.id]
+    )
+    return generator.get_filename(), generator.generate_report()
+
+
+def _render_in_worker(tailor, date_from, date_to, generated_by):
+    return _render(tailor, date_from, date_to, generated_by, _worker_snapshot)
+
+
+def default_workers():
+    return getattr(settings, 'REPORT_BATCH_WORKERS', None) or os.cpu_count() or 1
+
+
+def render_tailor_reports(tailors, date_from, date_to, generated_by=None, workers=None):
+    """
+    Return an iterator of ``(filename, pdf_bytes)`` for each of ``tailors``
+    (with ``user`` loaded), in order, rendering up to ``workers`` reports at
+    a time.
+
+    The snapshot is read straight away, so database errors surface here
+    rather than part way through a streamed response. With one worker, or a
+    single tailor, the reports are rendered in this process.
+    """
+    tailors = list(tailors)
+    snapshot = tailor_report_snapshot(tailors, date_from, date_to)
+    workers = min(workers or default_workers(), len(tailors))
+    if workers <= 1:
+        return (_render(tailor, date_from, date_to, generated_by, snapshot) for tailor in tailors)
+    return _render_in_pool(tailors, date_from, date_to, generated_by, snapshot, workers)
+
+
+def _render_in_pool(tailors, date_from, date_to, generated_by, snapshot, workers):
+    # spawn, as in run_report_worker: forking a threaded web worker could copy
+    # held locks and open database connections into the children
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker, initargs=(snapshot,)
+    )
+    try:
+        futures = [
+            pool.submit(_render_in_worker, tailor, date_from, date_to, generated_by)
+            for tailor in tailors
+        ]
+        for future in futures:
+            yield future.result()
+    finally:
+        # Stopping early (for example when the client disconnects) drops the
+        # reports that have not started yet
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _ZipBuffer:
+    """Write-only file object whose contents are drained after each write."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_zip(files):
+    """
+    Encode ``(filename, data)`` pairs as a ZIP archive, yielding each part as
+    soon as its file has been added. Duplicate names get a numeric suffix.
+    """
+    buffer = _ZipBuffer()
+    used = set()
+    # PDFs are already compressed, so they are stored as they are
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for filename, data in files:
+            name, counter = filename, 1
+            while name in used:
+                stem, ext = os.path.splitext(filename)
+                counter += 1
+                name = f"{stem}_{counter}{ext}"
+            used.add(name)
+            archive.writestr(name, data)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def streaming_zip_response(filename, files):
+    response = StreamingHttpResponse(iter_zip(files), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
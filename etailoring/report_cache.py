@@ -0,0 +1,228 @@
+"""
+On-disk cache for generated PDF/CSV reports.
+
+A report is identified by its parameters (kind, type, tailor, date range,
+metrics, format, and the user it is generated for, whose name is printed on
+it) plus a watermark of the data it reads: the latest ``updated_at`` and row
+count of orders, tasks, commissions, inventory, customers and tailors, and
+the newest claim and inventory movement. Saving a user touches its customer
+or tailor profile, so renames count too. Any write to those tables changes
+the watermark, so a stale report is never served; the old file simply ages
+out of the cache.
+
+Files live in ``settings.REPORT_CACHE_DIR`` and the directory is kept under
+``settings.REPORT_CACHE_MAX_BYTES`` by evicting the least recently used
+reports (file mtime is refreshed on every hit). Setting the limit to 0
+disables caching.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import BytesIO
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Accessory, Claim, Commission, Customer, Fabric, InventoryMovement, Order, Tailor, Task
+
+logger = logging.getLogger(__name__)
+
+
+def data_watermark():
+    """Fingerprint of the rows reports are built from (one query per table)."""
+    watermark = {}
+    for model in (Order, Task, Commission, Fabric, Accessory, Customer, Tailor):
+        totals = model.objects.aggregate(updated=Max('updated_at'), count=Count('id'))
+        watermark[model._meta.model_name] = [
+            totals['updated'].isoformat() if totals['updated'] else None,
+            totals['count'],
+        ]
+    claims = Claim.objects.aggregate(
+        last=Max('id'), count=Count('id'), reversed=Count('id', filter=Q(reversed=True)),
+        reversed_at=Max('reversed_at'),
+    )
+    watermark['claim'] = [
+        claims['last'], claims['count'], claims['reversed'],
+        claims['reversed_at'].isoformat() if claims['reversed_at'] else None,
+    ]
+    watermark['movement'] = InventoryMovement.objects.aggregate(last=Max('id'))['last']
+    return watermark
+
+
+class CachedReport:
+    """A cache hit or freshly stored report; ``file`` is open for reading."""
+
+    def __init__(self, key, file, meta):
+        self.key = key
+        self.file = file
+        self.filename = meta['filename']
+        self.content_type = meta['content_type']
+        self.etag = meta['etag']
+        self.size = meta['size']
+        self.last_modified = datetime.fromtimestamp(meta['created'], tz=dt_timezone.utc)
+
+    def read(self):
+        with self.file:
+            return self.file.read()
+
+
+class ReportCache:
+    """Size-bounded LRU directory of report files keyed by parameter/data hash."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = str(directory or getattr(
+            settings, 'REPORT_CACHE_DIR', os.path.join(settings.BASE_DIR, 'report_cache')
+        ))
+        if max_bytes is None:
+            max_bytes = getattr(settings, 'REPORT_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key_for(params, watermark):
+        payload = json.dumps({'params': params, 'watermark': watermark}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.data', base + '.json'
+
+    def get(self, key):
+        """Return the cached report for ``key`` or None, marking it recently used."""
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as fh:
+                meta = json.load(fh)
+            report = open(data_path, 'rb')
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(data_path)
+        except OSError:
+            pass
+        return CachedReport(key, report, meta)
+
+    def put(self, key, data, filename, content_type):
+        """Store ``data`` under ``key``, evict old entries and return the new entry."""
+        os.makedirs(self.directory, exist_ok=True)
+        data_path, meta_path = self._paths(key)
+        meta = {
+            'filename': filename,
+            'content_type': content_type,
+            'etag': '"%s"' % hashlib.sha256(data).hexdigest(),
+            'size': len(data),
+            'created': datetime.now(dt_timezone.utc).timestamp(),
+        }
+        # Write-then-rename so concurrent readers never see a partial file
+        self._write_atomic(data_path, data)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        self.evict()
+        return CachedReport(key, open(data_path, 'rb'), meta)
+
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def evict(self):
+        """Delete least recently used reports until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            if not name.endswith('.data'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name[:-len('.data')]))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def get_cached_report(params, generate, cache=None):
+    """
+    Return a CachedReport for ``params``, calling ``generate()`` only on a miss.
+
+    ``generate`` returns ``(data, filename, content_type)``. When caching is
+    disabled the report is generated every time but still returned as a
+    CachedReport so callers handle both cases the same way.
+    """
+    cache = cache or ReportCache()
+    if not cache.enabled:
+        data, filename, content_type = generate()
+        return _uncached(data, filename, content_type)
+
+    key = cache.key_for(params, data_watermark())
+    report = cache.get(key)
+    if report is None:
+        data, filename, content_type = generate()
+        try:
+            report = cache.put(key, data, filename, content_type)
+        except OSError:
+            logger.exception('Could not store report %s in the cache', filename)
+            report = _uncached(data, filename, content_type)
+    return report
+
+
+def _uncached(data, filename, content_type):
+    return CachedReport(None, BytesIO(data), {
+        'filename': filename,
+        'content_type': content_type,
+        'etag': '"%s"' % hashlib.sha256(data).hexdigest(),
+        'size': len(data),
+        'created': datetime.now(dt_timezone.utc).timestamp(),
+    })
+
+
+def report_response(request, report):
+    """
+    Download response for a cached report with ETag/Last-Modified, answering
+    conditional requests with 304 Not Modified.
+    """
+    not_modified = get_conditional_response(
+        request, etag=report.etag, last_modified=int(report.last_modified.timestamp())
+    )
+    if not_modified is not None:
+        report.file.close()
+        if not_modified.status_code == 304:
+            not_modified['ETag'] = report.etag
+        return not_modified
+
+    response = FileResponse(report.file, as_attachment=True, filename=report.filename,
+                            content_type=report.content_type)
+    response['ETag'] = report.etag
+    response['Last-Modified'] = http_date(report.last_modified.timestamp())
+    return response
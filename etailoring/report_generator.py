@@ -3,38 +3,46 @@ Comprehensive Tailor Performance Report Generator using ReportLab
 """
 import os
 import io
-from datetime import datetime, timedelta
+from datetime import timedelta
 from decimal import Decimal
 from django.conf import settings
-from django.db.models import Count, Sum, Avg, Q
+from django.db.models import Q
 from django.utils import timezone
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak
 from reportlab.platypus import Image as ReportLabImage
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.enums import TA_LEFT, TA_RIGHT
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from io import BytesIO
 import base64
 
-from .models import Tailor, Task, Commission, Order
+from . import analytics
+from .models import Tailor, Order
+from . import report_utils
+from .report_utils import track_build_progress
 
 
 class TailorReportGenerator:
     """Generate comprehensive tailor performance reports"""
     
-    def __init__(self, tailor, date_from=None, date_to=None, generated_by=None):
+    def __init__(self, tailor, date_from=None, date_to=None, generated_by=None, progress_callback=None,
+                 snapshot=None):
         self.tailor = tailor
         self.date_from = date_from or (timezone.now() - timedelta(days=365))
         self.date_to = date_to or timezone.now()
         self.generated_by = generated_by
+        # Optional callable(percent, message) used by queued report jobs
+        self.progress_callback = progress_callback
+        # Optional preloaded figures (see report_batch.tailor_report_snapshot);
+        # with one, rendering makes no database queries
+        self.snapshot = snapshot
         self.buffer = BytesIO()
         
         # Company branding colors
@@ -53,6 +61,9 @@ class TailorReportGenerator:
             topMargin=72,
             bottomMargin=18
         )
+        track_build_progress(doc, self.progress_callback)
+        if self.progress_callback:
+            self.progress_callback(5, 'Collecting data')
         
         # Build story (content)
         story = []
@@ -89,28 +100,33 @@ class TailorReportGenerator:
         
         return pdf_data
     
+    def _metrics(self):
+        """Task and commission figures for the report period, computed once."""
+        if self.snapshot is not None:
+            return self.snapshot['metrics']
+        if not hasattr(self, '_tailor_metrics'):
+            self._tailor_metrics = analytics.tailor_metrics_for(self.tailor, self.date_from, self.date_to)
+        return self._tailor_metrics
+
+    def _garment_counts(self):
+        """``(garment_type, count)`` for the tailor's tasks in the period, most common first."""
+        if self.snapshot is not None:
+            return self.snapshot['garments']
+        return analytics.garment_counts_by_tailor(
+            self.date_from, self.date_to, tailor_ids=[self.tailor.id]
+        ).get(self.tailor.id, [])
+
+    def _monthly_commissions(self):
+        if self.snapshot is not None:
+            return self.snapshot['monthly']
+        return analytics.tailor_monthly_commissions(self.tailor, self.date_from, self.date_to)
+
     def _create_header(self):
         """Create report header with company branding"""
-        styles = getSampleStyleSheet()
-        
         # Company header style
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=self.primary_color,
-            alignment=TA_CENTER,
-            spaceAfter=10
-        )
+        header_style = report_utils.title_style(self.primary_color)
         
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=self.accent_color,
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        subtitle_style = report_utils.subtitle_style(self.accent_color)
         
         content = []
         
@@ -122,13 +138,7 @@ class TailorReportGenerator:
         date_range = f"{self.date_from.strftime('%B %d, %Y')} - {self.date_to.strftime('%B %d, %Y')}"
         generated_date = timezone.now().strftime('%B %d, %Y at %I:%M %p')
         
-        metadata_style = ParagraphStyle(
-            'Metadata',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        metadata_style = report_utils.metadata_style()
         
         content.append(Paragraph(f"Report Period: {date_range}", metadata_style))
         content.append(Paragraph(f"Generated on: {generated_date}", metadata_style))
@@ -139,15 +149,7 @@ class TailorReportGenerator:
     
     def _create_tailor_info_section(self):
         """Create tailor information section"""
-        styles = getSampleStyleSheet()
-        
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
         
         content = []
         content.append(Paragraph("👤 Tailor Information", section_style))
@@ -163,16 +165,7 @@ class TailorReportGenerator:
         ]
         
         tailor_table = Table(tailor_data, colWidths=[2*inch, 4*inch])
-        tailor_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), self.secondary_color),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        tailor_table.setStyle(report_utils.key_value_table_style(self.secondary_color))
         
         content.append(tailor_table)
         
@@ -180,69 +173,39 @@ class TailorReportGenerator:
 
     def _create_task_performance_section(self):
         """Create task performance metrics section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("📋 Task Performance Metrics", section_style))
 
-        # Get task data
-        tasks = Task.objects.filter(
-            tailor=self.tailor,
-            assigned_at__range=[self.date_from, self.date_to]
-        )
-
-        total_assigned = tasks.count()
-        in_progress = tasks.filter(status='IN_PROGRESS').count()
-        completed = tasks.filter(status='COMPLETED').count()
-        approved = tasks.filter(status='APPROVED').count()
-
-        completion_rate = ((completed + approved) / total_assigned * 100) if total_assigned > 0 else 0
+        metrics = self._metrics()
+        total_assigned = metrics['assigned']
+        turnaround = metrics['avg_turnaround_hours']
 
         # Task performance table
         task_data = [
             ['Total Tasks Assigned:', str(total_assigned)],
-            ['Tasks In Progress:', str(in_progress)],
-            ['Tasks Completed:', str(completed)],
-            ['Tasks Approved:', str(approved)],
-            ['Completion Rate:', f"{completion_rate:.1f}%"],
+            ['Tasks In Progress:', str(metrics['in_progress'])],
+            ['Tasks Completed:', str(metrics['completed'])],
+            ['Tasks Approved:', str(metrics['approved'])],
+            ['Completion Rate:', f"{metrics['completion_rate']:.1f}%"],
+            ['Average Turnaround:', f"{turnaround:.1f} hours" if turnaround is not None else '-'],
         ]
 
         task_table = Table(task_data, colWidths=[3*inch, 2*inch])
-        task_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), self.secondary_color),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        task_table.setStyle(report_utils.key_value_table_style(self.secondary_color, value_align='RIGHT'))
 
         content.append(task_table)
         content.append(Spacer(1, 15))
 
         # Tasks by garment type
-        garment_stats = tasks.values('order__garment_type').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        garment_stats = self._garment_counts()
 
         if garment_stats:
-            content.append(Paragraph("Tasks by Garment Type:", styles['Heading3']))
+            content.append(Paragraph("Tasks by Garment Type:", report_utils.sample_styles()['Heading3']))
 
             garment_data = [['Garment Type', 'Count', 'Percentage']]
-            for stat in garment_stats:
-                garment_type = stat['order__garment_type']
-                count = stat['count']
+            for garment_type, count in garment_stats:
                 percentage = (count / total_assigned * 100) if total_assigned > 0 else 0
                 garment_data.append([
                     garment_type.replace('_', ' ').title(),
@@ -251,17 +214,7 @@ class TailorReportGenerator:
                 ])
 
             garment_table = Table(garment_data, colWidths=[2*inch, 1*inch, 1*inch])
-            garment_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.secondary_color]),
-            ]))
+            garment_table.setStyle(report_utils.grid_table_style(self.primary_color, self.secondary_color))
 
             content.append(garment_table)
 
@@ -269,48 +222,23 @@ class TailorReportGenerator:
 
     def _create_financial_overview(self):
         """Create financial overview section"""
-        styles = getSampleStyleSheet()
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
 
         content = []
         content.append(Paragraph("📊 Financial Overview", section_style))
 
-        # Get monthly earnings data
-        commissions = Commission.objects.filter(
-            tailor=self.tailor,
-            created_at__range=[self.date_from, self.date_to]
-        ).order_by('created_at')
-
-        # Calculate monthly totals
-        monthly_data = {}
-        for commission in commissions:
-            month_key = commission.created_at.strftime('%Y-%m')
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {'paid': Decimal('0'), 'pending': Decimal('0')}
-
-            if commission.status == 'PAID':
-                monthly_data[month_key]['paid'] += commission.amount
-            else:
-                monthly_data[month_key]['pending'] += commission.amount
+        # Monthly paid/pending totals, grouped in the database
+        monthly_data = self._monthly_commissions()
 
         if monthly_data:
-            content.append(Paragraph("Monthly Earnings Breakdown:", styles['Heading3']))
+            content.append(Paragraph("Monthly Earnings Breakdown:", report_utils.sample_styles()['Heading3']))
 
             monthly_table_data = [['Month', 'Paid Earnings', 'Pending Earnings', 'Total']]
             total_paid_all = Decimal('0')
             total_pending_all = Decimal('0')
 
-            for month_key in sorted(monthly_data.keys()):
-                month_name = datetime.strptime(month_key, '%Y-%m').strftime('%B %Y')
-                paid = monthly_data[month_key]['paid']
-                pending = monthly_data[month_key]['pending']
+            for month, paid, pending in monthly_data:
+                month_name = month.strftime('%B %Y')
                 total = paid + pending
 
                 total_paid_all += paid
@@ -332,20 +260,9 @@ class TailorReportGenerator:
             ])
 
             monthly_table = Table(monthly_table_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            monthly_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
-                ('BACKGROUND', (0, -1), (-1, -1), self.accent_color),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('TEXTCOLOR', (0, -1), (-1, -1), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, self.secondary_color]),
-            ]))
+            monthly_table.setStyle(report_utils.grid_table_style(
+                self.primary_color, self.secondary_color, totals_color=self.accent_color
+            ))
 
             content.append(monthly_table)
 
@@ -353,15 +270,7 @@ class TailorReportGenerator:
 
     def _create_footer(self):
         """Create report footer"""
-        styles = getSampleStyleSheet()
-
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        footer_style = report_utils.footer_style()
 
         content = []
         content.append(Spacer(1, 30))
@@ -380,29 +289,17 @@ class TailorReportGenerator:
     
     def _create_commission_summary(self):
         """Create commission summary section"""
-        styles = getSampleStyleSheet()
-        
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=self.primary_color,
-            spaceAfter=10
-        )
+        section_style = report_utils.section_style(self.primary_color)
         
         content = []
         content.append(Paragraph("💰 Commission Summary", section_style))
         
         # Get commission data
-        commissions = Commission.objects.filter(
-            tailor=self.tailor,
-            created_at__range=[self.date_from, self.date_to]
-        )
-        
-        total_paid = commissions.filter(status='PAID').aggregate(Sum('amount'))['amount__sum'] or Decimal('0')
-        total_pending = commissions.filter(status='APPROVED').aggregate(Sum('amount'))['amount__sum'] or Decimal('0')
-        total_commissions = commissions.count()
-        avg_commission = commissions.aggregate(Avg('amount'))['amount__avg'] or Decimal('0')
+        metrics = self._metrics()
+        total_paid = metrics['commission_paid']
+        total_pending = metrics['commission_pending']
+        total_commissions = metrics['commission_count']
+        avg_commission = metrics['commission_avg']
         
         # Commission summary table
         commission_data = [
@@ -414,17 +311,7 @@ class TailorReportGenerator:
         ]
         
         commission_table = Table(commission_data, colWidths=[3*inch, 2*inch])
-        commission_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), self.secondary_color),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        commission_table.setStyle(report_utils.key_value_table_style(self.secondary_color, value_align='RIGHT'))
         
         content.append(commission_table)
         
@@ -0,0 +1,104 @@
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+
+from .models import ReportJob, Tailor
+from .report_jobs import enqueue_admin_report, enqueue_tailor_report, resolve_report_period
+from .serializers import ReportJobSerializer
+
+
+def _get_job(request, job_id):
+    """Staff can see every job; other users only the jobs they requested."""
+    jobs = ReportJob.objects.all()
+    if not request.user.is_staff:
+        jobs = jobs.filter(requested_by=request.user)
+    return get_object_or_404(jobs, id=job_id)
+
+
+def _param_list(request, name):
+    if hasattr(request.data, 'getlist'):
+        return request.data.getlist(name)
+    value = request.data.get(name) or []
+    return value if isinstance(value, list) else [value]
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def enqueue_admin_report_job(request, report_type):
+    """Queue an admin report; poll the returned status_url for progress"""
+    try:
+        date_from, date_to = resolve_report_period(
+            request.data.get('period', 'last_month'),
+            request.data.get('date_from'),
+            request.data.get('date_to'),
+        )
+        job = enqueue_admin_report(
+            request.user,
+            report_type,
+            date_from,
+            date_to,
+            report_format=request.data.get('format', 'pdf'),
+            tailor_id=request.data.get('tailor_id'),
+            metrics=_param_list(request, 'metrics'),
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(ReportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def enqueue_tailor_report_job(request, tailor_id=None):
+    """Queue a tailor performance report (tailors get their own report)"""
+    if request.user.is_staff:
+        if not tailor_id:
+            return Response({'error': 'Tailor ID required for admin users'}, status=status.HTTP_400_BAD_REQUEST)
+        tailor = get_object_or_404(Tailor.objects.select_related('user'), id=tailor_id)
+    else:
+        try:
+            tailor = Tailor.objects.select_related('user').get(user=request.user)
+        except Tailor.DoesNotExist:
+            return Response(
+                {'error': 'Access denied. You are not registered as a tailor.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+    try:
+        date_from, date_to = resolve_report_period(
+            request.data.get('period', 'last_month'),
+            request.data.get('date_from'),
+            request.data.get('date_to'),
+            all_time_start=tailor.user.date_joined.date(),
+        )
+    except ValueError:
+        return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    job = enqueue_tailor_report(request.user, tailor, date_from, date_to)
+    return Response(ReportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_job_detail(request, job_id):
+    """Status and progress of a queued report"""
+    return Response(ReportJobSerializer(_get_job(request, job_id)).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_job_download(request, job_id):
+    """Download the file produced by a completed report job"""
+    job = _get_job(request, job_id)
+    if job.status != 'COMPLETED' or not job.result:
+        return Response({'error': 'Report is not ready yet'}, status=status.HTTP_409_CONFLICT)
+
+    return FileResponse(
+        job.result.open('rb'),
+        as_attachment=True,
+        filename=job.filename,
+        content_type=job.content_type or 'application/octet-stream'
+    )
@@ -0,0 +1,269 @@
+"""
+Queued report generation.
+
+Views enqueue a ReportJob and return immediately; the run_report_worker
+management command claims pending jobs and renders them with
+run_claimed_job(), which records progress on the job row and stores the
+finished file in MEDIA_ROOT.
+"""
+import logging
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.files.base import ContentFile
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import ReportJob, Tailor
+from .report_cache import get_cached_report
+
+logger = logging.getLogger(__name__)
+
+ADMIN_REPORT_TYPES = ('business', 'financial', 'customer', 'inventory', 'tailor', 'sales', 'custom')
+
+REPORT_FORMATS = ('pdf', 'csv')
+
+# Progress is written to the job row at most this often (seconds), apart from
+# stage changes, so rendering is not slowed down by database writes.
+PROGRESS_WRITE_INTERVAL = 0.5
+
+
+def resolve_report_period(period='last_month', date_from=None, date_to=None, all_time_start=None):
+    """
+    Turn report page parameters into an aware ``(date_from, date_to)`` range
+    covering whole days.
+
+    Explicit ``date_from``/``date_to`` strings (YYYY-MM-DD) take precedence over
+    ``period``; a malformed date raises ValueError.
+    """
+    if date_from and date_to:
+        start = datetime.strptime(date_from, '%Y-%m-%d').date()
+        end = datetime.strptime(date_to, '%Y-%m-%d').date()
+    else:
+        end = timezone.now().date()
+        if period == 'last_week':
+            start = end - timedelta(days=7)
+        elif period == 'last_quarter':
+            start = end - timedelta(days=90)
+        elif period == 'ytd':
+            start = end.replace(month=1, day=1)
+        elif period == 'all_time':
+            start = all_time_start or date(2020, 1, 1)
+        else:  # last_month
+            start = end - timedelta(days=30)
+
+    return (
+        timezone.make_aware(datetime.combine(start, datetime.min.time())),
+        timezone.make_aware(datetime.combine(end, datetime.max.time())),
+    )
+
+
+def admin_report_params(report_type, date_from, date_to, report_format='pdf', tailor_id=None, metrics=None):
+    """Validated AdminReportGenerator arguments; raises ValueError for bad ones."""
+    if report_type not in ADMIN_REPORT_TYPES:
+        raise ValueError(f"Unknown report type: {report_type}")
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown format: {report_format}")
+    if report_type == 'tailor' and not tailor_id:
+        raise ValueError("Tailor ID required for tailor reports")
+
+    params = {
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'format': report_format,
+    }
+    if report_type == 'tailor':
+        params['tailor_id'] = int(tailor_id)
+    elif report_type == 'custom':
+        # Sections always render in a fixed order, so the selection is a set
+        params['metrics'] = sorted(set(metrics or []))
+    return params
+
+
+def tailor_report_params(tailor, date_from, date_to):
+    """TailorReportGenerator arguments for ``tailor``."""
+    return {
+        'tailor_id': tailor.id,
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+    }
+
+
+def enqueue_admin_report(user, report_type, date_from, date_to, **options):
+    """Queue an AdminReportGenerator run; raises ValueError for bad arguments."""
+    params = admin_report_params(report_type, date_from, date_to, **options)
+    return ReportJob.objects.create(kind='ADMIN', report_type=report_type, params=params, requested_by=user)
+
+
+def enqueue_tailor_report(user, tailor, date_from, date_to):
+    """Queue a TailorReportGenerator run for ``tailor``."""
+    return ReportJob.objects.create(
+        kind='TAILOR',
+        report_type='tailor',
+        params=tailor_report_params(tailor, date_from, date_to),
+        requested_by=user,
+    )
+
+
+def claim_jobs(limit):
+    """
+    Atomically move up to ``limit`` of the oldest pending jobs to RUNNING and
+    return their ids. Each job is claimed by a conditional UPDATE, so several
+    workers can poll the same table without running a job twice.
+    """
+    claimed = []
+    if limit <= 0:
+        return claimed
+
+    candidates = (
+        ReportJob.objects.filter(status='PENDING')
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+    for job_id in list(candidates):
+        if _claim(job_id):
+            claimed.append(job_id)
+    return claimed
+
+
+def _claim(job_id):
+    return ReportJob.objects.filter(id=job_id, status='PENDING').update(
+        status='RUNNING', started_at=timezone.now(), progress=0, progress_message='Starting'
+    ) == 1
+
+
+def requeue_stale_jobs(older_than):
+    """Return jobs left RUNNING by a crashed worker to the queue."""
+    cutoff = timezone.now() - older_than
+    return ReportJob.objects.filter(status='RUNNING', started_at__lt=cutoff).update(
+        status='PENDING', progress=0, progress_message='Requeued', started_at=None
+    )
+
+
+def _progress_writer(job_id):
+    state = {'percent': -1, 'message': None, 'written_at': 0.0}
+
+    def write(percent, message):
+        now = time.monotonic()
+        if percent <= state['percent'] and message == state['message']:
+            return
+        if message == state['message'] and now - state['written_at'] < PROGRESS_WRITE_INTERVAL:
+            return
+        state.update(percent=max(percent, state['percent']), message=message, written_at=now)
+        try:
+            ReportJob.objects.filter(id=job_id, status='RUNNING').update(
+                progress=min(state['percent'], 99), progress_message=message
+            )
+        except DatabaseError:
+            # Progress is informational; never fail the report over it
+            logger.debug('Could not record progress for report job %s', job_id, exc_info=True)
+
+    return write
+
+
+def _build_generator(kind, report_type, params, requested_by, progress_callback):
+    date_from = datetime.fromisoformat(params['date_from'])
+    date_to = datetime.fromisoformat(params['date_to'])
+
+    if kind == 'TAILOR':
+        from .report_generator import TailorReportGenerator
+
+        tailor = Tailor.objects.select_related('user').get(id=params['tailor_id'])
+        return TailorReportGenerator(
+            tailor=tailor,
+            date_from=date_from,
+            date_to=date_to,
+            generated_by=requested_by,
+            progress_callback=progress_callback,
+        )
+
+    from .admin_report_generator import AdminReportGenerator
+
+    kwargs = {'format': params.get('format', 'pdf')}
+    if 'tailor_id' in params:
+        kwargs['tailor_id'] = params['tailor_id']
+    if 'metrics' in params:
+        kwargs['metrics'] = params['metrics']
+    return AdminReportGenerator(
+        report_type=report_type,
+        date_from=date_from,
+        date_to=date_to,
+        generated_by=requested_by,
+        progress_callback=progress_callback,
+        **kwargs
+    )
+
+
+def render_report(kind, report_type, params, requested_by, progress_callback=None):
+    """
+    Return the report as a CachedReport, rendering it only when the report
+    cache has no copy built from the current data.
+    """
+    def generate():
+        generator = _build_generator(kind, report_type, params, requested_by, progress_callback)
+        data = generator.generate_report()
+        filename = generator.get_filename()
+        if params.get('format') == 'csv':
+            return data, filename.rsplit('.', 1)[0] + '.csv', 'text/csv'
+        return data, filename, 'application/pdf'
+
+    # The requester's name is printed on the report, so it is part of the key
+    # (admins have no profile row for the data watermark to notice renames)
+    generated_by = None
+    if requested_by:
+        generated_by = [requested_by.pk, requested_by.get_full_name() or requested_by.username]
+    key_params = dict(params, kind=kind, report_type=report_type, generated_by=generated_by)
+    return get_cached_report(key_params, generate)
+
+
+def run_job(job_id):
+    """
+    Claim a pending job and render it (inline use). A job that another worker
+    has claimed or already finished is left alone. Returns the job's status.
+    """
+    if not _claim(job_id):
+        return ReportJob.objects.get(id=job_id).status
+    return run_claimed_job(job_id)
+
+
+def run_claimed_job(job_id):
+    """
+    Render a job this worker claimed (via claim_jobs() or _claim()) and store
+    its output. Returns the job's final status.
+
+    The claim's started_at is the worker's token: if the job was requeued as
+    stale and claimed again elsewhere meanwhile, this worker's result is
+    discarded rather than overwriting the other run.
+    """
+    job = ReportJob.objects.select_related('requested_by').get(id=job_id)
+    if job.status != 'RUNNING':
+        return job.status
+
+    try:
+        report = render_report(
+            job.kind, job.report_type, job.params, job.requested_by, _progress_writer(job.id)
+        )
+        job.result.save(report.filename, ContentFile(report.read()), save=False)
+        job.filename = report.filename
+        job.content_type = report.content_type
+        job.status = 'COMPLETED'
+        job.progress = 100
+        job.progress_message = 'Done'
+    except Exception as e:
+        logger.exception('Report job %s failed', job_id)
+        job.status = 'FAILED'
+        job.error = str(e)
+        job.progress_message = 'Failed'
+
+    job.finished_at = timezone.now()
+    finished = ReportJob.objects.filter(id=job_id, status='RUNNING', started_at=job.started_at).update(
+        result=job.result.name or '', filename=job.filename, content_type=job.content_type, status=job.status,
+        progress=job.progress, progress_message=job.progress_message, error=job.error,
+        finished_at=job.finished_at,
+    )
+    if not finished:
+        logger.warning('Report job %s was reclaimed while rendering; discarding this result', job_id)
+        if job.result:
+            job.result.delete(save=False)
+        return ReportJob.objects.get(id=job_id).status
+    return job.status
@@ -0,0 +1,167 @@
+"""
+Helpers shared by the ReportLab report generators.
+
+The paragraph and table styles are built on first use and cached for the life
+of the process, so the generators and the claims export share one sample
+stylesheet and one ``TableStyle`` per distinct look instead of rebuilding them
+in every section.
+"""
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Table, TableStyle
+
+# Compact listing tables (claims export): small type and tight padding
+COMPACT_FONT_SIZE = 8
+COMPACT_PADDING = 3
+COMPACT_HEADER_BOTTOM_PADDING = 6
+
+
+@lru_cache(maxsize=None)
+def sample_styles():
+    """ReportLab's sample stylesheet, built once per process."""
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=None)
+def paragraph_style(name, parent='Normal', **attributes):
+    """A ``ParagraphStyle`` derived from a sample style, cached by its attributes."""
+    return ParagraphStyle(name, parent=sample_styles()[parent], **attributes)
+
+
+def title_style(color):
+    return paragraph_style('CustomHeader', 'Heading1', fontSize=24, textColor=color, alignment=TA_CENTER,
+                           spaceAfter=10)
+
+
+def subtitle_style(color):
+    return paragraph_style('CustomSubtitle', fontSize=14, textColor=color, alignment=TA_CENTER, spaceAfter=20)
+
+
+def metadata_style():
+    return paragraph_style('Metadata', fontSize=10, textColor=colors.grey, alignment=TA_CENTER)
+
+
+def section_style(color):
+    return paragraph_style('SectionHeader', 'Heading2', fontSize=16, textColor=color, spaceAfter=10)
+
+
+def footer_style():
+    return paragraph_style('Footer', fontSize=8, textColor=colors.grey, alignment=TA_CENTER)
+
+
+@lru_cache(maxsize=None)
+def grid_table_style(header_color, stripe_color=None, align='CENTER', font_size=10, totals_color=None,
+                     label_align=None):
+    """
+    The generators' standard table: a coloured header row over a gridded body.
+
+    ``stripe_color`` alternates body rows with white, ``totals_color`` turns
+    the last row into a bold totals row and ``label_align`` overrides the
+    alignment of the first column.
+    """
+    body_end = (-1, -2) if totals_color is not None else (-1, -1)
+    commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), header_color),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), align),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), body_end, 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]
+    if label_align is not None:
+        commands.append(('ALIGN', (0, 0), (0, -1), label_align))
+    if totals_color is not None:
+        commands += [
+            ('BACKGROUND', (0, -1), (-1, -1), totals_color),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.whitesmoke),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ]
+    if stripe_color is not None:
+        commands.append(('ROWBACKGROUNDS', (0, 1), body_end, [colors.white, stripe_color]))
+    return TableStyle(commands)
+
+
+@lru_cache(maxsize=None)
+def key_value_table_style(label_color, value_align='LEFT', font_size=10):
+    """A two-column label/value table with a shaded, bold label column."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), label_color),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), value_align),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+
+@lru_cache(maxsize=None)
+def compact_table_style():
+    """The dense grey-header listing used by the claims export."""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#d3d3d3')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), COMPACT_FONT_SIZE),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING', (0, 0), (-1, -1), COMPACT_PADDING),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), COMPACT_PADDING),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), COMPACT_HEADER_BOTTOM_PADDING),
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+    ])
+
+
+def compact_table(rows, col_widths):
+    """
+    A ``compact_table_style`` table of plain-text rows, header row first.
+
+    Row heights are worked out here from the line count of each row rather
+    than left to ReportLab, which otherwise re-measures every remaining cell
+    each time a long table is split across pages.
+    """
+    leading = COMPACT_FONT_SIZE * 1.2
+    heights = []
+    for index, row in enumerate(rows):
+        lines = max((str(value).count('\n') + 1 for value in row), default=1)
+        bottom = COMPACT_HEADER_BOTTOM_PADDING if index == 0 else COMPACT_PADDING
+        heights.append(leading * lines + COMPACT_PADDING + bottom)
+    table = Table(rows, colWidths=col_widths, rowHeights=heights, repeatRows=1)
+    table.setStyle(compact_table_style())
+    return table
+
+
+
+def track_build_progress(doc, progress_callback, start=50, end=95):
+    """
+    Report ``doc.build()`` progress to ``progress_callback(percent, message)``.
+
+    ReportLab announces the number of flowables (SIZE_EST) and then the index
+    of each one it lays out (PROGRESS); those are mapped onto [start, end] so
+    the caller can reserve the remaining range for data collection and saving.
+    """
+    if progress_callback is None:
+        return
+
+    state = {'size': 0}
+
+    def on_progress(event, value):
+        if event == 'SIZE_EST':
+            state['size'] = value or 0
+        elif event == 'STARTED':
+            progress_callback(start, 'Rendering PDF')
+        elif event == 'PROGRESS' and state['size']:
+            fraction = min(value / state['size'], 1)
+            progress_callback(start + int((end - start) * fraction), 'Rendering PDF')
+        elif event == 'FINISHED':
+            progress_callback(end, 'Rendering PDF')
+
+    doc.setProgressCallBack(on_progress)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.urls import reverse
 from .models import (
     UserExtension, Customer, Tailor, Fabric, 
-    Accessory, Order, Task, Commission, GarmentType
+    Accessory, Order, Task, Commission, GarmentType, ReportJob
 )
 
 
@@ -118,6 +119,24 @@ class TailorSerializer(serializers.ModelSerializer):
         return tailor
 
 
+def _update_stock_item(serializer, instance, validated_data):
+    """
+    Apply an edited `quantity` through the inventory ledger, then save the
+    other fields without writing back the (possibly stale) quantity.
+    """
+    from .business_logic import InventoryManager
+
+    quantity = validated_data.pop('quantity', None)
+    if quantity is not None:
+        request = serializer.context.get('request')
+        user = request.user if request and request.user.is_authenticated else None
+        InventoryManager.set_stock(instance, quantity, user=user, note='Stock level edited')
+
+    for attr, value in validated_data.items():
+        setattr(instance, attr, value)
+    return InventoryManager.save_item_details(instance)
+
+
 class FabricSerializer(serializers.ModelSerializer):
     is_low_stock = serializers.ReadOnlyField()
     
@@ -129,6 +148,10 @@ class FabricSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'is_low_stock']
 
+    def update(self, instance, validated_data):
+        """Update fabric; stock changes are recorded as ledger adjustments."""
+        return _update_stock_item(self, instance, validated_data)
+
 
 class AccessorySerializer(serializers.ModelSerializer):
     is_low_stock = serializers.ReadOnlyField()
@@ -163,12 +186,7 @@ class AccessorySerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """Update accessory with applicable garments."""
         applicable_garments = validated_data.pop('applicable_garments', None)
-        
-        # Update all other fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        
-        instance.save()
+        _update_stock_item(self, instance, validated_data)
         
         # Update M2M relationship if provided
         if applicable_garments is not None:
@@ -251,9 +269,26 @@ class OrderSerializer(serializers.ModelSerializer):
 
     assigned_tailor = serializers.SerializerMethodField()
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Join/prefetch every relation the serializer renders so that a page of
+        orders costs a constant number of queries instead of several per row.
+        """
+        return queryset.select_related(
+            'customer__user',
+            'fabric',
+            'claimed_by',
+            'task__tailor__user',
+        ).prefetch_related(
+            'accessories__applicable_garments',
+        )
+
     def get_assigned_tailor(self, obj):
         try:
-            task = Task.objects.get(order=obj)
+            # Reverse one-to-one; served from the join when the queryset was
+            # built with setup_eager_loading(), otherwise a single lookup.
+            task = obj.task
             tailor = task.tailor
             # Return tailor details and current task status
             return {
@@ -355,26 +390,36 @@ class OrderSerializer(serializers.ModelSerializer):
             # and raise the appropriate ValidationError later.
             pass
 
-        # Create the order instance without accessories
-        order = Order.objects.create(**validated_data)
+        from django.db import transaction
+        from django.core.exceptions import ValidationError as DjangoValidationError
 
-        # Add accessories using set() method to handle many-to-many relationship
-        if accessories:
-            order.accessories.set(accessories)
-        else:
-            # For static pricing, assign default accessories if none provided
-            from .models import Accessory
-            available_accessories = Accessory.objects.filter(quantity__gt=0)[:2]  # Get up to 2 accessories
-            if available_accessories:
-                order.accessories.set(available_accessories)
-
-        # Process order creation (including inventory deduction)
+        # Create the order, attach accessories and deduct stock in one
+        # transaction so a failed deduction leaves no half-created order.
         try:
-            OrderManager.process_order_creation(order)
-        except ValidationError as e:
-            # If inventory deduction fails, delete the order and re-raise the error
-            order.delete()
-            raise e
+            with transaction.atomic():
+                # Create the order instance without accessories. The signal
+                # handlers must not deduct before accessories are attached;
+                # process_order_creation below does the single deduction.
+                order = Order(**validated_data)
+                order._defer_inventory_deduction = True
+                order.save()
+
+                # Add accessories using set() method to handle many-to-many relationship
+                if accessories:
+                    order.accessories.set(accessories)
+                else:
+                    # For static pricing, assign default accessories if none provided
+                    from .models import Accessory
+                    available_accessories = Accessory.objects.filter(quantity__gt=0)[:2]  # Get up to 2 accessories
+                    if available_accessories:
+                        order.accessories.set(available_accessories)
+
+                # Process order creation (including inventory deduction)
+                OrderManager.process_order_creation(order)
+        except DjangoValidationError as e:
+            # Stock was short (possibly taken by a concurrent order); the
+            # transaction has been rolled back.
+            raise serializers.ValidationError({'inventory': e.messages})
 
         return order
     
@@ -450,6 +495,27 @@ class TaskSerializer(serializers.ModelSerializer):
             'customer_address', 'order_measurements'
         ]
         read_only_fields = ['id', 'assigned_at']
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Join/prefetch everything the task payload reads (order, fabric,
+        customer, tailor, accessories and commissions) so task lists are
+        served in a constant number of queries.
+        """
+        from django.db.models import Prefetch
+        return queryset.select_related(
+            'order__fabric',
+            'order__customer__user',
+            'tailor__user',
+        ).prefetch_related(
+            'order__accessories',
+            Prefetch(
+                'order__commission_set',
+                queryset=Commission.objects.order_by('id'),
+                to_attr='prefetched_commissions',
+            ),
+        )
     
     def get_order_details(self, obj):
         try:
@@ -499,8 +565,13 @@ class TaskSerializer(serializers.ModelSerializer):
     def get_commission_amount(self, obj):
         try:
             if obj.order and obj.tailor:
-                commission = Commission.objects.get(order=obj.order, tailor=obj.tailor)
-                return str(commission.amount)
+                prefetched = getattr(obj.order, 'prefetched_commissions', None)
+                if prefetched is None:
+                    commission = Commission.objects.get(order=obj.order, tailor=obj.tailor)
+                    return str(commission.amount)
+                for commission in prefetched:
+                    if commission.tailor_id == obj.tailor_id:
+                        return str(commission.amount)
             return "0.00"
         except (Commission.DoesNotExist, AttributeError):
             return "0.00"
@@ -573,4 +644,25 @@ class CommissionSerializer(serializers.ModelSerializer):
             'id', 'tailor', 'amount', 'order', 
             'status', 'created_at', 'paid_at'
         ]
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    status_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'kind', 'report_type', 'status', 'progress', 'progress_message',
+            'filename', 'error', 'created_at', 'started_at', 'finished_at',
+            'status_url', 'download_url'
+        ]
+        read_only_fields = fields
+
+    def get_status_url(self, obj):
+        return reverse('etailoring:report_job_detail', args=[obj.id])
+
+    def get_download_url(self, obj):
+        if obj.status != 'COMPLETED':
+            return None
+        return reverse('etailoring:report_job_download', args=[obj.id])
@@ -0,0 +1,278 @@
+"""
+Backends that deliver the messages sent through SemaphoreSMS.
+
+SMS_BACKEND selects one by name, or by the dotted path of a BaseSMSBackend
+subclass:
+
+- ``semaphore``: the live Semaphore API (default)
+- ``http_stub``: the Semaphore protocol against a local stub server started
+  with ``manage.py run_sms_stub``, not rate limited
+- ``console``: prints each message to stdout
+- ``memory``: keeps messages in ``MemoryBackend.outbox`` and can simulate
+  latency and failures, for tests and offline load tests
+
+Every backend answers like Semaphore: a list with one entry (message_id,
+recipient, message, status) per recipient, or an error message.
+"""
+import itertools
+import logging
+import random
+import sys
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    'semaphore': 'etailoring.sms_backends.SemaphoreBackend',
+    'http_stub': 'etailoring.sms_backends.HTTPStubBackend',
+    'console': 'etailoring.sms_backends.ConsoleBackend',
+    'memory': 'etailoring.sms_backends.MemoryBackend',
+}
+
+SEMAPHORE_API_URL = 'https://api.semaphore.co/api/v4/messages'
+
+
+def get_backend():
+    """Instance of the backend selected by SMS_BACKEND."""
+    name = getattr(settings, 'SMS_BACKEND', 'semaphore')
+    try:
+        backend_class = import_string(BACKENDS.get(name, name))
+    except ImportError as e:
+        raise ImproperlyConfigured(f'Unknown SMS_BACKEND {name!r}: {e}')
+    return backend_class()
+
+
+def semaphore_rate_limiter():
+    """
+    Bucket shared by every process sending through Semaphore, or None when
+    SEMAPHORE_RATE_LIMIT is 0.
+
+    Up to SEMAPHORE_RATE_LIMIT_BURST messages go out at once and the rest of
+    the per-minute limit is spread evenly, so no 60-second window ever holds
+    more than SEMAPHORE_RATE_LIMIT requests.
+    """
+    limit = getattr(settings, 'SEMAPHORE_RATE_LIMIT', 120)
+    if not limit:
+        return None
+    burst = max(1, min(getattr(settings, 'SEMAPHORE_RATE_LIMIT_BURST', 10), limit - 1))
+    return TokenBucket('semaphore', rate=(limit - burst) / 60, capacity=burst)
+
+
+class BaseSMSBackend:
+    """Delivers one request: a message to one or more comma-separated numbers."""
+
+    def send(self, message, number):
+        """
+        Returns:
+            tuple: (success: bool, response_data: list or error_message: str)
+        """
+        raise NotImplementedError
+
+
+class SemaphoreBackend(BaseSMSBackend):
+    """Posts to the Semaphore messages endpoint."""
+
+    TIMEOUT = 10
+    rate_limited = True
+
+    _session = None
+    _session_lock = threading.Lock()
+
+    def __init__(self):
+        self.api_key = getattr(settings, 'SEMAPHORE_API_KEY', '')
+        self.sender_name = getattr(settings, 'SEMAPHORE_SENDER_NAME', 'elsenior')
+        self.api_url = getattr(settings, 'SEMAPHORE_API_URL', SEMAPHORE_API_URL)
+
+    @classmethod
+    def session(cls):
+        """
+        Shared HTTP session, so consecutive sends reuse a kept-alive TLS
+        connection instead of opening a new one per message.
+
+        Connection failures are retried, as are 429/503 responses (the request
+        was not processed). Read timeouts and other errors are not retried,
+        since the message may already have gone out.
+        """
+        if SemaphoreBackend._session is None:
+            with SemaphoreBackend._session_lock:
+                if SemaphoreBackend._session is None:
+                    retry = Retry(
+                        total=3,
+                        read=0,
+                        status=2,
+                        backoff_factor=0.5,
+                        status_forcelist=(429, 503),
+                        allowed_methods=frozenset(['POST']),
+                        raise_on_status=False,
+                    )
+                    session = requests.Session()
+                    session.mount('https://', HTTPAdapter(max_retries=retry, pool_maxsize=10))
+                    session.mount('http://', HTTPAdapter(max_retries=retry, pool_maxsize=10))
+                    SemaphoreBackend._session = session
+        return SemaphoreBackend._session
+
+    def send(self, message, number):
+        if not self.api_key:
+            logger.error('Semaphore API key not configured')
+            return False, 'Semaphore API key not configured'
+
+        try:
+            # Parameters go in the form body, keeping the API key and message
+            # out of URLs (and so out of proxy and server access logs)
+            params = {
+                'apikey': self.api_key,
+                'sendername': self.sender_name,
+                'message': message,
+                'number': number
+            }
+
+            # Rate limit: 120 requests per minute. Wait for our turn rather
+            # than have Semaphore reject the request
+            limiter = semaphore_rate_limiter() if self.rate_limited else None
+            if limiter is not None:
+                limiter.acquire()
+
+            logger.debug(f'Sending SMS to {number} via {self.api_url}')
+
+            response = self.session().post(self.api_url, data=params, timeout=self.TIMEOUT)
+
+            # Log the request status
+            logger.info(f'SMS API response: Status {response.status_code} for number {number}')
+
+            # Check if successful (Semaphore returns 200 on success)
+            if response.status_code == 200:
+                response_data = response.json()
+
+                # Semaphore returns array of messages (one per recipient)
+                if isinstance(response_data, list) and len(response_data) > 0:
+                    msg_data = response_data[0]
+                    logger.info(
+                        f'SMS sent successfully to {number}. '
+                        f'Message ID: {msg_data.get("message_id", "N/A")}, '
+                        f'Status: {msg_data.get("status", "unknown")}'
+                    )
+                    return True, response_data
+                else:
+                    logger.warning(f'Unexpected response format from Semaphore: {response_data}')
+                    return True, response_data
+            else:
+                error_msg = f'SMS API returned status {response.status_code}'
+                logger.error(f'{error_msg}: {response.text}')
+
+                # Parse error details if available
+                try:
+                    error_data = response.json()
+                    if isinstance(error_data, dict) and 'error' in error_data:
+                        error_msg = f"{error_msg} - {error_data['error']}"
+                except ValueError:
+                    pass
+
+                return False, error_msg
+
+        except requests.exceptions.Timeout:
+            error_msg = f'SMS API request timeout (exceeded {self.TIMEOUT} seconds)'
+            logger.error(error_msg)
+            return False, error_msg
+        except requests.exceptions.ConnectionError:
+            error_msg = f'SMS API connection error - unable to reach {self.api_url}'
+            logger.error(error_msg)
+            return False, error_msg
+        except requests.exceptions.RequestException as e:
+            error_msg = f'SMS API request failed: {str(e)}'
+            logger.error(error_msg)
+            return False, error_msg
+        except ValueError as e:
+            error_msg = f'Invalid response from SMS API: {str(e)}'
+            logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f'Unexpected error sending SMS: {str(e)}'
+            logger.error(error_msg)
+            return False, error_msg
+
+
+class HTTPStubBackend(SemaphoreBackend):
+    """Semaphore's protocol against the local stub at SMS_STUB_URL."""
+
+    rate_limited = False
+
+    def __init__(self):
+        super().__init__()
+        self.api_url = getattr(settings, 'SMS_STUB_URL', 'http://127.0.0.1:8025/api/v4/messages')
+        self.api_key = self.api_key or 'stub'
+
+
+_message_ids = itertools.count(1)
+
+
+def _entries(message, number, status='Queued'):
+    """Semaphore-style response entries, one per recipient."""
+    return [
+        {'message_id': next(_message_ids), 'recipient': recipient, 'message': message, 'status': status}
+        for recipient in number.split(',')
+    ]
+
+
+class ConsoleBackend(BaseSMSBackend):
+    """Prints messages instead of sending them."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def send(self, message, number):
+        entries = _entries(message, number)
+        with self._lock:
+            for entry in entries:
+                self.stream.write(f"SMS #{entry['message_id']} to {entry['recipient']}: {message}\n")
+            self.stream.flush()
+        return True, entries
+
+
+class MemoryBackend(BaseSMSBackend):
+    """
+    Records messages in ``MemoryBackend.outbox`` (one entry per recipient)
+    instead of sending them.
+
+    Each request takes SMS_MEMORY_LATENCY seconds and fails with probability
+    SMS_MEMORY_FAILURE_RATE, to load-test the notification pipeline under
+    realistic provider behaviour.
+    """
+
+    outbox = []
+    requests = 0
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.latency = getattr(settings, 'SMS_MEMORY_LATENCY', 0)
+        self.failure_rate = getattr(settings, 'SMS_MEMORY_FAILURE_RATE', 0)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.outbox = []
+            cls.requests = 0
+
+    def send(self, message, number):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            MemoryBackend.requests += 1
+        if self.failure_rate and random.random() < self.failure_rate:
+            return False, 'Simulated SMS failure'
+
+        entries = _entries(message, number)
+        with self._lock:
+            MemoryBackend.outbox.extend(entries)
+        return True, entries
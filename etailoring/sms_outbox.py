@@ -0,0 +1,179 @@
+"""
+Transactional SMS outbox.
+
+Instead of calling the SMS provider while a request is being handled, views
+write an SmsOutbox row in the same transaction as the change the message
+announces, so a message is queued exactly when that change commits and a slow
+or unreachable provider never delays or breaks the request. The
+dispatch_sms_outbox management command claims due messages, sends them
+concurrently and records the outcome; failed sends are retried with
+exponential backoff until SMS_OUTBOX_MAX_ATTEMPTS is reached.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import SmsOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def max_attempts():
+    return getattr(settings, 'SMS_OUTBOX_MAX_ATTEMPTS', 5)
+
+
+def retry_delay(attempts):
+    """Wait before the next try after ``attempts`` failed sends (doubling, capped)."""
+    base = getattr(settings, 'SMS_OUTBOX_RETRY_DELAY', 60)
+    cap = getattr(settings, 'SMS_OUTBOX_MAX_RETRY_DELAY', 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def enqueue_sms(phone_number, message, order=None, kind='OTHER'):
+    """
+    Queue an SMS. Call this inside the transaction that makes the change the
+    message is about: the row is rolled back with it if that transaction fails.
+    """
+    sms = SmsOutbox.objects.create(kind=kind, order=order, phone_number=phone_number, message=message)
+    if getattr(settings, 'SMS_DISPATCH_ON_COMMIT', False):
+        # Send straight away once the row is visible to other connections;
+        # the dispatcher still retries it if this attempt fails
+        transaction.on_commit(lambda: send_in_background(sms.id))
+    return sms
+
+
+def enqueue_ready_for_pickup(order):
+    """
+    Queue the ready-for-pickup notification for ``order``'s customer.
+    Returns None when the customer has no phone number.
+    """
+    from .sms_service import SemaphoreSMS
+
+    customer = order.customer
+    if not customer.phone_number:
+        logger.warning('Customer of Order #%s has no phone number; pickup SMS not queued', order.id)
+        return None
+    customer_name = customer.user.get_full_name() or customer.user.username
+    return enqueue_sms(
+        customer.phone_number,
+        SemaphoreSMS.ready_for_pickup_message(customer_name, order.id),
+        order=order,
+        kind='READY_FOR_PICKUP',
+    )
+
+
+def claim_messages(limit):
+    """
+    Atomically move up to ``limit`` of the pending messages that are due to
+    SENDING and return their ids. Each message is claimed by a conditional
+    UPDATE, so several dispatchers can poll the outbox without sending a
+    message twice.
+    """
+    claimed = []
+    if limit <= 0:
+        return claimed
+
+    candidates = (
+        SmsOutbox.objects.filter(status='PENDING', next_attempt_at__lte=timezone.now())
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+    for message_id in list(candidates):
+        if _claim(message_id):
+            claimed.append(message_id)
+    return claimed
+
+
+def _claim(message_id):
+    return SmsOutbox.objects.filter(id=message_id, status='PENDING').update(
+        status='SENDING', locked_at=timezone.now(), attempts=F('attempts') + 1
+    ) == 1
+
+
+def requeue_stale_messages(older_than):
+    """Return messages left SENDING by a crashed dispatcher to the queue."""
+    cutoff = timezone.now() - older_than
+    return SmsOutbox.objects.filter(status='SENDING', locked_at__lt=cutoff).update(
+        status='PENDING', locked_at=None, next_attempt_at=timezone.now()
+    )
+
+
+def _provider_message_id(response):
+    if isinstance(response, list) and response and isinstance(response[0], dict):
+        return str(response[0].get('message_id') or '')
+    return ''
+
+
+def deliver(message_id):
+    """
+    Claim a pending message and send it (inline and on-commit use). A message
+    another dispatcher has claimed or already finished is left alone.
+    Returns the message's status: SENT, PENDING (retry scheduled), FAILED
+    (out of attempts), or that of the message left alone.
+    """
+    if not _claim(message_id):
+        return SmsOutbox.objects.get(id=message_id).status
+    return deliver_claimed(message_id)
+
+
+def deliver_claimed(message_id):
+    """
+    Send a message this dispatcher claimed (via claim_messages() or
+    _claim()) and record the outcome. Returns the message's final status.
+
+    The claim's locked_at is the dispatcher's token: if the message was
+    requeued as stale and claimed again meanwhile, the outcome of this send
+    does not overwrite the other claim's.
+    """
+    from .sms_service import SemaphoreSMS
+
+    sms = SmsOutbox.objects.get(id=message_id)
+    if sms.status != 'SENDING':
+        return sms.status
+
+    try:
+        success, response = SemaphoreSMS.send_message(sms.message, sms.phone_number)
+    except Exception as e:
+        logger.exception('Sending SMS #%s failed', message_id)
+        success, response = False, str(e)
+
+    now = timezone.now()
+    if success:
+        sms.status = 'SENT'
+        sms.sent_at = now
+        sms.provider_message_id = _provider_message_id(response)
+        sms.last_error = ''
+    else:
+        sms.last_error = str(response)
+        if sms.attempts >= max_attempts():
+            sms.status = 'FAILED'
+            logger.error('Giving up on SMS #%s after %s attempts: %s', message_id, sms.attempts, response)
+        else:
+            sms.status = 'PENDING'
+            sms.next_attempt_at = now + retry_delay(sms.attempts)
+    recorded = SmsOutbox.objects.filter(id=message_id, status='SENDING', locked_at=sms.locked_at).update(
+        status=sms.status, sent_at=sms.sent_at, provider_message_id=sms.provider_message_id,
+        last_error=sms.last_error, next_attempt_at=sms.next_attempt_at, locked_at=None,
+    )
+    if not recorded:
+        logger.warning('SMS #%s was reclaimed while sending; not recording this attempt', message_id)
+        return SmsOutbox.objects.get(id=message_id).status
+    return sms.status
+
+
+def send_in_background(message_id):
+    """Deliver ``message_id`` from a daemon thread with its own connection."""
+    def run():
+        try:
+            deliver(message_id)
+        except Exception:
+            logger.exception('Background delivery of SMS #%s failed', message_id)
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, name=f'sms-outbox-{message_id}', daemon=True).start()
@@ -0,0 +1,132 @@
+"""
+Reminder SMS campaigns, meant to run daily from cron (see the send_reminders
+management command).
+
+- Pickup reminders go to customers whose order is APPROVED but still not
+  claimed some days after its task was approved.
+- Due date reminders go to customers whose unclaimed, not cancelled order is
+  due tomorrow.
+
+Candidates are read in id order, a batch at a time, by keyset queries on
+order_claimed_at_idx and order_due_date_idx, so memory use stays flat however
+many orders match. Every reminder has a dedupe key, which is unique on
+SmsOutbox: reminders queued by an earlier run are skipped, and overlapping
+runs cannot queue the same reminder twice. Each batch is queued in the SMS
+outbox with one bulk insert, and dispatch_sms_outbox sends them within the
+shared Semaphore rate limit.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Order, SmsOutbox
+
+# Orders read and reminders inserted per query; keeps the dedupe lookup's
+# IN (...) list within SQLite's bound parameter limit
+BATCH_SIZE = 500
+
+_ROW_FIELDS = (
+    'id', 'due_date', 'customer__phone_number',
+    'customer__user__first_name', 'customer__user__last_name', 'customer__user__username',
+)
+
+
+def awaiting_pickup(older_than_days, now=None):
+    """APPROVED, unclaimed orders whose task was approved over ``older_than_days`` ago."""
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+    return Order.objects.filter(status='APPROVED', claimed_at__isnull=True, task__approved_at__lt=cutoff)
+
+
+def due_on(day):
+    """Unclaimed, not cancelled orders due on ``day``."""
+    return Order.objects.filter(due_date=day, claimed_at__isnull=True).exclude(status='CANCELLED')
+
+
+def _customer_name(first_name, last_name, username):
+    return f"{first_name} {last_name}".strip() or username
+
+
+def _queue(orders, kind, dedupe_key, message, batch_size, dry_run):
+    rows = (
+        orders.exclude(customer__phone_number='')
+        .order_by('id')
+        .values_list(*_ROW_FIELDS)
+    )
+    stats = {'candidates': 0, 'already_queued': 0, 'queued': 0}
+    last_id = 0
+    while True:
+        batch = list(rows.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return stats
+        last_id = batch[-1][0]
+        stats['candidates'] += len(batch)
+
+        keys = {row[0]: dedupe_key(row[0], row[1]) for row in batch}
+        existing = set(
+            SmsOutbox.objects.filter(dedupe_key__in=keys.values()).values_list('dedupe_key', flat=True)
+        )
+        # The batch's due time doubles as a marker for counting the rows this
+        # run inserted
+        due = timezone.now()
+        reminders = [
+            SmsOutbox(
+                kind=kind,
+                order_id=order_id,
+                phone_number=phone_number,
+                message=message(_customer_name(first_name, last_name, username), order_id, due_date),
+                dedupe_key=keys[order_id],
+                next_attempt_at=due,
+            )
+            for order_id, due_date, phone_number, first_name, last_name, username in batch
+            if keys[order_id] not in existing
+        ]
+        queued = len(reminders)
+        if reminders and not dry_run:
+            # A concurrent run may have queued some of them since the lookup;
+            # those rows are skipped, so count what this insert actually added.
+            # Uncommitted, the new rows cannot be sent (and rescheduled) yet.
+            with transaction.atomic():
+                SmsOutbox.objects.bulk_create(reminders, ignore_conflicts=True)
+                queued = SmsOutbox.objects.filter(
+                    dedupe_key__in=[reminder.dedupe_key for reminder in reminders], next_attempt_at=due
+                ).count()
+        stats['already_queued'] += len(batch) - queued
+        stats['queued'] += queued
+
+
+def queue_pickup_reminders(older_than_days, now=None, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Queue one pickup reminder per order awaiting pickup for over
+    ``older_than_days`` days. Returns counts of candidates, reminders
+    already queued before and reminders queued now.
+    """
+    from .sms_service import SemaphoreSMS
+
+    return _queue(
+        awaiting_pickup(older_than_days, now),
+        'PICKUP_REMINDER',
+        lambda order_id, due_date: f'pickup-reminder:{order_id}',
+        lambda name, order_id, due_date: SemaphoreSMS.pickup_reminder_message(name, order_id),
+        batch_size,
+        dry_run,
+    )
+
+
+def queue_due_date_reminders(today=None, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Queue a reminder for each order due the day after ``today`` (default:
+    the current local date); a rescheduled order is reminded again for its
+    new due date. Returns the same counts as queue_pickup_reminders().
+    """
+    from .sms_service import SemaphoreSMS
+
+    tomorrow = (today or timezone.localdate()) + timedelta(days=1)
+    return _queue(
+        due_on(tomorrow),
+        'DUE_DATE_REMINDER',
+        lambda order_id, due_date: f'due-reminder:{order_id}:{due_date.isoformat()}',
+        SemaphoreSMS.due_date_reminder_message,
+        batch_size,
+        dry_run,
+    )
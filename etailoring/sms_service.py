@@ -7,13 +7,17 @@ Official Semaphore API Documentation:
 - Rate Limit: 120 requests per minute
 - Character Limit: 160 characters per SMS (auto-split if longer)
 - Sender Name: Customizable (defaults to SEMAPHORE if not set)
+- Recipients: up to 1000 comma-separated numbers per request
+
+Messages are delivered by the backend selected with SMS_BACKEND (the live
+API by default); see etailoring/sms_backends.py.
 
 Reference: https://semaphore.co/docs
 """
-import requests
 import logging
 from django.conf import settings
-from urllib.parse import urlencode
+
+from .sms_backends import get_backend, semaphore_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +30,38 @@ class SemaphoreSMS:
     
     Required Parameters:
     - apikey: Your Semaphore API key
-    - number: Recipient phone number (09998887777 or +639998887777)
+    - number: Recipient phone number (09998887777 or +639998887777),
+              or several separated by commas
     - message: SMS message (auto-split if > 160 chars)
     
     Optional Parameters:
     - sendername: Sender name (defaults to SEMAPHORE)
     """
     
-    # Get API key from settings, default to empty string if not set
-    API_KEY = getattr(settings, 'SEMAPHORE_API_KEY', '')
-    SENDER_NAME = getattr(settings, 'SEMAPHORE_SENDER_NAME', 'elsenior')
-    API_URL = 'https://api.semaphore.co/api/v4/messages'  # Official Semaphore endpoint
+    # Most recipients Semaphore accepts in one request
+    MAX_RECIPIENTS = 1000
+    
+    @staticmethod
+    def backend():
+        """Backend selected by SMS_BACKEND"""
+        return get_backend()
+    
+    @staticmethod
+    def rate_limiter():
+        """Bucket shared by every process sending through Semaphore, or None"""
+        return semaphore_rate_limiter()
+    
+    @staticmethod
+    def _check_message(message):
+        """Return an error message if ``message`` can't be sent, else None"""
+        if not message:
+            logger.error('Message content is required')
+            return 'Message content is required'
+        
+        # Warn if message starts with TEST (Semaphore silently ignores these)
+        if message.strip().upper().startswith('TEST'):
+            logger.warning('Message starts with TEST - may be silently ignored by Semaphore')
+        return None
     
     @classmethod
     def send_message(cls, message, number):
@@ -64,93 +89,83 @@ class SemaphoreSMS:
             - sender_name: Sender name used
         """
         # Validation
-        if not cls.API_KEY:
-            logger.error('Semaphore API key not configured')
-            return False, 'Semaphore API key not configured'
-        
         if not number:
             logger.error('Phone number not provided')
             return False, 'Phone number is required'
         
-        if not message:
-            logger.error('Message content is required')
-            return False, 'Message content is required'
+        error = cls._check_message(message)
+        if error:
+            return False, error
         
-        # Warn if message starts with TEST (Semaphore silently ignores these)
-        if message.strip().upper().startswith('TEST'):
-            logger.warning(f'Message to {number} starts with TEST - may be silently ignored by Semaphore')
+        return cls.backend().send(message, number)
+    
+    @classmethod
+    def send_bulk(cls, message, numbers, chunk_size=None):
+        """
+        Send the same message to many phone numbers, with up to
+        ``chunk_size`` (default: SEMAPHORE_BULK_CHUNK_SIZE, at most 1000)
+        comma-separated recipients per API request.
         
-        try:
-            # Prepare parameters according to Semaphore API docs
-            params = {
-                'apikey': cls.API_KEY,
-                'sendername': cls.SENDER_NAME,
-                'message': message,
-                'number': number
-            }
-            
-            # Build URL with query parameters
-            url = f"{cls.API_URL}?{urlencode(params)}"
-            
-            logger.debug(f'Sending SMS to {number} via {cls.API_URL}')
-            
-            # Send POST request to Semaphore API
-            # Rate limit: 120 requests per minute
-            response = requests.post(url, timeout=10)
-            
-            # Log the request status
-            logger.info(f'SMS API response: Status {response.status_code} for number {number}')
+        Blank and repeated numbers are skipped. Each request counts once
+        against the rate limit, so a broadcast to thousands of customers
+        takes a handful of requests.
+        
+        Args:
+            message (str): The message content to send
+            numbers (iterable): Phone numbers to send to
+            chunk_size (int): Recipients per request
             
-            # Check if successful (Semaphore returns 200 on success)
-            if response.status_code == 200:
-                response_data = response.json()
-                
-                # Semaphore returns array of messages (one per recipient)
-                if isinstance(response_data, list) and len(response_data) > 0:
-                    msg_data = response_data[0]
-                    logger.info(
-                        f'SMS sent successfully to {number}. '
-                        f'Message ID: {msg_data.get("message_id", "N/A")}, '
-                        f'Status: {msg_data.get("status", "unknown")}'
-                    )
-                    return True, response_data
-                else:
-                    logger.warning(f'Unexpected response format from Semaphore: {response_data}')
-                    return True, response_data
+        Returns:
+            tuple: (success: bool, result: dict) where success is True when
+            every request succeeded and result holds
+            - messages: Semaphore's response entries, one per recipient
+            - failed: numbers whose request failed
+            - errors: error message of each failed request
+        """
+        result = {'messages': [], 'failed': [], 'errors': []}
+        recipients = list(dict.fromkeys(str(number).strip() for number in numbers if number))
+        recipients = [number for number in recipients if number]
+        if not recipients:
+            return True, result
+        
+        error = cls._check_message(message)
+        if error:
+            result['failed'] = recipients
+            result['errors'].append(error)
+            return False, result
+        
+        backend = cls.backend()
+        chunk_size = chunk_size or getattr(settings, 'SEMAPHORE_BULK_CHUNK_SIZE', cls.MAX_RECIPIENTS)
+        chunk_size = max(1, min(chunk_size, cls.MAX_RECIPIENTS))
+        for start in range(0, len(recipients), chunk_size):
+            chunk = recipients[start:start + chunk_size]
+            success, response = backend.send(message, ','.join(chunk))
+            if success:
+                result['messages'].extend(response if isinstance(response, list) else [])
             else:
-                error_msg = f'SMS API returned status {response.status_code}'
-                logger.error(f'{error_msg}: {response.text}')
-                
-                # Parse error details if available
-                try:
-                    error_data = response.json()
-                    if isinstance(error_data, dict) and 'error' in error_data:
-                        error_msg = f"{error_msg} - {error_data['error']}"
-                except:
-                    pass
-                
-                return False, error_msg
-                
-        except requests.exceptions.Timeout:
-            error_msg = 'SMS API request timeout (exceeded 10 seconds)'
-            logger.error(error_msg)
-            return False, error_msg
-        except requests.exceptions.ConnectionError:
-            error_msg = 'SMS API connection error - unable to reach Semaphore'
-            logger.error(error_msg)
-            return False, error_msg
-        except requests.exceptions.RequestException as e:
-            error_msg = f'SMS API request failed: {str(e)}'
-            logger.error(error_msg)
-            return False, error_msg
-        except ValueError as e:
-            error_msg = f'Invalid response from SMS API: {str(e)}'
-            logger.error(error_msg)
-            return False, error_msg
-        except Exception as e:
-            error_msg = f'Unexpected error sending SMS: {str(e)}'
-            logger.error(error_msg)
-            return False, error_msg
+                result['failed'].extend(chunk)
+                result['errors'].append(response)
+        
+        logger.info(
+            f'Bulk SMS: {len(recipients) - len(result["failed"])} of {len(recipients)} recipients '
+            f'sent in {(len(recipients) + chunk_size - 1) // chunk_size} request(s)'
+        )
+        return not result['failed'], result
+    
+    @staticmethod
+    def ready_for_pickup_message(customer_name, order_id):
+        """Text of the ready-for-pickup notification"""
+        return f"Hi {customer_name}, your garment for Order #{order_id} is ready for pickup at El Senior Dumingag. Thank you!"
+    
+    @staticmethod
+    def pickup_reminder_message(customer_name, order_id):
+        """Text of the reminder for a finished order that was not picked up"""
+        return f"Hi {customer_name}, a reminder that your garment for Order #{order_id} is still waiting for pickup at El Senior Dumingag. Thank you!"
+    
+    @staticmethod
+    def due_date_reminder_message(customer_name, order_id, due_date):
+        """Text of the reminder sent the day before an order is due"""
+        return f"Hi {customer_name}, your Order #{order_id} at El Senior Dumingag is due tomorrow, {due_date:%b %d}. Thank you!"
     
     @classmethod
     def notify_customer_ready_for_pickup(cls, customer_name, customer_phone, order_id):
@@ -165,7 +180,7 @@ class SemaphoreSMS:
         Returns:
             tuple: (success: bool, message: str)
         """
-        message = f"Hi {customer_name}, your garment for Order #{order_id} is ready for pickup at El Senior Dumingag. Thank you!"
+        message = cls.ready_for_pickup_message(customer_name, order_id)
         
         logger.info(f'Sending ready-for-pickup notification to {customer_name} ({customer_phone})')
         success, response = cls.send_message(message, customer_phone)
@@ -0,0 +1,95 @@
+"""
+Local stand-in for the Semaphore messages endpoint.
+
+Answers ``POST /api/v4/messages`` like Semaphore does, with one entry per
+comma-separated recipient, and remembers the most recent requests. Used by
+the http_stub SMS backend (through ``manage.py run_sms_stub``) and by tests.
+"""
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# Requests kept in StubSemaphoreServer.requests
+MAX_RECORDED_REQUESTS = 10000
+
+
+class StubSemaphoreHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests, like the real API
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        params = parse_qs(self.rfile.read(length).decode())
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            request_id = server.request_count
+            server.requests.append((time.monotonic(), params, self.path, self.client_address))
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.fail_with:
+            self._reply(server.fail_with, {'error': 'Simulated failure'})
+        elif not params.get('apikey') or not params.get('number') or not params.get('message'):
+            self._reply(400, {'error': 'apikey, number and message are required'})
+        else:
+            self._reply(200, [
+                {
+                    'message_id': request_id * 1000 + i,
+                    'recipient': number,
+                    'message': params['message'][0],
+                    'sender_name': params.get('sendername', ['SEMAPHORE'])[0],
+                    'status': 'Pending',
+                }
+                for i, number in enumerate(params['number'][0].split(','))
+            ])
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StubSemaphoreServer(ThreadingHTTPServer):
+    """
+    Threaded stub server. Use it as a context manager to serve from a
+    background thread, or call serve_forever() directly.
+
+    ``latency`` delays every answer by that many seconds; ``fail_with`` makes
+    every request fail with that HTTP status.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0, fail_with=None, verbose=False):
+        self.requests = deque(maxlen=MAX_RECORDED_REQUESTS)
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.fail_with = fail_with
+        self.verbose = verbose
+        super().__init__((host, port), StubSemaphoreHandler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/api/v4/messages'
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring.models import Customer, Fabric, Order
+
+
+class AdminChartsTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+
+    def _order(self, created_at, total='100.00', status='PENDING'):
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, total_amount=Decimal(total), status=status
+        )
+        Order.objects.filter(pk=order.pk).update(created_at=created_at)
+        return order
+
+    def _get(self, name, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(f'etailoring:{name}'), params or {})
+        order_queries = [q for q in ctx.captured_queries if 'etailoring_order' in q['sql']]
+        return response, len(order_queries)
+
+    def _at(self, year, month, day):
+        return timezone.make_aware(datetime(year, month, day, 12, 0))
+
+    def test_revenue_by_month_in_one_query(self):
+        now = timezone.now()
+        self._order(now - timedelta(days=400))  # outside the default 365 days
+        self._order(now, total='250.00')
+        self._order(now, total='50.00')
+
+        response, queries = self._get('admin_charts_revenue')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.data['labels'], [now.strftime('%b %Y')])
+        self.assertEqual(response.data['values'], [300.0])
+        self.assertEqual(response.data['bucket'], 'month')
+
+    def test_revenue_buckets_and_explicit_range(self):
+        self._order(self._at(2024, 3, 4), total='10.00')   # Monday
+        self._order(self._at(2024, 3, 6), total='20.00')   # same week
+        self._order(self._at(2024, 3, 12), total='40.00')  # next week
+        self._order(self._at(2024, 4, 1), total='80.00')   # after date_to
+
+        params = {'date_from': '2024-03-01', 'date_to': '2024-03-31'}
+        response, _ = self._get('admin_charts_revenue', dict(params, bucket='week'))
+        self.assertEqual(response.data['labels'], ['Week of Mar 04, 2024', 'Week of Mar 11, 2024'])
+        self.assertEqual(response.data['values'], [30.0, 40.0])
+
+        response, _ = self._get('admin_charts_revenue', dict(params, bucket='day'))
+        self.assertEqual(response.data['labels'], ['Mar 04, 2024', 'Mar 06, 2024', 'Mar 12, 2024'])
+
+        response, _ = self._get('admin_charts_revenue', {'date_from': '2024-03-01', 'date_to': '2024-04-01'})
+        self.assertEqual(response.data['labels'], ['Mar 2024', 'Apr 2024'])
+        self.assertEqual(response.data['values'], [70.0, 80.0])
+
+    def test_invalid_parameters(self):
+        response, _ = self._get('admin_charts_revenue', {'bucket': 'year'})
+        self.assertEqual(response.status_code, 400)
+        response, _ = self._get('admin_charts_revenue', {'date_from': '03/01/2024'})
+        self.assertEqual(response.status_code, 400)
+        response, _ = self._get('admin_charts_orders', {'days': '-5'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_order_status_counts_in_one_query(self):
+        now = timezone.now()
+        self._order(now, status='PENDING')
+        self._order(now, status='PENDING')
+        self._order(now, status='IN_PROGRESS')
+        self._order(now - timedelta(days=60), status='APPROVED')
+
+        response, queries = self._get('admin_charts_orders')
+        self.assertEqual(queries, 1)
+        self.assertEqual(
+            dict(zip(response.data['labels'], response.data['values'])),
+            {'Pending': 2, 'In Progress': 1, 'Approved': 1}
+        )
+
+        response, _ = self._get('admin_charts_orders', {'days': 30})
+        self.assertEqual(
+            dict(zip(response.data['labels'], response.data['values'])),
+            {'Pending': 2, 'In Progress': 1}
+        )
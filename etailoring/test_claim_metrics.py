@@ -0,0 +1,83 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring import analytics
+from etailoring.models import Customer, Fabric, Order
+
+
+class ClaimMetricsTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        self.now = timezone.now()
+
+    def _claimed_order(self, hours_to_claim, claimed_days_ago=1):
+        claimed_at = self.now - timedelta(days=claimed_days_ago)
+        order = Order.objects.create(customer=self.customer, fabric=self.fabric, total_amount=Decimal('100.00'))
+        Order.objects.filter(pk=order.pk).update(
+            claimed_at=claimed_at, created_at=claimed_at - timedelta(hours=hours_to_claim)
+        )
+        return order
+
+    def test_mean_median_and_p90(self):
+        for hours in range(1, 11):
+            self._claimed_order(hours)
+        self._claimed_order(-5)  # claim recorded before creation; ignored for timings
+        Order.objects.create(customer=self.customer, fabric=self.fabric, total_amount=Decimal('100.00'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            metrics = analytics.claim_time_metrics()
+
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual(metrics, {
+            'claimed_count': 11,
+            'avg_hours': 5.5,
+            'median_hours': 5.0,
+            'p90_hours': 9.0,
+        })
+
+    def test_no_claims(self):
+        self.assertEqual(analytics.claim_time_metrics(), {
+            'claimed_count': 0, 'avg_hours': None, 'median_hours': None, 'p90_hours': None,
+        })
+
+    def test_stats_endpoint_covers_last_30_days(self):
+        admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        self._claimed_order(2)
+        self._claimed_order(4)
+        self._claimed_order(100, claimed_days_ago=45)
+
+        response = client.get(reverse('etailoring:admin_stats_claims'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['claimed_count'], 2)
+        self.assertEqual(response.data['avg_time_to_claim_hours'], 3.0)
+        self.assertEqual(response.data['median_time_to_claim_hours'], 2.0)
+        self.assertEqual(response.data['p90_time_to_claim_hours'], 4.0)
+
+    def test_reports_page_uses_claim_metrics(self):
+        admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client.force_login(admin)
+        self._claimed_order(6)
+
+        response = self.client.get(reverse('etailoring:admin_reports_page'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['claimed_count'], 1)
+        self.assertEqual(response.context['avg_time_to_claim_hours'], 6.0)
+        self.assertEqual(response.context['p90_time_to_claim_hours'], 6.0)
+        self.assertContains(response, '90th Percentile')
+        self.assertContains(response, '6.0 h', count=3)
@@ -0,0 +1,115 @@
+import csv
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from etailoring import csv_exports
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import Accessory, Claim, Commission, Customer, Fabric, Order, Tailor, Task
+
+
+class CsvExportTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', password='testpass123', is_staff=True, first_name='Ada', last_name='Admin'
+        )
+        self.client.force_login(self.admin)
+
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('5.00'), price_per_unit=Decimal('15.00')
+        )
+        Accessory.objects.create(name='Button', quantity=50, price_per_unit=Decimal('1.00'))
+        tailor_user = User.objects.create_user(username='tailor', first_name='Tom', last_name='Tailor')
+        self.tailor = Tailor.objects.create(user=tailor_user, phone_number='09170000000', specialty='Suits')
+
+        self.orders = []
+        for i in range(5):
+            user = User.objects.create_user(username=f'customer{i}', first_name='Cus', last_name=f'Tomer{i}')
+            customer = Customer.objects.create(user=user, phone_number=f'0917000000{i}', address='Test')
+            order = Order.objects.create(
+                customer=customer, fabric=self.fabric, total_amount=Decimal('100.00'), inventory_deducted=True
+            )
+            self.orders.append(order)
+        Task.objects.create(order=self.orders[0], tailor=self.tailor)
+        Commission.objects.create(tailor=self.tailor, order=self.orders[0], amount=Decimal('180.00'))
+        Claim.objects.create(order=self.orders[1], claimant_name='Cus', claimant_phone='0917', recorded_by=self.admin)
+
+    def _export(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+            self.assertIsInstance(response, StreamingHttpResponse)
+            body = b''.join(response.streaming_content).decode('utf-8')
+        data_queries = [q for q in ctx.captured_queries if 'etailoring_' in q['sql']]
+        return response, list(csv.reader(io.StringIO(body))), len(data_queries)
+
+    def test_sales_export_joins_tailor_in_one_query(self):
+        url = reverse('etailoring:export_csv', args=['sales'])
+        response, rows, queries = self._export(url, {'period': 'last_week'})
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(rows[0], ['Order ID', 'Created At', 'Customer', 'Tailor', 'Total Amount', 'Status'])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][2:4], ['Cus Tomer0', 'Tom Tailor'])
+        self.assertEqual(rows[2][3], '')
+        self.assertEqual(queries, 1)
+
+    def test_sales_csv_report_streams(self):
+        url = reverse('etailoring:generate_admin_report', args=['sales'])
+        response, rows, queries = self._export(url, {'format': 'csv'})
+
+        self.assertIn('.csv', response['Content-Disposition'])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(queries, 1)
+
+    def test_orders_and_commissions(self):
+        _, rows, queries = self._export(reverse('etailoring:export_csv', args=['orders']))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][3], '09170000000')
+        self.assertEqual(rows[1][12], 'Tom Tailor')
+        self.assertEqual(queries, 1)
+
+        _, rows, _ = self._export(reverse('etailoring:export_csv', args=['commissions']))
+        self.assertEqual(rows[1][2:6], ['Tom Tailor', str(self.orders[0].id), '180.00', 'APPROVED'])
+
+    def test_inventory(self):
+        _, rows, queries = self._export(reverse('etailoring:export_csv', args=['inventory']))
+        self.assertEqual([row[:3] for row in rows[1:]], [
+            ['Fabric', str(self.fabric.id), 'Cotton'],
+            ['Accessory', str(Accessory.objects.get().id), 'Button'],
+        ])
+        self.assertEqual(rows[1][7], 'True')
+        self.assertEqual(queries, 2)
+
+    def test_claims_export(self):
+        url = reverse('etailoring:export_claims_report')
+        _, rows, queries = self._export(url, {'format': 'csv'})
+        self.assertEqual(rows[1][1:6], [str(self.orders[1].id), 'Cus Tomer1', 'Cus', '0917', 'Ada Admin'])
+        self.assertEqual(queries, 1)
+
+    def test_rows_are_written_in_batches(self):
+        chunks = list(csv_exports.iter_csv(['n'], ([i] for i in range(1200))))
+        self.assertEqual(len(chunks), 1 + 3)
+        self.assertEqual(chunks[1].count('\n'), csv_exports.ROWS_PER_WRITE)
+
+    def test_unknown_dataset(self):
+        response = self.client.get(reverse('etailoring:export_csv', args=['payroll']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_queued_sales_csv_uses_joined_rows(self):
+        generator = AdminReportGenerator(
+            'sales', self.orders[0].created_at, timezone.now(), self.admin, format='csv'
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            data = generator.generate_report()
+
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8'))))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][3], 'Tom Tailor')
+        self.assertEqual(len(ctx.captured_queries), 1)
@@ -0,0 +1,192 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring import analytics
+from etailoring.business_logic import CommissionManager, MetricsManager, OrderManager
+from etailoring.models import Claim, Customer, DailyMetrics, Fabric, Order, Tailor
+
+
+def _snapshot():
+    return sorted(
+        DailyMetrics.objects.values_list(
+            'date', 'dimension', 'key', 'orders_created', 'revenue', 'down_payments_count', 'down_payments',
+            'commissions_created', 'commissions_created_amount', 'commissions_paid',
+            'commissions_paid_amount', 'claims', 'tasks_completed',
+        )
+    )
+
+
+class DailyMetricsTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        tailor_user = User.objects.create_user(username='tailor', first_name='Tom', last_name='Tailor')
+        self.tailor = Tailor.objects.create(user=tailor_user, phone_number='09170000000', specialty='Suits')
+
+    def _order(self, garment_type='DRESS', category='FORMAL_WEAR'):
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, garment_type=garment_type, category=category,
+            total_amount=Decimal('800.00'), down_payment_amount=Decimal('400.00'),
+        )
+        return OrderManager.process_order_creation(order)
+
+    def _full_lifecycle(self):
+        order = self._order()
+        OrderManager.process_payment(order, 'DOWN_PAYMENT')
+        task = OrderManager.assign_order_to_tailor(order, self.tailor)
+        OrderManager.start_task(task)
+        OrderManager.complete_task(task)
+        commission = OrderManager.approve_task(task)
+        CommissionManager.pay_commission(commission)
+        OrderManager.process_payment(order, 'REMAINING_PAYMENT')
+        Claim.objects.create(order=order, recorded_by=self.admin)
+        return order, commission
+
+    def test_write_paths_update_rollup(self):
+        _, commission = self._full_lifecycle()
+        self._order(garment_type='PANTS', category='CASUAL_WEAR')
+
+        today = timezone.localdate()
+        self.assertEqual(analytics.metrics_totals(today, today), {
+            'orders_created': 2,
+            'revenue': Decimal('1600.00'),
+            'down_payments_count': 1,
+            'down_payments': Decimal('400.00'),
+            'commissions_created': 1,
+            'commissions_created_amount': commission.amount,
+            'commissions_paid': 1,
+            'commissions_paid_amount': commission.amount,
+            'claims': 1,
+            'tasks_completed': 1,
+        })
+        by_garment = analytics.metrics_by('GARMENT_TYPE', today, today)
+        self.assertEqual(sorted(by_garment), ['DRESS', 'PANTS'])
+        self.assertEqual(by_garment['DRESS']['down_payments'], Decimal('400.00'))
+        self.assertEqual(analytics.metrics_by('CATEGORY')['CASUAL_WEAR']['orders_created'], 1)
+        self.assertEqual(analytics.metrics_by('TAILOR')[str(self.tailor.id)]['tasks_completed'], 1)
+
+    def test_incremental_rows_match_rebuild(self):
+        self._full_lifecycle()
+        order = self._order(garment_type='SKIRT')
+        OrderManager.process_payment(order, 'FULL_PAYMENT')
+        incremental = _snapshot()
+
+        MetricsManager.rebuild_daily_metrics()
+        self.assertEqual(_snapshot(), incremental)
+
+    def test_api_orders_match_rebuild(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post(reverse('etailoring:admin_order_list'), {
+            'customer_id': self.customer.id, 'fabric_id': self.fabric.id, 'garment_type': 'SKIRT',
+            'category': 'CASUAL_WEAR', 'payment_option': 'FULL_PAYMENT',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(analytics.metrics_totals()['down_payments_count'], 1)
+
+        # Editing the order recalculates total_amount and moves its garment type
+        response = client.patch(
+            reverse('etailoring:admin_order_detail', args=[response.data['id']]),
+            {'garment_type': 'DRESS', 'quantity': 2}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        # The SKIRT rows the order moved out of stay behind, emptied
+        incremental = [row for row in _snapshot() if any(row[3:])]
+        self.assertEqual(analytics.metrics_totals()['revenue'], Order.objects.get().total_amount)
+
+        MetricsManager.rebuild_daily_metrics()
+        self.assertEqual(_snapshot(), incremental)
+
+    def test_orm_and_api_deletions_match_rebuild(self):
+        # ORM: create, edit and delete outside the API (as the admin does)
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, garment_type='PANTS', category='CASUAL_WEAR',
+            total_amount=Decimal('650.00'), down_payment_amount=Decimal('325.00'),
+        )
+        order.garment_type = 'JACKET'
+        order.total_amount = Decimal('750.00')
+        order.down_payment_status = 'PAID'
+        order.down_payment_paid_at = timezone.now()
+        order.save()
+        self.assertEqual(analytics.metrics_by('GARMENT_TYPE')['JACKET']['down_payments_count'], 1)
+        self.assertEqual(analytics.metrics_totals()['revenue'], Decimal('750.00'))
+
+        kept, _ = self._full_lifecycle()
+        order.delete()
+        self.assertEqual(analytics.metrics_totals()['revenue'], kept.total_amount)
+        incremental = [row for row in _snapshot() if any(row[3:])]
+        MetricsManager.rebuild_daily_metrics()
+        self.assertEqual(_snapshot(), incremental)
+
+        # API: create, edit, then delete an order with its task, commission and claim
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post(reverse('etailoring:admin_order_list'), {
+            'customer_id': self.customer.id, 'fabric_id': self.fabric.id, 'garment_type': 'SKIRT',
+            'category': 'CASUAL_WEAR', 'payment_option': 'FULL_PAYMENT',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        url = reverse('etailoring:admin_order_detail', args=[response.data['id']])
+        response = client.patch(url, {'garment_type': 'DRESS'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(analytics.metrics_totals()['orders_created'], 2)
+
+        Order.objects.get(pk=kept.pk).delete()
+        response = client.delete(url)
+        self.assertEqual(response.status_code, 204)
+
+        # Deleting the lifecycle order also took back its task, commission and claim
+        self.assertEqual([row for row in _snapshot() if any(row[3:])], [])
+
+    def test_payments_count_down_payment_once(self):
+        order = self._order()
+        OrderManager.process_payment(order, 'DOWN_PAYMENT')
+        OrderManager.process_payment(order, 'DOWN_PAYMENT')
+        OrderManager.process_payment(order, 'FULL_PAYMENT')
+        self.assertEqual(analytics.metrics_totals()['down_payments_count'], 1)
+
+        with self.assertRaises(ValueError):
+            OrderManager.process_payment(order, 'REFUND')
+
+    def test_rebuild_only_touches_requested_days(self):
+        self._order()
+        old = self._order(garment_type='PANTS')
+        Order.objects.filter(pk=old.pk).update(created_at=old.created_at - timedelta(days=10))
+        today = timezone.localdate()
+
+        MetricsManager.rebuild_daily_metrics(today, today)
+        self.assertEqual(analytics.metrics_totals(today, today)['orders_created'], 1)
+        # The older day is outside the rebuilt range and has no rows yet
+        self.assertEqual(analytics.metrics_totals()['orders_created'], 1)
+
+        out = StringIO()
+        call_command('rebuild_daily_metrics', stdout=out)
+        self.assertIn('Rebuilt', out.getvalue())
+        self.assertEqual(analytics.metrics_totals()['orders_created'], 2)
+        monthly = analytics.metrics_by_period(bucket='day')
+        self.assertEqual([totals['orders_created'] for _, totals in monthly], [1, 1])
+
+    def test_dashboard_totals_read_rollup(self):
+        for _ in range(3):
+            self._order()
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse('etailoring:admin_stats_revenue'))
+        self.assertEqual(response.data['total_revenue'], 2400.0)
+        self.assertEqual([q['sql'] for q in ctx.captured_queries if 'etailoring_order' in q['sql']], [])
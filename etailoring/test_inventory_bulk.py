@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.models import Fabric, Accessory, InventoryMovement
+
+
+class BulkInventoryEndpointTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('10.00'), price_per_unit=Decimal('15.00')
+        )
+        self.buttons = Accessory.objects.create(name='Buttons', quantity=10, price_per_unit=Decimal('1.00'))
+
+    def _payload(self, count):
+        fabrics = Fabric.objects.bulk_create([
+            Fabric(name=f'Fabric {i}', unit_type='YARDS', quantity=Decimal('5.00'), price_per_unit=Decimal('1.00'))
+            for i in range(count)
+        ])
+        accessories = Accessory.objects.bulk_create([
+            Accessory(name=f'Accessory {i}', quantity=5, price_per_unit=Decimal('1.00'))
+            for i in range(count)
+        ])
+        # Every item gets a different quantity, as in a real restock
+        return (
+            [{'type': 'fabric', 'id': f.id, 'quantity': 0.5 + i % 4} for i, f in enumerate(fabrics)]
+            + [{'type': 'accessory', 'id': a.id, 'quantity': 1 + i % 4} for i, a in enumerate(accessories)]
+        )
+
+    def _count_queries(self, url, items):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {'items': items}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_bulk_restock_query_count_is_constant(self):
+        url = reverse('etailoring:admin_bulk_restock')
+        small, _ = self._count_queries(url, self._payload(2))
+        large, response = self._count_queries(url, self._payload(50))
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 8)
+        self.assertEqual(response.data['success_count'], 100)
+        self.assertEqual(
+            sorted(Fabric.objects.filter(name__startswith='Fabric').values_list('quantity', flat=True)),
+            sorted([Decimal('5.50'), Decimal('6.50')] + [Decimal('5.50') + i % 4 for i in range(50)])
+        )
+        self.assertEqual(sorted(Accessory.objects.filter(name__startswith='Accessory')
+                                .values_list('quantity', flat=True)), sorted([6, 7] + [6 + i % 4 for i in range(50)]))
+
+    def test_bulk_deduct_query_count_is_constant(self):
+        url = reverse('etailoring:admin_deduct_inventory')
+        small, _ = self._count_queries(url, self._payload(2))
+        large, response = self._count_queries(url, self._payload(50))
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 8)
+        self.assertEqual(response.data['success_count'], 100)
+        self.assertEqual(
+            sorted(Fabric.objects.filter(name__startswith='Fabric').values_list('quantity', flat=True)),
+            sorted([Decimal('4.50'), Decimal('3.50')] + [Decimal('4.50') - i % 4 for i in range(50)])
+        )
+        self.assertEqual(InventoryMovement.objects.filter(movement_type='MANUAL_DEDUCTION').count(), 104)
+
+    def test_per_item_results_and_ledger(self):
+        response = self.client.post(reverse('etailoring:admin_deduct_inventory'), {'items': [
+            {'type': 'fabric', 'id': self.fabric.id, 'quantity': 4},
+            {'type': 'fabric', 'id': self.fabric.id, 'quantity': 4},
+            {'type': 'fabric', 'id': self.fabric.id, 'quantity': 4},
+            {'type': 'accessory', 'id': self.buttons.id, 'quantity': 1.5},
+            {'type': 'accessory', 'id': 9999, 'quantity': 1},
+            {'type': 'thread', 'id': self.buttons.id, 'quantity': 1},
+            {'type': 'accessory', 'id': self.buttons.id, 'quantity': 0},
+        ]}, format='json')
+
+        messages = [(r['success'], r['message']) for r in response.data['results']]
+        self.assertEqual(messages, [
+            (True, 'Successfully deducted 4.0 METERS from Cotton'),
+            (True, 'Successfully deducted 4.0 METERS from Cotton'),
+            (False, 'Insufficient stock for Cotton'),
+            (False, 'Accessory quantity must be a whole number'),
+            (False, 'Accessory not found'),
+            (False, 'Invalid item type'),
+            (False, 'Quantity must be greater than 0'),
+        ])
+        self.assertEqual(response.data['results'][1]['quantity'], Decimal('2.00'))
+
+        self.fabric.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('2.00'))
+        self.assertEqual(
+            list(self.fabric.movements.filter(movement_type='MANUAL_DEDUCTION')
+                 .order_by('id').values_list('balance_after', flat=True)),
+            [Decimal('6.00'), Decimal('2.00')]
+        )
+        ledger = InventoryMovement.objects.filter(fabric=self.fabric).aggregate(total=Sum('quantity'))['total']
+        self.assertEqual(ledger, self.fabric.quantity)
+
+    def test_string_ids_are_accepted_and_bad_ids_reported(self):
+        response = self.client.post(reverse('etailoring:admin_bulk_restock'), {'items': [
+            {'type': 'fabric', 'id': str(self.fabric.id), 'quantity': 1},
+            {'type': 'accessory', 'id': 'abc', 'quantity': 1},
+            {'type': 'accessory', 'quantity': 1},
+        ]}, format='json')
+
+        messages = [(r['success'], r['message']) for r in response.data['results']]
+        self.assertEqual(messages[1:], [(False, 'Invalid item id'), (False, 'Invalid item id')])
+        self.assertTrue(messages[0][0])
+        self.fabric.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('11.00'))
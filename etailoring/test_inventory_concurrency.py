@@ -0,0 +1,165 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection, OperationalError
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.business_logic import InventoryManager
+from etailoring.models import Customer, Fabric, Accessory, Order
+
+
+def _retry_on_lock(func, attempts=200):
+    """SQLite serialises writers and reports contention as 'locked'; retry."""
+    for _ in range(attempts):
+        try:
+            return func()
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            time.sleep(0.01)
+    raise AssertionError('database stayed locked')
+
+
+class InventoryDeductionTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('10.00'), price_per_unit=Decimal('15.00')
+        )
+        self.buttons = Accessory.objects.create(name='Buttons', quantity=10, price_per_unit=Decimal('1.00'))
+        self.zipper = Accessory.objects.create(name='Zipper', quantity=1, price_per_unit=Decimal('1.00'))
+
+    def _order(self, *accessories):
+        # Build the order flagged as deducted so the signal handlers stay out
+        # of the way, then reset the flag for the deduction under test
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, garment_type='BLOUSE',
+            total_amount=Decimal('550.00'), inventory_deducted=True
+        )
+        order.accessories.add(*accessories)
+        Order.objects.filter(pk=order.pk).update(inventory_deducted=False)
+        order.inventory_deducted = False
+        return order
+
+    def test_shortage_rolls_back_every_item(self):
+        order = self._order(self.buttons, self.zipper)
+        self.zipper.quantity = 0
+        self.zipper.save()
+
+        with self.assertRaises(Exception):
+            InventoryManager.deduct_inventory_once(order)
+
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+        order.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('10.00'))
+        self.assertEqual(self.buttons.quantity, 10)
+        self.assertFalse(order.inventory_deducted)
+
+    def test_deduct_once_is_idempotent(self):
+        order = self._order(self.buttons)
+
+        self.assertIsNotNone(InventoryManager.deduct_inventory_once(order))
+        stale = Order.objects.get(pk=order.pk)
+        stale.inventory_deducted = False  # e.g. a second signal holding an old instance
+        self.assertIsNone(InventoryManager.deduct_inventory_once(stale))
+
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('8.00'))
+        self.assertEqual(self.buttons.quantity, 9)
+
+    def test_order_creation_deducts_fabric_and_accessories_once(self):
+        admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.post(reverse('etailoring:admin_order_list'), {
+            'customer_id': self.customer.id,
+            'fabric_id': self.fabric.id,
+            'accessories_ids': [self.buttons.id],
+            'garment_type': 'BLOUSE',
+            'quantity': 1,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('8.00'))
+        self.assertEqual(self.buttons.quantity, 9)
+        self.assertTrue(Order.objects.get(pk=response.data['id']).inventory_deducted)
+
+
+class ConcurrentInventoryDeductionTest(TransactionTestCase):
+    """Parallel order deductions against one fabric must leave exact stock."""
+
+    WORKERS = 8
+    ORDERS_PER_WORKER = 5
+
+    def setUp(self):
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        # BLOUSE needs 2 fabric units and 1 accessory unit per order. Stock is
+        # enough for exactly 30 of the 40 orders fired below.
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('60.00'), price_per_unit=Decimal('15.00')
+        )
+        self.buttons = Accessory.objects.create(name='Buttons', quantity=1000, price_per_unit=Decimal('1.00'))
+
+        self.orders = []
+        for _ in range(self.WORKERS * self.ORDERS_PER_WORKER):
+            order = Order.objects.create(
+                customer=self.customer, fabric=self.fabric, garment_type='BLOUSE',
+                total_amount=Decimal('550.00'), inventory_deducted=True
+            )
+            order.accessories.add(self.buttons)
+            self.orders.append(order.pk)
+        Order.objects.update(inventory_deducted=False)
+
+    def test_parallel_deductions_are_exact(self):
+        barrier = threading.Barrier(self.WORKERS)
+        outcomes = []
+        lock = threading.Lock()
+
+        def worker(order_ids):
+            try:
+                barrier.wait()
+                for order_id in order_ids:
+                    order = _retry_on_lock(lambda: Order.objects.select_related('fabric').get(pk=order_id))
+
+                    def deduct():
+                        try:
+                            InventoryManager.deduct_inventory_once(order)
+                            return True
+                        except OperationalError:
+                            raise
+                        except Exception:
+                            return False
+
+                    ok = _retry_on_lock(deduct)
+                    with lock:
+                        outcomes.append(ok)
+            finally:
+                connection.close()
+
+        chunks = [self.orders[i::self.WORKERS] for i in range(self.WORKERS)]
+        threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        succeeded = outcomes.count(True)
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+
+        self.assertEqual(len(outcomes), len(self.orders))
+        self.assertEqual(succeeded, 30)
+        self.assertEqual(self.fabric.quantity, Decimal('0.00'))
+        self.assertEqual(self.buttons.quantity, 1000 - succeeded)
+        self.assertEqual(Order.objects.filter(inventory_deducted=True).count(), succeeded)
@@ -0,0 +1,166 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.business_logic import InventoryManager
+from etailoring.models import Customer, Fabric, Accessory, Order, InventoryMovement
+
+
+class InventoryLedgerTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('10.00'), price_per_unit=Decimal('15.00')
+        )
+        self.buttons = Accessory.objects.create(name='Buttons', quantity=10, price_per_unit=Decimal('1.00'))
+
+    def _ledger_balance(self, item):
+        return item.movements.aggregate(total=Sum('quantity'))['total']
+
+    def _deducted_order(self):
+        # Same path as OrderSerializer.create: attach accessories, then deduct
+        order = Order(
+            customer=self.customer, fabric=self.fabric, garment_type='BLOUSE', total_amount=Decimal('550.00')
+        )
+        order._defer_inventory_deduction = True
+        order.save()
+        order.accessories.add(self.buttons)
+        InventoryManager.deduct_inventory_once(order)
+        return order
+
+    def test_new_items_open_the_ledger(self):
+        opening = self.fabric.movements.get()
+        self.assertEqual(opening.movement_type, 'OPENING')
+        self.assertEqual(opening.balance_after, Decimal('10.00'))
+        self.assertEqual(self._ledger_balance(self.buttons), 10)
+
+    def test_order_deduction_is_recorded(self):
+        order = self._deducted_order()
+
+        movements = InventoryMovement.objects.filter(order=order, movement_type='ORDER_DEDUCTION')
+        self.assertEqual(movements.count(), 2)
+        fabric_movement = movements.get(fabric=self.fabric)
+        self.assertEqual(fabric_movement.quantity, Decimal('-2.00'))
+        self.assertEqual(fabric_movement.balance_after, Decimal('8.00'))
+        self.assertEqual(movements.get(accessory=self.buttons).balance_after, 9)
+
+        recorded = InventoryManager.get_recorded_deduction(order)
+        self.assertEqual(recorded['fabric']['deducted_units'], 2.0)
+        self.assertEqual(recorded['accessories'], [{'id': self.buttons.id, 'name': 'Buttons', 'deducted_units': 1}])
+
+    def test_reversal_restores_stock_once(self):
+        order = self._deducted_order()
+
+        self.assertIsNotNone(InventoryManager.reverse_order_deduction(order))
+        self.assertIsNone(InventoryManager.reverse_order_deduction(order))
+
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('10.00'))
+        self.assertEqual(self.buttons.quantity, 10)
+        self.assertFalse(Order.objects.get(pk=order.pk).inventory_deducted)
+        self.assertEqual(InventoryMovement.objects.filter(order=order, movement_type='REVERSAL').count(), 2)
+
+    def test_manual_deduction_cannot_go_negative(self):
+        with self.assertRaises(ValidationError):
+            InventoryManager.deduct_stock(self.buttons, 11)
+        self.assertFalse(self.buttons.movements.filter(movement_type='MANUAL_DEDUCTION').exists())
+
+        InventoryManager.deduct_stock(self.buttons, 4, user=self.admin)
+        self.assertEqual(self.buttons.quantity, 6)
+        movement = self.buttons.movements.get(movement_type='MANUAL_DEDUCTION')
+        self.assertEqual(movement.created_by, self.admin)
+        self.assertEqual(movement.balance_after, 6)
+
+    def test_endpoints_write_movements(self):
+        response = self.client.post(
+            reverse('etailoring:admin_restock_fabric', args=[self.fabric.id]), {'quantity': 5}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse('etailoring:admin_bulk_restock'), {'items': [
+            {'type': 'accessory', 'id': self.buttons.id, 'quantity': 5},
+        ]}, format='json')
+        self.assertEqual(response.data['success_count'], 1)
+        response = self.client.post(reverse('etailoring:admin_deduct_inventory'), {'items': [
+            {'type': 'fabric', 'id': self.fabric.id, 'quantity': 3},
+            {'type': 'accessory', 'id': self.buttons.id, 'quantity': 100},
+        ]}, format='json')
+        self.assertEqual([r['success'] for r in response.data['results']], [True, False])
+        response = self.client.patch(
+            reverse('etailoring:admin_fabric_detail', args=[self.fabric.id]), {'quantity': '20.00'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('20.00'))
+        self.assertEqual(
+            list(self.fabric.movements.order_by('id').values_list('movement_type', 'quantity')),
+            [('OPENING', Decimal('10.00')), ('RESTOCK', Decimal('5.00')),
+             ('MANUAL_DEDUCTION', Decimal('-3.00')), ('ADJUSTMENT', Decimal('8.00'))]
+        )
+        self.assertEqual(self._ledger_balance(self.fabric), self.fabric.quantity)
+        self.assertEqual(self._ledger_balance(self.buttons), self.buttons.quantity)
+
+    def test_editing_details_keeps_concurrent_deductions(self):
+        from etailoring.serializers import AccessorySerializer, FabricSerializer
+
+        fabric = Fabric.objects.get(pk=self.fabric.pk)
+        buttons = Accessory.objects.get(pk=self.buttons.pk)
+        # Stock is deducted after the items were loaded for editing
+        self._deducted_order()
+
+        for serializer in (
+            FabricSerializer(fabric, data={'price_per_unit': '20.00'}, partial=True),
+            AccessorySerializer(buttons, data={'name': 'Brass buttons'}, partial=True),
+        ):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            serializer.save()
+
+        self.fabric.refresh_from_db()
+        self.buttons.refresh_from_db()
+        self.assertEqual((self.fabric.price_per_unit, self.fabric.quantity), (Decimal('20.00'), Decimal('8.00')))
+        self.assertEqual(self.buttons.name, 'Brass buttons')
+        self.assertEqual(self._ledger_balance(self.fabric), self.fabric.quantity)
+        self.assertEqual(self._ledger_balance(self.buttons), self.buttons.quantity)
+
+    def test_deduction_report_includes_recorded_movements(self):
+        order = self._deducted_order()
+
+        response = self.client.get(reverse('etailoring:admin_deduction_report_for_order', args=[order.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['report']['fabric']['required_units'], 2.0)
+        self.assertEqual(response.data['recorded']['fabric']['deducted_units'], 2.0)
+
+    def test_reconcile_replays_the_ledger(self):
+        self._deducted_order()
+        self.assertEqual(InventoryManager.reconcile_stock(), [])
+
+        # Simulate a write that bypassed the ledger
+        Fabric.objects.filter(pk=self.fabric.pk).update(quantity=Decimal('99.00'))
+        out = StringIO()
+        call_command('inventory_management', 'reconcile', '--fix', stdout=out)
+
+        self.assertIn('cached 99.00, ledger 8.00 [fixed]', out.getvalue())
+        self.fabric.refresh_from_db()
+        self.assertEqual(self.fabric.quantity, Decimal('8.00'))
+        self.assertEqual(InventoryManager.reconcile_stock(), [])
+
+    def test_movements_are_append_only(self):
+        movement = self.fabric.movements.get()
+        movement.note = 'edited'
+        with self.assertRaises(ValueError):
+            movement.save()
@@ -0,0 +1,69 @@
+import unittest
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.business_logic import InventoryManager
+from etailoring.models import Fabric, Accessory
+
+
+class LowStockQueryTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+        # Each item is compared with its own threshold, not the first row's
+        self.low_fabric = self._fabric('Cotton', '5.00', '10.00')
+        self.high_threshold_fabric = self._fabric('Denim', '15.00', '20.00')
+        self._fabric('Linen', '8.00', '5.00')
+        self.low_accessory = Accessory.objects.create(
+            name='Buttons', quantity=10, low_stock_threshold=10, price_per_unit=Decimal('1.00')
+        )
+        Accessory.objects.create(name='Zipper', quantity=3, low_stock_threshold=2, price_per_unit=Decimal('1.00'))
+
+    def _fabric(self, name, quantity, threshold):
+        return Fabric.objects.create(
+            name=name, unit_type='METERS', quantity=Decimal(quantity),
+            low_stock_threshold=Decimal(threshold), price_per_unit=Decimal('1.00')
+        )
+
+    def test_low_stock_items_endpoint(self):
+        response = self.client.get(reverse('etailoring:admin_low_stock'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['type'], row['name']) for row in response.data['low_stock_items']],
+            [('fabric', 'Cotton'), ('fabric', 'Denim'), ('accessory', 'Buttons')]
+        )
+        self.assertEqual(response.data['count'], 3)
+
+    def test_inventory_summary_counts(self):
+        response = self.client.get(reverse('etailoring:admin_inventory_summary'))
+
+        self.assertEqual(response.data['low_stock_count'], 3)
+        self.assertEqual(response.data['total_items'], 5)
+
+    def test_restock_moves_item_out_of_low_stock(self):
+        InventoryManager.restock(self.low_fabric, 10)
+
+        self.assertEqual(InventoryManager.get_low_stock_counts(), {'fabrics': 1, 'accessories': 1, 'total': 2})
+        self.assertEqual(
+            [item['name'] for item in InventoryManager.get_low_stock_items(limit=1)], ['Denim', 'Buttons']
+        )
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'query plan format is SQLite specific')
+    def test_low_stock_queries_use_partial_index(self):
+        for queryset, index in (
+            (InventoryManager.low_stock_fabrics(), 'fabric_low_stock_idx'),
+            (InventoryManager.low_stock_accessories(), 'accessory_low_stock_idx'),
+        ):
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn(index, plan)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring.models import Customer, Fabric, Order
+
+
+class OrderListFilterTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('etailoring:admin_order_list')
+
+        self.customers = []
+        for name in ('alice', 'bob'):
+            user = User.objects.create_user(username=name, password='testpass123')
+            self.customers.append(Customer.objects.create(user=user, phone_number='09171234567', address='Test'))
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+
+    def _order(self, customer, **kwargs):
+        kwargs.setdefault('total_amount', Decimal('550.00'))
+        return Order.objects.create(customer=customer, fabric=self.fabric, **kwargs)
+
+    def _ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.data['results']}
+
+    def test_exact_filters(self):
+        pending = self._order(self.customers[0], payment_status='PENDING', garment_type='BLOUSE')
+        paid = self._order(self.customers[1], payment_status='PAID', garment_type='PANTS', category='OFFICE_ATTIRE')
+
+        self.assertEqual(self._ids(self.client.get(self.url, {'payment_status': 'PENDING'})), {pending.id})
+        self.assertEqual(self._ids(self.client.get(self.url, {'garment_type': 'PANTS'})), {paid.id})
+        self.assertEqual(self._ids(self.client.get(self.url, {'category': 'OFFICE_ATTIRE'})), {paid.id})
+        self.assertEqual(self._ids(self.client.get(self.url, {'customer': self.customers[0].id})), {pending.id})
+        # Empty values (as sent by the admin pages) are ignored
+        self.assertEqual(
+            self._ids(self.client.get(self.url, {'payment_status': '', 'customer': ''})),
+            {pending.id, paid.id}
+        )
+
+    def test_claimed_and_due_date_filters(self):
+        today = timezone.now().date()
+        claimed = self._order(self.customers[0], due_date=today + timedelta(days=1), claimed_at=timezone.now())
+        unclaimed = self._order(self.customers[0], due_date=today + timedelta(days=10))
+
+        self.assertEqual(self._ids(self.client.get(self.url, {'claimed': 'true'})), {claimed.id})
+        self.assertEqual(self._ids(self.client.get(self.url, {'claimed': 'false'})), {unclaimed.id})
+        self.assertEqual(
+            self._ids(self.client.get(self.url, {
+                'due_date_from': (today + timedelta(days=5)).isoformat(),
+                'due_date_to': (today + timedelta(days=15)).isoformat(),
+            })),
+            {unclaimed.id}
+        )
+
+    def test_created_date_range_filter(self):
+        old = self._order(self.customers[0])
+        Order.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+        recent = self._order(self.customers[0])
+
+        since = (timezone.now() - timedelta(days=7)).date().isoformat()
+        self.assertEqual(self._ids(self.client.get(self.url, {'date_from': since})), {recent.id})
+        until = (timezone.now() - timedelta(days=30)).date().isoformat()
+        self.assertEqual(self._ids(self.client.get(self.url, {'date_to': until})), {old.id})
+
+    def test_impossible_dates_are_rejected(self):
+        for name in ('date_from', 'date_to', 'due_date_from', 'due_date_to'):
+            response = self.client.get(self.url, {name: '2024-02-30'})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(name, response.data['error'])
+
+    def test_ordering_parameter(self):
+        cheap = self._order(self.customers[0], total_amount=Decimal('100.00'))
+        dear = self._order(self.customers[0], total_amount=Decimal('900.00'))
+
+        response = self.client.get(self.url, {'ordering': 'total_amount'})
+        self.assertEqual([row['id'] for row in response.data['results']], [cheap.id, dear.id])
+        response = self.client.get(self.url, {'ordering': '-total_amount'})
+        self.assertEqual([row['id'] for row in response.data['results']], [dear.id, cheap.id])
+
+    def test_cursor_pagination_walks_every_order_once(self):
+        created = [self._order(self.customers[0]).id for _ in range(25)]
+
+        seen = []
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 10})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(seen, sorted(created, reverse=True))
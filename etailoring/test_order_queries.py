@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.models import Customer, Fabric, Accessory, GarmentType, Order, Tailor, Task
+
+
+class OrderListQueryCountTest(TestCase):
+    """The orders API must not issue per-row queries while serializing."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+        customer_user = User.objects.create_user(
+            username='customer', password='testpass123', first_name='Test', last_name='Customer'
+        )
+        self.customer = Customer.objects.create(
+            user=customer_user, phone_number='09171234567', address='123 Test St'
+        )
+        tailor_user = User.objects.create_user(
+            username='tailor', password='testpass123', first_name='Test', last_name='Tailor'
+        )
+        self.tailor = Tailor.objects.create(user=tailor_user, phone_number='09181234567', specialty='Suits')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        blouse = GarmentType.objects.get_or_create(code='BLOUSE', defaults={'name': 'Blouse'})[0]
+        self.accessories = []
+        for name in ('Buttons', 'Zipper'):
+            accessory = Accessory.objects.create(name=name, quantity=1000, price_per_unit=Decimal('1.00'))
+            accessory.applicable_garments.add(blouse)
+            self.accessories.append(accessory)
+
+    def _create_orders(self, count):
+        for i in range(count):
+            order = Order.objects.create(
+                customer=self.customer,
+                fabric=self.fabric,
+                garment_type='BLOUSE',
+                total_amount=Decimal('550.00'),
+                claimed_by=self.admin,
+            )
+            order.accessories.add(*self.accessories)
+            # Leave every other order unassigned so both branches are serialized
+            if i % 2 == 0:
+                Task.objects.create(order=order, tailor=self.tailor)
+
+    def _count_list_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_admin_order_list_query_count_is_constant(self):
+        url = reverse('etailoring:admin_order_list')
+
+        self._create_orders(2)
+        small_page_queries, _ = self._count_list_queries(url)
+
+        self._create_orders(6)
+        full_page_queries, response = self._count_list_queries(url)
+
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertEqual(small_page_queries, full_page_queries)
+
+    def test_assigned_tailor_served_from_join(self):
+        self._create_orders(2)
+        response = self.client.get(reverse('etailoring:admin_order_list'))
+
+        assigned = [row['assigned_tailor'] for row in response.data['results']]
+        self.assertEqual(sum(1 for a in assigned if a is not None), 1)
+        tailor_info = next(a for a in assigned if a is not None)
+        self.assertEqual(tailor_info['id'], self.tailor.id)
+        self.assertEqual(tailor_info['name'], 'Test Tailor')
+        self.assertEqual(tailor_info['task_status'], 'ASSIGNED')
+        for row in response.data['results']:
+            self.assertEqual(row['accessories'][0]['applicable_garments'], ['BLOUSE'])
+
+    def test_customer_order_list_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.customer.user)
+        url = reverse('etailoring:customer_order_list')
+
+        self._create_orders(2)
+        small_page_queries, _ = self._count_list_queries(url)
+
+        self._create_orders(6)
+        full_page_queries, _ = self._count_list_queries(url)
+
+        self.assertEqual(small_page_queries, full_page_queries)
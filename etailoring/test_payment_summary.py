@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.models import Customer, Fabric, Order
+
+
+class PaymentSummaryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('etailoring:admin_payment_summary')
+
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        for payment_status, total, down in (
+            ('PENDING', '500.00', '250.00'),
+            ('PENDING', '600.00', '300.00'),
+            ('DOWN_PAYMENT_PAID', '800.00', '400.00'),
+            ('PAID', '550.00', '275.00'),
+        ):
+            self._order(payment_status, total, down)
+
+    def _order(self, payment_status, total, down):
+        return Order.objects.create(
+            customer=self.customer, fabric=self.fabric, payment_status=payment_status,
+            total_amount=Decimal(total), down_payment_amount=Decimal(down)
+        )
+
+    def _summary(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data, [q['sql'] for q in ctx.captured_queries if 'etailoring_order' in q['sql']]
+
+    @override_settings(ORDERS_CACHE_TIMEOUT=0)
+    def test_summary_is_one_aggregate_query(self):
+        summary, order_queries = self._summary()
+
+        self.assertEqual(len(order_queries), 1)
+        self.assertEqual(summary, {
+            'pending_count': 2,
+            'pending_amount': Decimal('550.00'),
+            'pending_total_amount': Decimal('1100.00'),
+            'down_payment_count': 1,
+            'down_payment_amount': Decimal('400.00'),
+            'full_payment_count': 1,
+            'full_payment_amount': Decimal('550.00'),
+            'total_revenue': Decimal('550.00'),
+        })
+
+    @override_settings(ORDERS_CACHE_TIMEOUT=0)
+    def test_empty_statuses_report_zero(self):
+        Order.objects.filter(payment_status='PAID').delete()
+
+        summary, _ = self._summary()
+
+        self.assertEqual(summary['full_payment_count'], 0)
+        self.assertEqual(summary['total_revenue'], 0)
+
+    @override_settings(ORDERS_CACHE_TIMEOUT=30)
+    def test_cached_until_next_order_write(self):
+        first, _ = self._summary()
+        cached, order_queries = self._summary()
+        self.assertEqual(cached, first)
+        self.assertEqual(order_queries, [])
+
+        self._order('PAID', '100.00', '50.00')
+
+        fresh, order_queries = self._summary()
+        self.assertEqual(len(order_queries), 1)
+        self.assertEqual(fresh['full_payment_count'], 2)
+        self.assertEqual(fresh['total_revenue'], Decimal('650.00'))
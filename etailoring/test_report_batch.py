@@ -0,0 +1,132 @@
+import io
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from etailoring import report_batch
+from etailoring.models import Commission, Customer, Fabric, Order, Tailor, Task
+from etailoring.report_generator import TailorReportGenerator
+
+
+class TailorReportBatchTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        self.ana = self._tailor('ana', 'Ana')
+        self.ben = self._tailor('ben', 'Ben')
+        self.now = timezone.now()
+        self.start, self.end = self.now - timedelta(days=30), self.now + timedelta(days=1)
+
+    def _tailor(self, username, first_name):
+        tailor_user = User.objects.create_user(username=username, first_name=first_name, last_name='Tailor')
+        return Tailor.objects.create(user=tailor_user, phone_number='0917', specialty='Suits')
+
+    def _task(self, tailor, garment_type, commission=None):
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, garment_type=garment_type,
+            total_amount=Decimal('500.00'), inventory_deducted=True
+        )
+        Task.objects.create(order=order, tailor=tailor, status='COMPLETED')
+        if commission is not None:
+            Commission.objects.create(tailor=tailor, order=order, amount=Decimal(commission), status='PAID')
+
+    def _seed(self):
+        self._task(self.ana, 'DRESS', commission='100.00')
+        self._task(self.ana, 'DRESS')
+        self._task(self.ana, 'PANTS', commission='40.00')
+        self._task(self.ben, 'SKIRT')
+
+    def _tailors(self):
+        return list(Tailor.objects.select_related('user').order_by('id'))
+
+    def test_snapshot_matches_single_tailor_queries(self):
+        self._seed()
+        tailors = self._tailors()
+        with CaptureQueriesContext(connection) as ctx:
+            snapshot = report_batch.tailor_report_snapshot(tailors, self.start, self.end)
+        self.assertEqual(len(ctx.captured_queries), 5)
+
+        ana = snapshot[self.ana.id]
+        self.assertEqual(ana['garments'], [('DRESS', 2), ('PANTS', 1)])
+        self.assertEqual(ana['metrics']['commission_paid'], Decimal('140.00'))
+        self.assertEqual(len(ana['monthly']), 1)
+        self.assertEqual(snapshot[self.ben.id]['monthly'], [])
+
+        generator = TailorReportGenerator(self.ana, self.start, self.end)
+        self.assertEqual(generator._garment_counts(), ana['garments'])
+        self.assertEqual(generator._monthly_commissions(), ana['monthly'])
+
+    def test_rendering_from_snapshot_makes_no_queries(self):
+        self._seed()
+        tailors = self._tailors()
+        snapshot = report_batch.tailor_report_snapshot(tailors, self.start, self.end)
+        generator = TailorReportGenerator(
+            tailors[0], self.start, self.end, self.admin, snapshot=snapshot[tailors[0].id]
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(generator.generate_report().startswith(b'%PDF'))
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_process_pool_renders_every_tailor(self):
+        self._seed()
+        tailors = self._tailors()
+        reports = list(report_batch.render_tailor_reports(tailors, self.start, self.end, self.admin, workers=2))
+
+        self.assertEqual(len(reports), 2)
+        self.assertIn('Ana_Tailor', reports[0][0])
+        self.assertIn('Ben_Tailor', reports[1][0])
+        self.assertTrue(all(data.startswith(b'%PDF') for _, data in reports))
+
+    def test_zip_names_are_unique(self):
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(report_batch.iter_zip([
+            ('report.pdf', b'one'), ('report.pdf', b'two'), ('other.pdf', b'three'),
+        ]))))
+        self.assertEqual(archive.namelist(), ['report.pdf', 'report_2.pdf', 'other.pdf'])
+        self.assertEqual(archive.read('report_2.pdf'), b'two')
+
+    def test_batch_endpoint_streams_zip(self):
+        self._seed()
+        url = reverse('etailoring:export_tailor_reports')
+
+        self.client.force_login(self.ana.user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(url, {'tailor_ids': f'{self.ben.id}', 'period': 'last_week'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(len(archive.namelist()), 1)
+        self.assertTrue(archive.namelist()[0].startswith('Tailor_Report_Ben_Tailor'))
+
+        response = self.client.get(url)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(len(archive.namelist()), 2)
+
+        self.assertEqual(self.client.get(url, {'tailor_ids': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'tailor_ids': '999'}).status_code, 404)
+
+    def test_command_writes_zip(self):
+        self._seed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reports.zip')
+            out = io.StringIO()
+            call_command('export_tailor_reports', '--tailor', str(self.ana.id), '--workers', '1',
+                         '--output', path, stdout=out)
+            self.assertIn('Wrote 1 report(s)', out.getvalue())
+            with zipfile.ZipFile(path) as archive:
+                self.assertEqual(len(archive.namelist()), 1)
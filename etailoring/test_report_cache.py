@@ -0,0 +1,184 @@
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import Claim, Customer, Fabric, Order, Tailor
+from etailoring.report_cache import ReportCache
+from etailoring.report_generator import TailorReportGenerator
+
+
+class ReportCacheViewTest(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        cache_settings = override_settings(REPORT_CACHE_DIR=self.cache_dir, REPORT_CACHE_MAX_BYTES=10 * 1024 * 1024)
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client.force_login(self.admin)
+        self.url = reverse('etailoring:generate_admin_report', args=['financial'])
+
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+
+    def _download(self, url=None, **headers):
+        generate = mock.patch.object(
+            AdminReportGenerator, 'generate_report', autospec=True,
+            side_effect=AdminReportGenerator.generate_report
+        )
+        with generate as spy:
+            response = self.client.get(url or self.url, {'period': 'last_month'}, **headers)
+        return response, spy.call_count
+
+    def test_repeat_download_is_served_from_cache(self):
+        first, renders = self._download()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(renders, 1)
+        self.assertTrue(first['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', first)
+        body = b''.join(first.streaming_content)
+        self.assertTrue(body.startswith(b'%PDF'))
+
+        second, renders = self._download()
+        self.assertEqual(renders, 0)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(b''.join(second.streaming_content), body)
+
+    def test_conditional_requests(self):
+        first, _ = self._download()
+
+        response, renders = self._download(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        self.assertEqual(renders, 0)
+
+        response, _ = self._download(HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_data_changes_invalidate_cached_report(self):
+        self._download()
+
+        order = Order.objects.create(customer=self.customer, fabric=self.fabric, total_amount=Decimal('100.00'))
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+        order.status = 'IN_PROGRESS'
+        order.save()
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+        _, renders = self._download()
+        self.assertEqual(renders, 0)
+
+    def test_requester_is_part_of_the_key(self):
+        self._download()
+        other = User.objects.create_user(username='other', password='testpass123', is_staff=True,
+                                         first_name='Olga', last_name='Reyes')
+        self.client.force_login(other)
+
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+        _, renders = self._download()
+        self.assertEqual(renders, 0)
+
+    def test_name_and_claim_changes_invalidate_cached_report(self):
+        order = Order.objects.create(customer=self.customer, fabric=self.fabric, total_amount=Decimal('100.00'))
+        self._download()
+
+        customer_user = self.customer.user
+        customer_user.first_name = 'Renamed'
+        customer_user.save()
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+        self.customer.phone_number = '09179999999'
+        self.customer.save()
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+        claim = Claim.objects.create(order=order, recorded_by=self.admin)
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+        Claim.objects.filter(pk=claim.pk).update(reversed=True)
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+    def test_parameters_are_part_of_the_key(self):
+        self._download()
+        _, renders = self._download(reverse('etailoring:generate_admin_report', args=['business']))
+        self.assertEqual(renders, 1)
+
+    def test_tailor_report_is_cached(self):
+        tailor_user = User.objects.create_user(username='tailor', password='testpass123')
+        Tailor.objects.create(user=tailor_user, phone_number='09170000000', specialty='Suits')
+        self.client.force_login(tailor_user)
+
+        with mock.patch.object(
+            TailorReportGenerator, 'generate_report', autospec=True,
+            side_effect=TailorReportGenerator.generate_report
+        ) as spy:
+            self.client.get(reverse('etailoring:generate_tailor_report'))
+            response = self.client.get(reverse('etailoring:generate_tailor_report'))
+
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_login_does_not_invalidate_cached_report(self):
+        self._download()
+        self.client.force_login(self.customer.user)
+        self.client.force_login(self.admin)
+        _, renders = self._download()
+        self.assertEqual(renders, 0)
+
+    def test_requester_rename_invalidates_cached_report(self):
+        self._download()
+        self.admin.first_name = 'Renamed'
+        self.admin.save()
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+
+    @override_settings(REPORT_CACHE_MAX_BYTES=0)
+    def test_cache_can_be_disabled(self):
+        self._download()
+        _, renders = self._download()
+        self.assertEqual(renders, 1)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+class ReportCacheEvictionTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.cache = ReportCache(self.directory, max_bytes=250)
+
+    def _age(self, key, seconds_ago):
+        path = os.path.join(self.directory, key + '.data')
+        mtime = os.stat(path).st_mtime - seconds_ago
+        os.utime(path, (mtime, mtime))
+
+    def test_least_recently_used_reports_are_evicted(self):
+        for age, key in ((30, 'a'), (20, 'b')):
+            self.cache.put(key, b'x' * 100, f'{key}.pdf', 'application/pdf').file.close()
+            self._age(key, age)
+
+        # Reading 'a' makes 'b' the least recently used entry
+        self.cache.get('a').file.close()
+        self.cache.put('c', b'x' * 100, 'c.pdf', 'application/pdf').file.close()
+
+        self.assertIsNone(self.cache.get('b'))
+        for key in ('a', 'c'):
+            report = self.cache.get(key)
+            self.assertEqual(report.read(), b'x' * 100)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.data', 'a.json', 'c.data', 'c.json'])
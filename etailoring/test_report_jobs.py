@@ -0,0 +1,156 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring import report_jobs
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import ReportJob, Tailor
+
+
+class ReportJobTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root, REPORT_CACHE_DIR=os.path.join(self.media_root, 'cache'))
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        tailor_user = User.objects.create_user(
+            username='tailor', password='testpass123', first_name='Test', last_name='Tailor'
+        )
+        self.tailor = Tailor.objects.create(user=tailor_user, phone_number='09170000000', specialty='Suits')
+        self.client = APIClient()
+
+    def _enqueue_admin(self, report_type='inventory', **data):
+        self.client.force_authenticate(user=self.admin)
+        return self.client.post(reverse('etailoring:enqueue_admin_report_job', args=[report_type]), data)
+
+    def test_enqueue_returns_immediately_without_rendering(self):
+        with mock.patch.object(AdminReportGenerator, 'generate_report') as generate:
+            response = self._enqueue_admin(period='last_week')
+
+        self.assertEqual(response.status_code, 202)
+        generate.assert_not_called()
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertIsNone(response.data['download_url'])
+        job = ReportJob.objects.get(id=response.data['id'])
+        self.assertEqual(job.params['format'], 'pdf')
+        self.assertEqual(job.requested_by, self.admin)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self._enqueue_admin('payroll').status_code, 400)
+        self.assertEqual(self._enqueue_admin('tailor').status_code, 400)
+        self.assertEqual(self._enqueue_admin(date_from='03/01/2024', date_to='03/31/2024').status_code, 400)
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_run_job_stores_file_and_exposes_download(self):
+        job_id = self._enqueue_admin(period='last_month').data['id']
+
+        self.assertEqual(report_jobs.run_job(job_id), 'COMPLETED')
+
+        response = self.client.get(reverse('etailoring:report_job_detail', args=[job_id]))
+        self.assertEqual(response.data['status'], 'COMPLETED')
+        self.assertEqual(response.data['progress'], 100)
+        self.assertTrue(response.data['filename'].endswith('.pdf'))
+
+        download = self.client.get(response.data['download_url'])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(download.streaming_content).startswith(b'%PDF'))
+
+    def test_jobs_claimed_elsewhere_are_not_rendered_twice(self):
+        job_id = self._enqueue_admin(period='last_month').data['id']
+        self.assertEqual(report_jobs.claim_jobs(1), [job_id])
+
+        with mock.patch.object(report_jobs, 'render_report') as render:
+            self.assertEqual(report_jobs.run_job(job_id), 'RUNNING')
+        render.assert_not_called()
+
+        def requeued_and_reclaimed(*args):
+            # Another worker treats the job as stale and claims it again
+            ReportJob.objects.filter(id=job_id).update(started_at=timezone.now() - timedelta(hours=1))
+            report_jobs.requeue_stale_jobs(timedelta(minutes=10))
+            report_jobs.claim_jobs(1)
+            return original(*args)
+
+        original = report_jobs.render_report
+        with mock.patch.object(report_jobs, 'render_report', side_effect=requeued_and_reclaimed), \
+                self.assertLogs('etailoring.report_jobs', level='WARNING'):
+            self.assertEqual(report_jobs.run_claimed_job(job_id), 'RUNNING')
+        job = ReportJob.objects.get(id=job_id)
+        self.assertEqual((job.status, job.result.name), ('RUNNING', ''))
+
+    def test_progress_is_reported_while_rendering(self):
+        updates = []
+        generator = AdminReportGenerator(
+            'inventory', timezone.now() - timedelta(days=30), timezone.now(), self.admin,
+            progress_callback=lambda percent, message: updates.append((percent, message))
+        )
+        generator.generate_report()
+
+        percents = [percent for percent, _ in updates]
+        self.assertEqual(updates[0], (5, 'Collecting data'))
+        self.assertEqual(percents, sorted(percents))
+        self.assertEqual(percents[-1], 95)
+
+    def test_failed_job_records_error(self):
+        job_id = self._enqueue_admin('tailor', tailor_id=999999).data['id']
+
+        with self.assertLogs('etailoring.report_jobs', level='ERROR'):
+            self.assertEqual(report_jobs.run_job(job_id), 'FAILED')
+        job = ReportJob.objects.get(id=job_id)
+        self.assertIn('does not exist', job.error)
+        download = self.client.get(reverse('etailoring:report_job_download', args=[job_id]))
+        self.assertEqual(download.status_code, 409)
+
+    def test_tailor_jobs_are_private(self):
+        self.client.force_authenticate(user=self.tailor.user)
+        response = self.client.post(reverse('etailoring:enqueue_tailor_report_job'), {'period': 'all_time'})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['id']
+        self.assertEqual(ReportJob.objects.get(id=job_id).params['tailor_id'], self.tailor.id)
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(reverse('etailoring:report_job_detail', args=[job_id])).status_code, 404)
+        self.assertEqual(
+            self.client.post(reverse('etailoring:enqueue_tailor_report_job')).status_code, 403
+        )
+
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get(reverse('etailoring:report_job_detail', args=[job_id])).status_code, 200)
+
+    def test_worker_command_drains_queue(self):
+        first = self._enqueue_admin(period='last_week').data['id']
+        self.client.force_authenticate(user=self.tailor.user)
+        second = self.client.post(reverse('etailoring:enqueue_tailor_report_job')).data['id']
+
+        out = StringIO()
+        call_command('run_report_worker', workers=0, once=True, stdout=out)
+
+        self.assertEqual(
+            dict(ReportJob.objects.values_list('id', 'status')),
+            {first: 'COMPLETED', second: 'COMPLETED'}
+        )
+        self.assertIn(f'Report job {second}: COMPLETED', out.getvalue())
+
+    def test_jobs_are_claimed_once_and_stale_jobs_requeued(self):
+        job_id = self._enqueue_admin().data['id']
+
+        self.assertEqual(report_jobs.claim_jobs(5), [job_id])
+        self.assertEqual(report_jobs.claim_jobs(5), [])
+
+        ReportJob.objects.filter(id=job_id).update(started_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(report_jobs.requeue_stale_jobs(timedelta(minutes=30)), 1)
+        self.assertEqual(ReportJob.objects.get(id=job_id).status, 'PENDING')
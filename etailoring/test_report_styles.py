@@ -0,0 +1,84 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from reportlab.lib import colors
+
+from etailoring import report_utils
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import Claim, Customer, Fabric, Order
+
+
+class ReportStyleRegistryTest(TestCase):
+    def test_styles_are_built_once(self):
+        self.assertIs(report_utils.sample_styles(), report_utils.sample_styles())
+        # Equal colours built separately share the cached style
+        self.assertIs(
+            report_utils.section_style(colors.Color(0.2, 0.3, 0.8)),
+            report_utils.section_style(colors.Color(0.2, 0.3, 0.8)),
+        )
+        primary, stripe = colors.Color(0.2, 0.3, 0.8), colors.Color(0.9, 0.9, 0.95)
+        self.assertIs(
+            report_utils.grid_table_style(primary, stripe, font_size=9),
+            report_utils.grid_table_style(primary, stripe, font_size=9),
+        )
+        self.assertIsNot(
+            report_utils.grid_table_style(primary, stripe),
+            report_utils.grid_table_style(primary, stripe, totals_color=colors.purple),
+        )
+
+    def test_table_styles(self):
+        primary, stripe, accent = colors.blue, colors.lightgrey, colors.purple
+        commands = report_utils.grid_table_style(primary, stripe, totals_color=accent).getCommands()
+        self.assertIn(('BACKGROUND', (0, -1), (-1, -1), accent), commands)
+        self.assertIn(('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, stripe]), commands)
+
+        commands = report_utils.key_value_table_style(stripe, value_align='RIGHT').getCommands()
+        self.assertIn(('ALIGN', (1, 0), (1, -1), 'RIGHT'), commands)
+
+    def test_compact_table_sizes_multiline_rows(self):
+        table = report_utils.compact_table([['A', 'B'], ['one', 'two'], ['x', 'line\nbreak']], [50, 50])
+        header, single, double = table._argH
+        self.assertGreater(header, single)
+        self.assertAlmostEqual(double - single, report_utils.COMPACT_FONT_SIZE * 1.2)
+
+    def test_generators_share_cached_styles(self):
+        admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        now = timezone.now()
+        for report_type in ('business', 'inventory', 'sales'):
+            generator = AdminReportGenerator(report_type, now - timedelta(days=30), now, admin)
+            self.assertTrue(generator.generate_report().startswith(b'%PDF'))
+
+
+class ClaimsPdfExportTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        user = User.objects.create_user(username='customer', first_name='Cara', last_name='Cruz')
+        customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('10.00'), price_per_unit=Decimal('15.00')
+        )
+        for i in range(120):
+            order = Order.objects.create(
+                customer=customer, fabric=fabric, total_amount=Decimal('500.00'), inventory_deducted=True
+            )
+            Claim.objects.create(
+                order=order, claimant_name=f'Claimant {i}', recorded_by=self.admin,
+                notes='Picked up\nby a relative' if i % 2 else ''
+            )
+
+    def test_multi_page_pdf_in_one_query(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('etailoring:export_claims_report'), {'format': 'pdf'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+        self.assertGreater(response.content.count(b'/Type /Page\n'), 1)
+        self.assertEqual(len([q for q in ctx.captured_queries if 'etailoring_claim' in q['sql']]), 1)
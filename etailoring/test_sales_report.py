@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from etailoring import analytics
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import Customer, Fabric, Order, Tailor, Task
+
+
+class SalesReportTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        self.tailors = []
+        for first in ('Ana', 'Ben'):
+            tailor_user = User.objects.create_user(username=first.lower(), first_name=first, last_name='Tailor')
+            self.tailors.append(Tailor.objects.create(user=tailor_user, phone_number='0917', specialty='Suits'))
+
+    def _order(self, created_at, total, tailor=None):
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, total_amount=Decimal(total), inventory_deducted=True
+        )
+        Order.objects.filter(pk=order.pk).update(created_at=created_at)
+        if tailor:
+            Task.objects.create(order=order, tailor=tailor)
+        return order
+
+    def _at(self, day, hour=12):
+        return timezone.make_aware(datetime(2024, 3, day, hour, 0))
+
+    def _seed(self, per_day):
+        ana, ben = self.tailors
+        for day in (4, 5):
+            for i in range(per_day):
+                self._order(self._at(day, 8 + i % 10), '100.00', ana if i % 2 else ben)
+        self._order(self._at(5), '50.00')
+
+    def _generate(self):
+        start = self._at(1, 0)
+        end = self._at(31, 23)
+        generator = AdminReportGenerator('sales', start, end, self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            pdf = generator.generate_report()
+        return pdf, len(ctx.captured_queries)
+
+    def test_grouped_queries(self):
+        self._seed(per_day=3)
+        self._order(self._at(3) - timedelta(days=40), '999.00', self.tailors[0])  # outside the range
+        start, end = self._at(1, 0), self._at(31, 23)
+
+        self.assertEqual(analytics.revenue_by_day(start, end), [
+            (self._at(4).date(), Decimal('300.00')),
+            (self._at(5).date(), Decimal('350.00')),
+        ])
+        self.assertEqual(analytics.revenue_by_tailor(start, end), [
+            (self.tailors[1].id, 'Ben Tailor', Decimal('400.00')),
+            (self.tailors[0].id, 'Ana Tailor', Decimal('200.00')),
+        ])
+        self.assertEqual(len(analytics.revenue_by_tailor(start, end, limit=1)), 1)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        self._seed(per_day=2)
+        pdf, small = self._generate()
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+        self._seed(per_day=10)
+        _, large = self._generate()
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 4)
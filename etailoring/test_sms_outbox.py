@@ -0,0 +1,196 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring import sms_outbox
+from etailoring.business_logic import CommissionManager
+from etailoring.models import Customer, Fabric, Order, SmsOutbox, Tailor, Task
+from etailoring.sms_backends import MemoryBackend
+from etailoring.sms_service import SemaphoreSMS
+
+SENT = (True, [{'message_id': 1234, 'status': 'Pending'}])
+
+
+def _approval_fixture(phone_number='09171234567'):
+    user = User.objects.create_user(username='customer', first_name='Cara', last_name='Cruz')
+    customer = Customer.objects.create(user=user, phone_number=phone_number, address='Test')
+    fabric = Fabric.objects.create(
+        name='Cotton', unit_type='METERS', quantity=Decimal('10.00'), price_per_unit=Decimal('15.00')
+    )
+    tailor_user = User.objects.create_user(username='tailor', first_name='Ana')
+    tailor = Tailor.objects.create(user=tailor_user, phone_number='0917', specialty='Suits')
+    order = Order.objects.create(
+        customer=customer, fabric=fabric, garment_type='PANTS', status='COMPLETED',
+        total_amount=Decimal('500.00'), inventory_deducted=True
+    )
+    return Task.objects.create(order=order, tailor=tailor, status='COMPLETED')
+
+
+class ApproveTaskOutboxTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _approve(self, task):
+        return self.client.post(reverse('etailoring:admin_approve_task', args=[task.id]))
+
+    def test_approval_queues_sms_without_sending(self):
+        task = _approval_fixture()
+        with mock.patch.object(SemaphoreSMS, 'send_message') as send:
+            response = self._approve(task)
+
+        self.assertEqual(response.status_code, 200)
+        send.assert_not_called()
+        sms = SmsOutbox.objects.get()
+        self.assertEqual(sms.kind, 'READY_FOR_PICKUP')
+        self.assertEqual(sms.order_id, task.order_id)
+        self.assertEqual(sms.phone_number, '09171234567')
+        self.assertEqual(sms.status, 'PENDING')
+        self.assertIn(f'Order #{task.order_id}', sms.message)
+        self.assertIn('Cara Cruz', sms.message)
+
+    def test_failed_approval_queues_nothing(self):
+        task = _approval_fixture()
+        with mock.patch.object(CommissionManager, 'pay_commission', side_effect=RuntimeError('boom')):
+            response = self._approve(task)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(SmsOutbox.objects.exists())
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'COMPLETED')
+
+    def test_customer_without_phone_is_skipped(self):
+        task = _approval_fixture(phone_number='')
+        self.assertEqual(self._approve(task).status_code, 200)
+        self.assertFalse(SmsOutbox.objects.exists())
+
+    @override_settings(SMS_BACKEND='memory')
+    def test_approval_is_delivered_by_dispatcher(self):
+        MemoryBackend.reset()
+        task = _approval_fixture()
+        self.assertEqual(self._approve(task).status_code, 200)
+        self.assertEqual(MemoryBackend.outbox, [])
+
+        call_command('dispatch_sms_outbox', '--workers', '0', '--once', stdout=io.StringIO())
+        self.assertEqual([entry['recipient'] for entry in MemoryBackend.outbox], ['09171234567'])
+        self.assertIn('ready for pickup', MemoryBackend.outbox[0]['message'])
+        self.assertEqual(SmsOutbox.objects.get().status, 'SENT')
+
+    @override_settings(SMS_DISPATCH_ON_COMMIT=True)
+    def test_dispatch_on_commit(self):
+        with mock.patch.object(sms_outbox, 'send_in_background') as background:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                sms = sms_outbox.enqueue_sms('09171234567', 'Hello')
+                background.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        background.assert_called_once_with(sms.id)
+
+
+@override_settings(SMS_OUTBOX_MAX_ATTEMPTS=3, SMS_OUTBOX_RETRY_DELAY=60, SMS_OUTBOX_MAX_RETRY_DELAY=100)
+class OutboxDeliveryTest(TestCase):
+    def test_successful_send_records_provider_id(self):
+        sms = sms_outbox.enqueue_sms('09171234567', 'Hello')
+        with mock.patch.object(SemaphoreSMS, 'send_message', return_value=SENT) as send:
+            self.assertEqual(sms_outbox.deliver(sms.id), 'SENT')
+            # Delivered messages are never sent again
+            self.assertEqual(sms_outbox.deliver(sms.id), 'SENT')
+
+        send.assert_called_once_with('Hello', '09171234567')
+        sms.refresh_from_db()
+        self.assertEqual(sms.attempts, 1)
+        self.assertEqual(sms.provider_message_id, '1234')
+        self.assertIsNotNone(sms.sent_at)
+        self.assertIsNone(sms.locked_at)
+
+    def test_failures_back_off_then_give_up(self):
+        sms = sms_outbox.enqueue_sms('09171234567', 'Hello')
+        failure = (False, 'SMS API returned status 500')
+        with mock.patch.object(SemaphoreSMS, 'send_message', return_value=failure):
+            before = timezone.now()
+            self.assertEqual(sms_outbox.deliver(sms.id), 'PENDING')
+            sms.refresh_from_db()
+            self.assertGreaterEqual(sms.next_attempt_at, before + timedelta(seconds=60))
+            self.assertEqual(sms.last_error, 'SMS API returned status 500')
+
+            # Not due yet, so the dispatcher leaves it alone
+            self.assertEqual(sms_outbox.claim_messages(10), [])
+
+            with mock.patch.object(SemaphoreSMS, 'send_message', side_effect=RuntimeError('offline')):
+                self.assertEqual(sms_outbox.deliver(sms.id), 'PENDING')
+            self.assertEqual(sms_outbox.deliver(sms.id), 'FAILED')
+
+        sms.refresh_from_db()
+        self.assertEqual(sms.attempts, 3)
+        self.assertIsNone(sms.sent_at)
+
+    def test_retry_delay_doubles_up_to_cap(self):
+        self.assertEqual(
+            [sms_outbox.retry_delay(n).total_seconds() for n in (1, 2, 3)],
+            [60, 100, 100],
+        )
+
+    def test_claims_are_exclusive_and_stale_claims_requeue(self):
+        first = sms_outbox.enqueue_sms('0917', 'One')
+        second = sms_outbox.enqueue_sms('0918', 'Two')
+        self.assertEqual(sms_outbox.claim_messages(1), [first.id])
+        self.assertEqual(sms_outbox.claim_messages(5), [second.id])
+        self.assertEqual(sms_outbox.claim_messages(5), [])
+
+        SmsOutbox.objects.filter(id=first.id).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(sms_outbox.requeue_stale_messages(timedelta(minutes=10)), 1)
+        self.assertEqual(sms_outbox.claim_messages(5), [first.id])
+
+    def test_inline_delivery_leaves_claimed_messages_alone(self):
+        sms = sms_outbox.enqueue_sms('09171234567', 'Hello')
+        self.assertEqual(sms_outbox.claim_messages(1), [sms.id])
+
+        # e.g. the on-commit thread racing the dispatcher
+        with mock.patch.object(SemaphoreSMS, 'send_message', return_value=SENT) as send:
+            self.assertEqual(sms_outbox.deliver(sms.id), 'SENDING')
+        send.assert_not_called()
+
+        def requeued_and_reclaimed(*args):
+            SmsOutbox.objects.filter(id=sms.id).update(locked_at=timezone.now() - timedelta(hours=1))
+            sms_outbox.requeue_stale_messages(timedelta(minutes=10))
+            sms_outbox.claim_messages(1)
+            return SENT
+
+        with mock.patch.object(SemaphoreSMS, 'send_message', side_effect=requeued_and_reclaimed), \
+                self.assertLogs('etailoring.sms_outbox', level='WARNING'):
+            self.assertEqual(sms_outbox.deliver_claimed(sms.id), 'SENDING')
+        sms.refresh_from_db()
+        self.assertEqual((sms.status, sms.attempts), ('SENDING', 2))
+        self.assertIsNone(sms.sent_at)
+
+    def test_command_sends_due_messages_inline(self):
+        for number in ('0917', '0918'):
+            sms_outbox.enqueue_sms(number, 'Hello')
+        out = io.StringIO()
+        with mock.patch.object(SemaphoreSMS, 'send_message', return_value=SENT):
+            call_command('dispatch_sms_outbox', '--workers', '0', '--once', stdout=out)
+
+        self.assertIn('Sent 2, retrying 0, failed 0', out.getvalue())
+        self.assertEqual(SmsOutbox.objects.filter(status='SENT').count(), 2)
+
+
+class OutboxDispatcherPoolTest(TransactionTestCase):
+    def test_thread_pool_sends_each_message_once(self):
+        for i in range(6):
+            sms_outbox.enqueue_sms(f'0917{i}', f'Message {i}')
+        out = io.StringIO()
+        with mock.patch.object(SemaphoreSMS, 'send_message', return_value=SENT) as send:
+            call_command('dispatch_sms_outbox', '--workers', '3', '--once', '--poll-interval', '0',
+                         stdout=out)
+
+        self.assertEqual(send.call_count, 6)
+        self.assertEqual(SmsOutbox.objects.filter(status='SENT', attempts=1).count(), 6)
+        self.assertIn('Sent 6', out.getvalue())
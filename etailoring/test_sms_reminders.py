@@ -0,0 +1,122 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from etailoring import sms_reminders
+from etailoring.models import Customer, Fabric, Order, SmsOutbox, Tailor, Task
+
+
+class ReminderCampaignTest(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.today = timezone.localdate()
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('10.00'), price_per_unit=Decimal('15.00')
+        )
+        tailor_user = User.objects.create_user(username='tailor', first_name='Ana')
+        self.tailor = Tailor.objects.create(user=tailor_user, phone_number='0917', specialty='Suits')
+        self.customers = 0
+
+    def _order(self, phone_number='09171234567', approved_days_ago=None, **fields):
+        self.customers += 1
+        user = User.objects.create_user(username=f'customer{self.customers}', first_name='Cara', last_name='Cruz')
+        customer = Customer.objects.create(user=user, phone_number=phone_number, address='Test')
+        order = Order.objects.create(
+            customer=customer, fabric=self.fabric, total_amount=Decimal('500.00'), inventory_deducted=True,
+            **fields
+        )
+        if approved_days_ago is not None:
+            Task.objects.create(
+                order=order, tailor=self.tailor, status='APPROVED',
+                approved_at=self.now - timedelta(days=approved_days_ago)
+            )
+        return order
+
+    def test_pickup_reminders_go_to_old_unclaimed_orders_once(self):
+        waiting = self._order(status='APPROVED', approved_days_ago=5)
+        self._order(status='APPROVED', approved_days_ago=1)
+        self._order(status='APPROVED', approved_days_ago=5, claimed_at=self.now)
+        self._order(status='APPROVED', approved_days_ago=5, phone_number='')
+        self._order(status='COMPLETED', approved_days_ago=5)
+
+        stats = sms_reminders.queue_pickup_reminders(3)
+        self.assertEqual(stats, {'candidates': 1, 'already_queued': 0, 'queued': 1})
+        sms = SmsOutbox.objects.get()
+        self.assertEqual((sms.kind, sms.order_id, sms.status), ('PICKUP_REMINDER', waiting.id, 'PENDING'))
+        self.assertIn(f'Order #{waiting.id}', sms.message)
+        self.assertIn('Cara Cruz', sms.message)
+
+        self.assertEqual(sms_reminders.queue_pickup_reminders(3), {'candidates': 1, 'already_queued': 1, 'queued': 0})
+        self.assertEqual(SmsOutbox.objects.count(), 1)
+
+    def test_due_date_reminders_follow_rescheduling(self):
+        tomorrow = self.today + timedelta(days=1)
+        due = self._order(due_date=tomorrow)
+        self._order(due_date=tomorrow, status='CANCELLED')
+        self._order(due_date=tomorrow, claimed_at=self.now)
+        self._order(due_date=self.today + timedelta(days=3))
+
+        self.assertEqual(sms_reminders.queue_due_date_reminders()['queued'], 1)
+        self.assertEqual(sms_reminders.queue_due_date_reminders()['queued'], 0)
+        self.assertIn(f'{tomorrow:%b %d}', SmsOutbox.objects.get(order=due).message)
+
+        # Moved to the day after: reminded again on the eve of the new date
+        Order.objects.filter(id=due.id).update(due_date=tomorrow + timedelta(days=1))
+        self.assertEqual(sms_reminders.queue_due_date_reminders(today=tomorrow)['queued'], 1)
+        self.assertEqual(SmsOutbox.objects.filter(order=due, kind='DUE_DATE_REMINDER').count(), 2)
+
+    def test_reminders_queued_by_a_concurrent_run_are_not_counted(self):
+        first = self._order(status='APPROVED', approved_days_ago=5)
+        self._order(status='APPROVED', approved_days_ago=5)
+        original = SmsOutbox.objects.bulk_create
+
+        def concurrent_run_first(reminders, **kwargs):
+            # Another run queues the first reminder between the lookup and the insert
+            original([SmsOutbox(kind='PICKUP_REMINDER', order=first, phone_number='0917', message='Hi',
+                                dedupe_key=f'pickup-reminder:{first.id}')])
+            return original(reminders, **kwargs)
+
+        with mock.patch.object(SmsOutbox.objects, 'bulk_create', side_effect=concurrent_run_first):
+            stats = sms_reminders.queue_pickup_reminders(3)
+        self.assertEqual(stats, {'candidates': 2, 'already_queued': 1, 'queued': 1})
+        self.assertEqual(SmsOutbox.objects.count(), 2)
+
+    def test_orders_are_read_in_bounded_batches(self):
+        for _ in range(5):
+            self._order(status='APPROVED', approved_days_ago=5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            stats = sms_reminders.queue_pickup_reminders(3, batch_size=2)
+        self.assertEqual(stats['queued'], 5)
+        # Per batch: read orders, look up dedupe keys, bulk insert, count the
+        # inserted rows; then one empty read
+        queries = [q for q in ctx.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))]
+        self.assertEqual(len(queries), 4 * 3 + 1)
+        self.assertTrue(all('LIMIT 2' in q['sql'] for q in ctx.captured_queries if 'etailoring_order' in q['sql']
+                            and q['sql'].startswith('SELECT')))
+
+    def test_command(self):
+        self._order(status='APPROVED', approved_days_ago=5, due_date=self.today + timedelta(days=1))
+
+        out = io.StringIO()
+        call_command('send_reminders', '--dry-run', stdout=out)
+        self.assertIn('Pickup reminders: would queue 1', out.getvalue())
+        self.assertFalse(SmsOutbox.objects.exists())
+
+        out = io.StringIO()
+        call_command('send_reminders', '--pickup-after-days', '7', stdout=out)
+        self.assertIn('Pickup reminders: queued 0', out.getvalue())
+        self.assertIn('Due date reminders: queued 1', out.getvalue())
+
+        call_command('send_reminders', '--skip-due-date', stdout=io.StringIO())
+        self.assertEqual(
+            sorted(SmsOutbox.objects.values_list('kind', flat=True)), ['DUE_DATE_REMINDER', 'PICKUP_REMINDER']
+        )
@@ -0,0 +1,156 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from etailoring.rate_limit import TokenBucket
+from etailoring.sms_backends import ConsoleBackend, MemoryBackend, get_backend
+from etailoring.sms_service import SemaphoreSMS
+from etailoring.sms_stub import StubSemaphoreServer
+
+
+def semaphore_at(server, api_key='test-key'):
+    """Send through the semaphore backend to ``server``."""
+    return override_settings(SMS_BACKEND='semaphore', SEMAPHORE_API_URL=server.url, SEMAPHORE_API_KEY=api_key)
+
+
+class TokenBucketTest(TestCase):
+    def test_borrowed_tokens_queue_callers(self):
+        bucket = TokenBucket('test', rate=2, capacity=3)
+        now = timezone.now()
+        waits = [bucket.reserve(now=now) for _ in range(6)]
+        # Three tokens on hand, then one every half second in arrival order
+        self.assertEqual(waits, [0, 0, 0, 0.5, 1.0, 1.5])
+
+        # Refills never exceed the capacity
+        later = now + timedelta(minutes=5)
+        self.assertEqual([bucket.reserve(now=later) for _ in range(4)], [0, 0, 0, 0.5])
+
+        stats = bucket.stats()
+        self.assertEqual(stats['acquired'], 10)
+        self.assertEqual(stats['delayed'], 4)
+        self.assertAlmostEqual(stats['total_wait'], 3.5)
+        self.assertAlmostEqual(stats['max_wait'], 1.5)
+
+    def test_buckets_are_independent(self):
+        now = timezone.now()
+        TokenBucket('first', rate=1, capacity=1).reserve(now=now)
+        self.assertEqual(TokenBucket('second', rate=1, capacity=1).reserve(now=now), 0)
+        self.assertEqual(TokenBucket('first', rate=1, capacity=1).reserve(now=now), 1)
+
+    @override_settings(SEMAPHORE_RATE_LIMIT=120, SEMAPHORE_RATE_LIMIT_BURST=10)
+    def test_semaphore_limit_holds_over_any_minute(self):
+        bucket = SemaphoreSMS.rate_limiter()
+        self.assertEqual(bucket.capacity + bucket.rate * 60, 120)
+
+    @override_settings(SEMAPHORE_RATE_LIMIT=0)
+    def test_limit_can_be_disabled(self):
+        self.assertIsNone(SemaphoreSMS.rate_limiter())
+
+
+@override_settings(SEMAPHORE_RATE_LIMIT=602, SEMAPHORE_RATE_LIMIT_BURST=2)
+class SemaphoreRateLimitTest(TestCase):
+    def test_sends_are_queued_not_dropped(self):
+        with StubSemaphoreServer() as server, semaphore_at(server):
+            results = [SemaphoreSMS.send_message(f'Hello {i}', f'0917000000{i}') for i in range(6)]
+
+        self.assertTrue(all(success for success, _ in results))
+        self.assertEqual([response[0]['recipient'] for _, response in results],
+                         [f'0917000000{i}' for i in range(6)])
+        self.assertEqual(len(server.requests), 6)
+        self.assertEqual(server.requests[0][1]['apikey'], ['test-key'])
+
+        # Two go out at once, the rest at 10 per second
+        times = [request[0] for request in server.requests]
+        self.assertGreaterEqual(times[-1] - times[0], 0.35)
+        stats = SemaphoreSMS.rate_limiter().stats()
+        self.assertEqual(stats['acquired'], 6)
+        self.assertEqual(stats['delayed'], 4)
+        self.assertGreater(stats['max_wait'], 0)
+
+
+@override_settings(SEMAPHORE_RATE_LIMIT=0)
+class SemaphoreSessionTest(TestCase):
+    def test_parameters_are_posted_over_one_connection(self):
+        with StubSemaphoreServer() as server, semaphore_at(server):
+            for i in range(3):
+                self.assertTrue(SemaphoreSMS.send_message('Hello', f'0917000000{i}')[0])
+
+        self.assertEqual({path for _, _, path, _ in server.requests}, {'/api/v4/messages'})
+        self.assertEqual(server.requests[0][1]['apikey'], ['test-key'])
+        # Kept alive: every request came from the same client socket
+        self.assertEqual(len({client for _, _, _, client in server.requests}), 1)
+
+    def test_bulk_send_chunks_recipients(self):
+        numbers = [f'0917{i:07d}' for i in range(25)] + ['09170000003', '', None]
+        with StubSemaphoreServer() as server, semaphore_at(server):
+            success, result = SemaphoreSMS.send_bulk('Shop closed tomorrow', numbers, chunk_size=10)
+
+        self.assertTrue(success)
+        self.assertEqual([len(params['number'][0].split(',')) for _, params, _, _ in server.requests], [10, 10, 5])
+        self.assertEqual([entry['recipient'] for entry in result['messages']], [f'0917{i:07d}' for i in range(25)])
+        self.assertEqual(result['failed'], [])
+
+    def test_bulk_send_reports_failed_chunks(self):
+        with StubSemaphoreServer() as server, semaphore_at(server):
+            server.fail_with = 500
+            success, result = SemaphoreSMS.send_bulk('Hello', ['0917', '0918', '0919'], chunk_size=2)
+
+        self.assertFalse(success)
+        self.assertEqual(result['failed'], ['0917', '0918', '0919'])
+        self.assertEqual(len(result['errors']), 2)
+        self.assertIn('status 500', result['errors'][0])
+
+    def test_bulk_send_without_api_key_sends_nothing(self):
+        with StubSemaphoreServer() as server, semaphore_at(server, api_key=''):
+            success, result = SemaphoreSMS.send_bulk('Hello', ['0917'])
+        self.assertFalse(success)
+        self.assertEqual(len(server.requests), 0)
+        self.assertEqual(result['failed'], ['0917'])
+        self.assertEqual(result['errors'], ['Semaphore API key not configured'])
+
+
+class SmsBackendTest(TestCase):
+    def setUp(self):
+        MemoryBackend.reset()
+
+    def test_backend_is_chosen_by_setting(self):
+        with override_settings(SMS_BACKEND='console'):
+            self.assertIsInstance(get_backend(), ConsoleBackend)
+        with override_settings(SMS_BACKEND='etailoring.sms_backends.MemoryBackend'):
+            self.assertIsInstance(get_backend(), MemoryBackend)
+
+    @override_settings(SMS_BACKEND='memory')
+    def test_memory_backend_records_sends(self):
+        success, result = SemaphoreSMS.send_bulk('Closed tomorrow', ['0917', '0918', '0919'], chunk_size=2)
+        self.assertTrue(success)
+        self.assertTrue(SemaphoreSMS.notify_customer_ready_for_pickup('Cara', '0920', 7)[0])
+
+        self.assertEqual(MemoryBackend.requests, 3)
+        self.assertEqual([entry['recipient'] for entry in MemoryBackend.outbox], ['0917', '0918', '0919', '0920'])
+        self.assertIn('Order #7', MemoryBackend.outbox[-1]['message'])
+
+    @override_settings(SMS_BACKEND='memory', SMS_MEMORY_FAILURE_RATE=1)
+    def test_memory_backend_simulates_failures(self):
+        self.assertEqual(SemaphoreSMS.send_message('Hello', '0917'), (False, 'Simulated SMS failure'))
+        self.assertEqual(MemoryBackend.requests, 1)
+        self.assertEqual(MemoryBackend.outbox, [])
+
+    @override_settings(SMS_BACKEND='semaphore', SEMAPHORE_RATE_LIMIT=0)
+    def test_http_stub_backend_and_command(self):
+        out = io.StringIO()
+        with StubSemaphoreServer() as server, override_settings(SMS_STUB_URL=server.url):
+            call_command('test_sms', '09171234567', '--backend', 'http_stub', '--count', '3', stdout=out)
+
+        self.assertIn('Sent 3 of 3', out.getvalue())
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual([params['number'] for _, params, _, _ in server.requests], [['09171234567']] * 3)
+
+    def test_console_backend_prints_messages(self):
+        out = io.StringIO()
+        success, entries = ConsoleBackend(stream=out).send('Hello', '0917,0918')
+        self.assertTrue(success)
+        self.assertEqual(len(entries), 2)
+        self.assertIn('to 0918: Hello', out.getvalue())
@@ -0,0 +1,24 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from etailoring.management.commands.benchmark_startup import LAZY_MODULES, measure_startup
+
+
+class StartupImportTest(SimpleTestCase):
+    def test_report_modules_load_on_first_use(self):
+        _, imports = measure_startup()
+        self.assertIn('etailoring.views', imports)
+        self.assertIn('etailoring.admin_report_views', imports)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, imports)
+
+    def test_startup_within_budget(self):
+        out = StringIO()
+        call_command('benchmark_startup', '--top', '3', stdout=out)
+        self.assertIn('Startup is within budget', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('benchmark_startup', '--budget-ms', '1', stdout=StringIO())
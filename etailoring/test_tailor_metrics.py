@@ -0,0 +1,127 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring import analytics
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import Commission, Customer, Fabric, Order, Tailor, Task
+from etailoring.report_generator import TailorReportGenerator
+
+
+class TailorMetricsTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        self.ana = self._tailor('ana', 'Ana')
+        self.ben = self._tailor('ben', 'Ben')
+        self.now = timezone.now()
+
+    def _tailor(self, username, first_name):
+        tailor_user = User.objects.create_user(
+            username=username, password='testpass123', first_name=first_name, last_name='Tailor'
+        )
+        return Tailor.objects.create(user=tailor_user, phone_number='0917', specialty='Suits')
+
+    def _task(self, tailor, status, hours=None, commission=None, paid=False):
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, total_amount=Decimal('500.00'), inventory_deducted=True
+        )
+        task = Task.objects.create(order=order, tailor=tailor, status=status)
+        if hours is not None:
+            started = self.now - timedelta(hours=hours)
+            Task.objects.filter(pk=task.pk).update(started_at=started, completed_at=self.now)
+        if commission is not None:
+            Commission.objects.create(
+                tailor=tailor, order=order, amount=Decimal(commission), status='PAID' if paid else 'APPROVED'
+            )
+        return task
+
+    def _seed(self):
+        self._task(self.ana, 'APPROVED', hours=10, commission='100.00', paid=True)
+        self._task(self.ana, 'COMPLETED', hours=20, commission='50.00')
+        self._task(self.ana, 'IN_PROGRESS')
+        self._task(self.ben, 'ASSIGNED')
+
+    def test_metrics_for_all_tailors(self):
+        self._seed()
+        idle = self._tailor('cy', 'Cy')
+
+        metrics = analytics.tailor_metrics()
+        self.assertEqual([entry['tailor_id'] for entry in metrics], [self.ana.id, self.ben.id, idle.id])
+
+        ana = metrics[0]
+        self.assertEqual(ana['name'], 'Ana Tailor')
+        self.assertEqual(
+            (ana['assigned'], ana['in_progress'], ana['completed'], ana['approved'], ana['finished']), (3, 1, 1, 1, 2)
+        )
+        self.assertEqual(ana['completion_rate'], 66.7)
+        self.assertEqual(ana['avg_turnaround_hours'], 15.0)
+        self.assertEqual(
+            (ana['commission_count'], ana['commission_total'], ana['commission_paid'], ana['commission_pending']),
+            (2, Decimal('150.00'), Decimal('100.00'), Decimal('50.00'))
+        )
+        self.assertEqual(metrics[1]['completion_rate'], 0.0)
+        self.assertIsNone(metrics[2]['avg_turnaround_hours'])
+        self.assertEqual(metrics[2]['assigned'], 0)
+
+        self.assertEqual(analytics.tailor_metrics_for(self.ben)['assigned'], 1)
+        future = self.now + timedelta(days=1)
+        self.assertEqual(analytics.tailor_metrics_for(self.ana, start=future)['assigned'], 0)
+
+    def test_query_count_does_not_grow_with_tailors(self):
+        self._seed()
+        with CaptureQueriesContext(connection) as ctx:
+            analytics.tailor_metrics()
+        few = len(ctx.captured_queries)
+
+        for i in range(5):
+            tailor = self._tailor(f'extra{i}', f'Extra{i}')
+            self._task(tailor, 'COMPLETED', hours=5, commission='20.00')
+        with CaptureQueriesContext(connection) as ctx:
+            analytics.tailor_metrics()
+
+        self.assertEqual(len(ctx.captured_queries), few)
+        self.assertEqual(few, 3)
+
+    def test_reports_use_grouped_metrics(self):
+        self._seed()
+        start, end = self.now - timedelta(days=1), self.now + timedelta(days=1)
+
+        generator = AdminReportGenerator('custom', start, end, self.admin, metrics=['tailor_overview'])
+        with CaptureQueriesContext(connection) as ctx:
+            generator._create_tailor_overview()
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+        generator = TailorReportGenerator(self.ana, start, end, self.admin)
+        self.assertTrue(generator.generate_report().startswith(b'%PDF'))
+
+    def test_admin_stats_tailors(self):
+        self._seed()
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        response = client.get(reverse('etailoring:admin_stats_tailors'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['active_tailors'], 2)
+        self.assertEqual(response.data['tailors'][0]['commission_total'], 150.0)
+
+    def test_tailor_report_page(self):
+        self._seed()
+        self.client.force_login(self.ana.user)
+
+        response = self.client.get(reverse('etailoring:tailor_report_page'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_tasks'], 3)
+        self.assertEqual(response.context['completed_tasks'], 2)
+        self.assertEqual(response.context['pending_commissions'], Decimal('50.00'))
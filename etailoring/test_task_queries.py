@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from etailoring.models import Customer, Fabric, Accessory, Order, Tailor, Task, Commission
+
+
+class TaskListQueryCountTest(TestCase):
+    """Tailor and admin task lists must be served in a constant number of queries."""
+
+    def setUp(self):
+        customer_user = User.objects.create_user(
+            username='testcustomer', password='testpass123', first_name='Test', last_name='Customer'
+        )
+        self.customer = Customer.objects.create(
+            user=customer_user,
+            phone_number='1234567890',
+            address='123 Test St, Test City',
+            measurements='{"chest": 42, "waist": 36}'
+        )
+
+        tailor_user = User.objects.create_user(
+            username='testtailor', password='testpass123', first_name='Test', last_name='Tailor'
+        )
+        self.tailor = Tailor.objects.create(
+            user=tailor_user, phone_number='0987654321', specialty='Suits', commission_rate=Decimal('15.00')
+        )
+
+        self.fabric = Fabric.objects.create(
+            name='Wool', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('25.00')
+        )
+        self.button = Accessory.objects.create(name='Premium Button', quantity=1000, price_per_unit=Decimal('1.50'))
+        self.zipper = Accessory.objects.create(name='Gold Zipper', quantity=1000, price_per_unit=Decimal('5.00'))
+
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.client = APIClient()
+
+    def _create_tasks(self, count):
+        for i in range(count):
+            order = Order.objects.create(
+                customer=self.customer,
+                fabric=self.fabric,
+                garment_type='BLOUSE',
+                total_amount=Decimal('550.00'),
+                chest_bust_circumference=Decimal('90.00')
+            )
+            order.accessories.add(self.button, self.zipper)
+            Task.objects.create(order=order, tailor=self.tailor, status='APPROVED' if i % 2 else 'ASSIGNED')
+            if i % 2:
+                Commission.objects.create(tailor=self.tailor, amount=Decimal('180.00'), order=order)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_tailor_task_list_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.tailor.user)
+        url = reverse('etailoring:tailor_task_list')
+
+        self._create_tasks(2)
+        small_page_queries, _ = self._count_queries(url)
+
+        self._create_tasks(6)
+        full_page_queries, response = self._count_queries(url)
+
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertEqual(small_page_queries, full_page_queries)
+
+    def test_admin_task_list_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('etailoring:admin_task_list')
+
+        self._create_tasks(2)
+        small_page_queries, _ = self._count_queries(url)
+
+        self._create_tasks(6)
+        full_page_queries, _ = self._count_queries(url)
+
+        self.assertEqual(small_page_queries, full_page_queries)
+
+    def test_prefetched_fields_match_task_payload(self):
+        self.client.force_authenticate(user=self.admin)
+        self._create_tasks(2)
+
+        response = self.client.get(reverse('etailoring:admin_task_list'))
+        rows = {row['status']: row for row in response.data['results']}
+
+        self.assertEqual(rows['APPROVED']['commission_amount'], '180.00')
+        self.assertEqual(rows['ASSIGNED']['commission_amount'], '0.00')
+        for row in rows.values():
+            self.assertEqual(row['customer_name'], 'Test Customer')
+            self.assertEqual(row['customer_phone'], '1234567890')
+            self.assertEqual(row['order_details']['fabric'], 'Wool')
+            self.assertEqual(
+                sorted(a['name'] for a in row['order_details']['accessories']),
+                ['Gold Zipper', 'Premium Button']
+            )
+            self.assertIn('Chest Bust Circumference', row['order_measurements']['order_measurements'])
+            self.assertEqual(row['order_measurements']['customer_measurements']['Chest'], '42 cm')
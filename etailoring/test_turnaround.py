@@ -0,0 +1,134 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from etailoring import analytics
+from etailoring.admin_report_generator import AdminReportGenerator
+from etailoring.models import Customer, Fabric, Order, Tailor, Task
+
+
+class TurnaroundAnalyticsTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        user = User.objects.create_user(username='customer', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone_number='09171234567', address='Test')
+        self.fabric = Fabric.objects.create(
+            name='Cotton', unit_type='METERS', quantity=Decimal('1000.00'), price_per_unit=Decimal('15.00')
+        )
+        self.ana = self._tailor('ana', 'Ana')
+        self.ben = self._tailor('ben', 'Ben')
+        self.base = timezone.now() - timedelta(days=5)
+
+    def _tailor(self, username, first_name):
+        tailor_user = User.objects.create_user(username=username, first_name=first_name, last_name='Tailor')
+        return Tailor.objects.create(user=tailor_user, phone_number='0917', specialty='Suits')
+
+    def _task(self, tailor, garment_type, wait, work=None, lag=None):
+        """A task assigned at ``self.base`` whose stages took the given hours."""
+        order = Order.objects.create(
+            customer=self.customer, fabric=self.fabric, garment_type=garment_type,
+            total_amount=Decimal('500.00'), inventory_deducted=True
+        )
+        task = Task.objects.create(order=order, tailor=tailor)
+        started = self.base + timedelta(hours=wait)
+        completed = started + timedelta(hours=work) if work is not None else None
+        approved = completed + timedelta(hours=lag) if lag is not None else None
+        Task.objects.filter(pk=task.pk).update(
+            assigned_at=self.base, started_at=started, completed_at=completed, approved_at=approved
+        )
+        return task
+
+    def _seed(self):
+        # Ana: work times 2, 4, 6, 8 and 10 hours
+        for work in (2, 4, 6, 8, 10):
+            self._task(self.ana, 'DRESS', wait=1, work=work, lag=3)
+        self._task(self.ben, 'PANTS', wait=5, work=20)
+        self._task(self.ben, 'PANTS', wait=7)
+
+    def test_overall_distribution(self):
+        self._seed()
+        stats = analytics.turnaround_stats()
+
+        self.assertEqual(stats['work_time'], {'count': 6, 'mean_hours': 8.33, 'p50_hours': 6.0, 'p90_hours': 20.0})
+        self.assertEqual(stats['queue_wait']['count'], 7)
+        self.assertEqual(stats['queue_wait']['p90_hours'], 7.0)
+        self.assertEqual(stats['approval_lag'], {'count': 5, 'mean_hours': 3.0, 'p50_hours': 3.0, 'p90_hours': 3.0})
+
+    def test_grouped_by_tailor_and_garment(self):
+        self._seed()
+        by_tailor = analytics.turnaround_stats(group_by='tailor')
+        self.assertEqual([row['label'] for row in by_tailor], ['Ana Tailor', 'Ben Tailor'])
+        ana, ben = by_tailor
+        self.assertEqual(ana['key'], self.ana.id)
+        self.assertEqual((ana['work_time']['p50_hours'], ana['work_time']['p90_hours']), (6.0, 10.0))
+        self.assertEqual(ben['queue_wait'], {'count': 2, 'mean_hours': 6.0, 'p50_hours': 5.0, 'p90_hours': 7.0})
+        self.assertEqual(ben['approval_lag']['count'], 0)
+        self.assertIsNone(ben['approval_lag']['p50_hours'])
+
+        by_garment = {row['key']: row for row in analytics.turnaround_stats(group_by='garment_type')}
+        self.assertEqual(sorted(by_garment), ['DRESS', 'PANTS'])
+        self.assertEqual(by_garment['PANTS']['work_time']['mean_hours'], 20.0)
+        self.assertEqual(by_garment['DRESS']['label'], 'Dress')
+
+        with self.assertRaises(ValueError):
+            analytics.turnaround_stats(group_by='customer')
+
+    def test_range_applies_to_stage_end(self):
+        self._seed()
+        # Only the stages that ended within the first 3 hours after assignment
+        stats = analytics.turnaround_stats(self.base, self.base + timedelta(hours=3))
+        self.assertEqual(stats['queue_wait']['count'], 5)
+        self.assertEqual(stats['work_time']['count'], 0)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self._seed()
+        with CaptureQueriesContext(connection) as ctx:
+            analytics.turnaround_stats(group_by='garment_type')
+        few = len(ctx.captured_queries)
+
+        for _ in range(10):
+            self._task(self._tailor(f'extra{_}', 'Extra'), 'SKIRT', wait=2, work=3, lag=1)
+        with CaptureQueriesContext(connection) as ctx:
+            analytics.turnaround_stats(group_by='garment_type')
+        self.assertEqual(len(ctx.captured_queries), few)
+        self.assertEqual(few, 6)
+
+    def test_throughput(self):
+        self._seed()
+        series = analytics.task_throughput()
+        totals = {event: sum(counts[event] for _, counts in series)
+                  for event in ('assigned', 'started', 'completed', 'approved')}
+        self.assertEqual(totals, {'assigned': 7, 'started': 7, 'completed': 6, 'approved': 5})
+
+    def test_endpoints(self):
+        self._seed()
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        response = client.get(reverse('etailoring:admin_stats_turnaround'), {'group_by': 'tailor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['groups']), 2)
+
+        response = client.get(reverse('etailoring:admin_stats_turnaround'))
+        self.assertEqual(response.data['stages']['work_time']['count'], 6)
+
+        response = client.get(reverse('etailoring:admin_stats_turnaround'), {'group_by': 'customer'})
+        self.assertEqual(response.status_code, 400)
+
+        response = client.get(reverse('etailoring:admin_stats_throughput'), {'days': 30})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(day['completed'] for day in response.data['days']), 6)
+
+    def test_report_section(self):
+        self._seed()
+        generator = AdminReportGenerator(
+            'custom', self.base - timedelta(days=1), timezone.now(), self.admin, metrics=['turnaround']
+        )
+        self.assertTrue(generator.generate_report().startswith(b'%PDF'))
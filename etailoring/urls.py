@@ -3,6 +3,7 @@ from . import views
 from . import inventory_views
 from . import customer_views
 from . import admin_report_views
+from . import report_job_views
 
 app_name = 'etailoring'
 
@@ -100,11 +101,20 @@ urlpatterns = [
     path('api/generate-report/', views.tailor_report_api, name='tailor_report_api'),
     path('api/generate-report/<int:tailor_id>/', views.tailor_report_api, name='tailor_report_api_for_tailor'),
 
+    # Queued report jobs (rendered by the run_report_worker command)
+    path('api/report-jobs/admin/<str:report_type>/', report_job_views.enqueue_admin_report_job, name='enqueue_admin_report_job'),
+    path('api/report-jobs/tailor/', report_job_views.enqueue_tailor_report_job, name='enqueue_tailor_report_job'),
+    path('api/report-jobs/tailor/<int:tailor_id>/', report_job_views.enqueue_tailor_report_job, name='enqueue_tailor_report_job_for_tailor'),
+    path('api/report-jobs/<int:job_id>/', report_job_views.report_job_detail, name='report_job_detail'),
+    path('api/report-jobs/<int:job_id>/download/', report_job_views.report_job_download, name='report_job_download'),
+
     # Admin Report URLs
     path('admin-reports/', admin_report_views.admin_reports_page, name='admin_reports_page'),
     path('admin-reports/generate/<str:report_type>/', admin_report_views.generate_admin_report, name='generate_admin_report'),
     path('admin-claims/', admin_report_views.admin_claims_page, name='admin_claims_page'),
     path('admin-claims/export/', admin_report_views.export_claims_report, name='export_claims_report'),
+    path('admin-reports/export/<str:dataset>/', admin_report_views.export_csv, name='export_csv'),
+    path('admin-reports/tailors/export/', admin_report_views.export_tailor_reports, name='export_tailor_reports'),
     path('api/admin/claims/', admin_report_views.admin_claims_api, name='admin_claims_api'),
 
     # Admin Stats API URLs
@@ -113,6 +123,8 @@ urlpatterns = [
     path('api/admin/stats/commissions/', admin_report_views.admin_stats_commissions, name='admin_stats_commissions'),
     path('api/admin/stats/claims/', admin_report_views.admin_stats_claims, name='admin_stats_claims'),
     path('api/admin/stats/tailors/', admin_report_views.admin_stats_tailors, name='admin_stats_tailors'),
+    path('api/admin/stats/turnaround/', admin_report_views.admin_stats_turnaround, name='admin_stats_turnaround'),
+    path('api/admin/stats/throughput/', admin_report_views.admin_stats_throughput, name='admin_stats_throughput'),
 
     # Admin Charts API URLs
     path('api/admin/charts/revenue/', admin_report_views.admin_charts_revenue, name='admin_charts_revenue'),
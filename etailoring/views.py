@@ -1,4 +1,5 @@
 from rest_framework import generics, status
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
@@ -11,7 +12,8 @@ from django.utils import timezone
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db.models import Sum, Count
+from django.db import transaction
+from django.db.models import Sum, Count, Q
 from django.http import HttpResponse
 from datetime import datetime, timedelta
 from .models import (
@@ -23,9 +25,12 @@ from .serializers import (
     FabricSerializer, AccessorySerializer, OrderSerializer, 
     TaskSerializer, CommissionSerializer
 )
-from .business_logic import OrderManager, CommissionManager
-from .report_generator import TailorReportGenerator
-from .sms_service import SemaphoreSMS
+from .business_logic import OrderManager, CommissionManager, InventoryManager
+from . import analytics
+from .cache_utils import cached_for_orders
+from .report_cache import report_response
+from .report_jobs import render_report, resolve_report_period, tailor_report_params
+from .sms_outbox import enqueue_ready_for_pickup
 import logging
 
 logger = logging.getLogger(__name__)
@@ -452,9 +457,93 @@ class GarmentTypeListView(generics.ListAPIView):
 
 
 class OrderListCreateView(generics.ListCreateAPIView):
+    """
+    List/create orders.
+
+    Supported query parameters (empty values are ignored):
+    - status, payment_status, garment_type, category: exact match
+    - customer: customer id
+    - date_from / date_to: order creation date range (YYYY-MM-DD, inclusive)
+    - due_date_from / due_date_to: due date range (YYYY-MM-DD, inclusive)
+    - claimed: 'true' for claimed orders, 'false' for unclaimed ones
+    - ordering: one of ORDERING_FIELDS, optionally prefixed with '-'
+    - pagination=cursor (or any `cursor` parameter): keyset pagination on
+      (created_at, id) instead of page numbers; `ordering` is ignored
+    """
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+
+    EXACT_FILTERS = ('status', 'payment_status', 'garment_type', 'category')
+    ORDERING_FIELDS = ('created_at', 'due_date', 'total_amount', 'id')
+
+    def _use_cursor_pagination(self):
+        params = self.request.query_params
+        return params.get('pagination') == 'cursor' or 'cursor' in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self._use_cursor_pagination():
+                from .pagination import OrderCursorPagination
+                self._paginator = OrderCursorPagination()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
+    def get_queryset(self):
+        from django.utils.dateparse import parse_date
+        params = self.request.query_params
+        queryset = super().get_queryset()
+
+        for field in self.EXACT_FILTERS:
+            value = params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+
+        customer_id = params.get('customer')
+        if customer_id and customer_id.isdigit():
+            queryset = queryset.filter(customer_id=int(customer_id))
+
+        dates = {}
+        for name in ('date_from', 'date_to', 'due_date_from', 'due_date_to'):
+            try:
+                dates[name] = parse_date(params.get(name) or '')
+            except ValueError:
+                # Well formed but impossible, e.g. 2024-02-30
+                raise ParseError({'error': f'Invalid {name}. Use a valid YYYY-MM-DD date'})
+
+        # Compare created_at against datetime bounds (rather than __date) so the
+        # lookup stays an index range scan.
+        if dates['date_from']:
+            queryset = queryset.filter(
+                created_at__gte=timezone.make_aware(datetime.combine(dates['date_from'], datetime.min.time()))
+            )
+        if dates['date_to']:
+            queryset = queryset.filter(
+                created_at__lt=timezone.make_aware(
+                    datetime.combine(dates['date_to'] + timedelta(days=1), datetime.min.time())
+                )
+            )
+
+        if dates['due_date_from']:
+            queryset = queryset.filter(due_date__gte=dates['due_date_from'])
+        if dates['due_date_to']:
+            queryset = queryset.filter(due_date__lte=dates['due_date_to'])
+
+        claimed = (params.get('claimed') or '').lower()
+        if claimed in ('true', '1', 'yes'):
+            queryset = queryset.filter(claimed_at__isnull=False)
+        elif claimed in ('false', '0', 'no'):
+            queryset = queryset.filter(claimed_at__isnull=True)
+
+        if not self._use_cursor_pagination():
+            ordering = params.get('ordering')
+            if ordering and ordering.lstrip('-') in self.ORDERING_FIELDS:
+                # Secondary key keeps page boundaries deterministic
+                queryset = queryset.order_by(ordering, '-id' if ordering.startswith('-') else 'id')
+
+        return OrderSerializer.setup_eager_loading(queryset)
     
     def perform_create(self, serializer):
         """Override to add server-side logging and better error visibility."""
@@ -474,13 +563,16 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
 
+    def get_queryset(self):
+        return OrderSerializer.setup_eager_loading(super().get_queryset())
+
 
 class TaskListCreateView(generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     def get_queryset(self):
-        queryset = Task.objects.all().order_by('-id')
+        queryset = TaskSerializer.setup_eager_loading(Task.objects.all()).order_by('-id')
         status_param = self.request.query_params.get('status')
         if status_param:
             queryset = queryset.filter(status=status_param)
@@ -492,6 +584,9 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
 
+    def get_queryset(self):
+        return TaskSerializer.setup_eager_loading(super().get_queryset())
+
 
 class CommissionListView(generics.ListAPIView):
     queryset = Commission.objects.all()
@@ -510,37 +605,10 @@ def process_customer_payment(request, order_id):
         order = Order.objects.get(id=order_id)
         payment_type = request.data.get('payment_type', 'FULL_PAYMENT')
 
-        if payment_type == 'DOWN_PAYMENT':
-            # Process down payment only
-            order.down_payment_status = 'PAID'
-            order.down_payment_paid_at = timezone.now()
-            order.payment_status = 'DOWN_PAYMENT_PAID'
-
-        elif payment_type == 'REMAINING_PAYMENT':
-            # Process remaining balance (only if down payment was already paid)
-            if order.payment_status != 'DOWN_PAYMENT_PAID':
-                return Response({
-                    'detail': 'Down payment must be processed first.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-            order.payment_status = 'PAID'
-            order.paid_at = timezone.now()
-            order.remaining_balance = 0  # Set remaining balance to zero when fully paid
-
-        elif payment_type == 'FULL_PAYMENT':
-            # Process full payment at once
-            order.payment_status = 'PAID'
-            order.paid_at = timezone.now()
-            order.down_payment_status = 'PAID'
-            order.down_payment_paid_at = timezone.now()
-            order.remaining_balance = 0  # Set remaining balance to zero when fully paid
-
-        else:
-            return Response({
-                'detail': 'Invalid payment type. Use DOWN_PAYMENT, FULL_PAYMENT, or REMAINING_PAYMENT.'
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        order.save()
+        try:
+            OrderManager.process_payment(order, payment_type)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
             'detail': 'Payment processed successfully.',
@@ -557,6 +625,29 @@ def process_customer_payment(request, order_id):
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _compute_payment_summary():
+    """Payment statistics for every payment status in a single aggregate query."""
+    pending = Q(payment_status='PENDING')
+    down_payment = Q(payment_status='DOWN_PAYMENT_PAID')
+    paid = Q(payment_status='PAID')
+
+    # For the admin summary we want the 'pending' card to reflect the pending down-payment amounts
+    # (i.e., the amounts customers still owe as down payments), so aggregate down_payment_amount
+    # for orders whose payment_status is PENDING. Keep full payment totals as before.
+    totals = Order.objects.aggregate(
+        pending_count=Count('id', filter=pending),
+        pending_amount=Sum('down_payment_amount', filter=pending),
+        pending_total_amount=Sum('total_amount', filter=pending),
+        down_payment_count=Count('id', filter=down_payment),
+        down_payment_amount=Sum('down_payment_amount', filter=down_payment),
+        full_payment_count=Count('id', filter=paid),
+        full_payment_amount=Sum('total_amount', filter=paid),
+    )
+    summary = {key: value or 0 for key, value in totals.items()}
+    summary['total_revenue'] = summary['full_payment_amount']
+    return summary
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def payment_summary(request):
@@ -564,27 +655,7 @@ def payment_summary(request):
     API endpoint to get payment summary statistics.
     """
     try:
-        from django.db.models import Count, Sum
-
-        # Get payment statistics
-        pending_orders = Order.objects.filter(payment_status='PENDING')
-        down_payment_orders = Order.objects.filter(payment_status='DOWN_PAYMENT_PAID')
-        paid_orders = Order.objects.filter(payment_status='PAID')
-
-        # For the admin summary we want the 'pending' card to reflect the pending down-payment amounts
-        # (i.e., the amounts customers still owe as down payments), so aggregate down_payment_amount
-        # for orders whose payment_status is PENDING. Keep full payment totals as before.
-        summary = {
-            'pending_count': pending_orders.count(),
-            'pending_amount': pending_orders.aggregate(total=Sum('down_payment_amount'))['total'] or 0,
-            'pending_total_amount': pending_orders.aggregate(total=Sum('total_amount'))['total'] or 0,
-            'down_payment_count': down_payment_orders.count(),
-            'down_payment_amount': down_payment_orders.aggregate(total=Sum('down_payment_amount'))['total'] or 0,
-            'full_payment_count': paid_orders.count(),
-            'full_payment_amount': paid_orders.aggregate(total=Sum('total_amount'))['total'] or 0,
-            'total_revenue': paid_orders.aggregate(total=Sum('total_amount'))['total'] or 0
-        }
-
+        summary = cached_for_orders('payment_summary', _compute_payment_summary)
         return Response(summary, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -609,38 +680,20 @@ def approve_task(request, task_id):
             return Response({'detail': 'Task must be completed before it can be approved.'},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # Use business logic to approve task and create commission
-        commission = OrderManager.approve_task(task)
+        with transaction.atomic():
+            # Use business logic to approve task and create commission
+            commission = OrderManager.approve_task(task)
 
-        # Automatically pay the commission
-        commission.status = 'PAID'
-        commission.paid_at = timezone.now()
-        commission.save()
+            # Automatically pay the commission
+            CommissionManager.pay_commission(commission)
 
-        # NOTE: We do NOT auto-claim the order here anymore.
-        # The user wants "Mark Claimed" to be visible AFTER approval.
-        # So order status remains 'APPROVED' (set by OrderManager.approve_task).
+            # NOTE: We do NOT auto-claim the order here anymore.
+            # The user wants "Mark Claimed" to be visible AFTER approval.
+            # So order status remains 'APPROVED' (set by OrderManager.approve_task).
 
-        # Send SMS notification to customer that garment is ready for pickup
-        try:
-            customer = task.order.customer
-            customer_name = customer.user.get_full_name() or customer.user.username
-            customer_phone = customer.phone_number
-            order_id = task.order.id
-            
-            sms_success, sms_message = SemaphoreSMS.notify_customer_ready_for_pickup(
-                customer_name=customer_name,
-                customer_phone=customer_phone,
-                order_id=order_id
-            )
-            
-            if sms_success:
-                logger.info(f'SMS notification sent to customer {customer_name} for Order #{order_id}')
-            else:
-                logger.warning(f'Failed to send SMS to customer {customer_name}: {sms_message}')
-                
-        except Exception as e:
-            logger.error(f'Error sending SMS notification for task {task_id}: {str(e)}')
+            # Queue the ready-for-pickup SMS with the approval; the
+            # dispatch_sms_outbox worker sends it once this commits
+            enqueue_ready_for_pickup(task.order)
 
         return Response({
             'detail': 'Task approved and commission paid successfully. Order is now APPROVED and ready for claim.',
@@ -684,17 +737,10 @@ def pay_commission_for_task(request, task_id):
         except Commission.DoesNotExist:
             # If no commission exists, create one using CommissionManager so we
             # respect fixed tariffs defined on the Tailor model.
-            amount = CommissionManager.calculate_commission(task)
-            commission = Commission.objects.create(
-                tailor=task.tailor,
-                amount=amount,
-                order=task.order
-            )
+            commission = CommissionManager.create_commission(task)
         
         # Pay the commission
-        commission.status = 'PAID'
-        commission.paid_at = timezone.now()
-        commission.save()
+        CommissionManager.pay_commission(commission)
         
         return Response({
             'detail': 'Commission paid successfully.',
@@ -714,9 +760,7 @@ def pay_commission_for_task(request, task_id):
 def pay_commission(request, commission_id):
     try:
         commission = Commission.objects.get(id=commission_id)
-        commission.status = 'PAID'
-        commission.paid_at = timezone.now()
-        commission.save()
+        CommissionManager.pay_commission(commission)
         return Response({'detail': 'Commission paid successfully.'}, 
                         status=status.HTTP_200_OK)
     except Commission.DoesNotExist:
@@ -867,8 +911,7 @@ def restock_fabric(request, fabric_id):
                             status=status.HTTP_400_BAD_REQUEST)
         
         # Update the fabric quantity
-        fabric.quantity = float(fabric.quantity) + float(quantity)
-        fabric.save()
+        InventoryManager.restock(fabric, quantity, user=request.user)
         
         return Response({
             'detail': f'Successfully restocked {quantity} units of {fabric.name}.',
@@ -899,8 +942,7 @@ def restock_accessory(request, accessory_id):
                             status=status.HTTP_400_BAD_REQUEST)
         
         # Update the accessory quantity
-        accessory.quantity = int(accessory.quantity) + int(quantity)
-        accessory.save()
+        InventoryManager.restock(accessory, quantity, user=request.user)
         
         return Response({
             'detail': f'Successfully restocked {quantity} units of {accessory.name}.',
@@ -971,7 +1013,9 @@ class TailorTaskListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Task.objects.filter(tailor__user=self.request.user)
+        return TaskSerializer.setup_eager_loading(
+            Task.objects.filter(tailor__user=self.request.user)
+        ).order_by('-id')
 
 
 class TailorTaskDetailView(generics.RetrieveUpdateAPIView):
@@ -979,7 +1023,9 @@ class TailorTaskDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Task.objects.filter(tailor__user=self.request.user)
+        return TaskSerializer.setup_eager_loading(
+            Task.objects.filter(tailor__user=self.request.user)
+        )
 
 
 class TailorCommissionListView(generics.ListAPIView):
@@ -1000,7 +1046,9 @@ class CustomerOrderListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Order.objects.filter(customer__user=self.request.user)
+        return OrderSerializer.setup_eager_loading(
+            Order.objects.filter(customer__user=self.request.user)
+        )
 
 
 class CustomerOrderDetailView(generics.RetrieveAPIView):
@@ -1008,7 +1056,9 @@ class CustomerOrderDetailView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Order.objects.filter(customer__user=self.request.user)
+        return OrderSerializer.setup_eager_loading(
+            Order.objects.filter(customer__user=self.request.user)
+        )
 
 
 @login_required
@@ -1060,39 +1110,19 @@ def tailor_report_page(request):
             try:
                 tailor = Tailor.objects.get(user=request.user)
 
-                # Get some basic stats for the page
-                total_tasks = Task.objects.filter(tailor=tailor).count()
-                completed_tasks = Task.objects.filter(tailor=tailor, status__in=['COMPLETED', 'APPROVED']).count()
-                in_progress_tasks = Task.objects.filter(tailor=tailor, status='IN_PROGRESS').count()
-
-                # Get commission statistics safely
-                try:
-                    total_commissions = Commission.objects.filter(tailor=tailor).aggregate(
-                        total=Sum('amount')
-                    )['total'] or 0
-
-                    paid_commissions = Commission.objects.filter(tailor=tailor, status='PAID').aggregate(
-                        total=Sum('amount')
-                    )['total'] or 0
-
-                    pending_commissions = total_commissions - paid_commissions
-                except Exception:
-                    total_commissions = 0
-                    paid_commissions = 0
-                    pending_commissions = 0
-
-                # Calculate completion rate
-                completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+                # Get some basic stats for the page (all time)
+                metrics = analytics.tailor_metrics_for(tailor)
 
                 context = {
                     'tailor': tailor,
-                    'total_tasks': total_tasks,
-                    'completed_tasks': completed_tasks,
-                    'in_progress_tasks': in_progress_tasks,
-                    'total_commissions': total_commissions,
-                    'paid_commissions': paid_commissions,
-                    'pending_commissions': pending_commissions,
-                    'completion_rate': completion_rate,
+                    'total_tasks': metrics['assigned'],
+                    'completed_tasks': metrics['finished'],
+                    'in_progress_tasks': metrics['in_progress'],
+                    'total_commissions': metrics['commission_total'],
+                    'paid_commissions': metrics['commission_paid'],
+                    'pending_commissions': metrics['commission_total'] - metrics['commission_paid'],
+                    'completion_rate': metrics['completion_rate'],
+                    'avg_turnaround_hours': metrics['avg_turnaround_hours'],
                     'now': timezone.now(),
                 }
 
@@ -1124,57 +1154,17 @@ def generate_tailor_report(request, tailor_id=None):
                 return HttpResponse("Access denied. You are not registered as a tailor.", status=403)
 
         # Get date range parameters
-        date_from_str = request.GET.get('date_from')
-        date_to_str = request.GET.get('date_to')
-        period = request.GET.get('period', 'last_month')
-
-        # Parse date range
-        if date_from_str and date_to_str:
-            date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
-            date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date()
-        else:
-            # Use predefined periods
-            today = timezone.now().date()
-            if period == 'last_week':
-                date_from = today - timedelta(days=7)
-                date_to = today
-            elif period == 'last_month':
-                date_from = today - timedelta(days=30)
-                date_to = today
-            elif period == 'last_quarter':
-                date_from = today - timedelta(days=90)
-                date_to = today
-            elif period == 'ytd':
-                date_from = today.replace(month=1, day=1)
-                date_to = today
-            elif period == 'all_time':
-                date_from = tailor.user.date_joined.date()
-                date_to = today
-            else:
-                date_from = today - timedelta(days=30)
-                date_to = today
-
-        # Convert to datetime with timezone
-        date_from = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
-        date_to = timezone.make_aware(datetime.combine(date_to, datetime.max.time()))
-
-        # Generate report
-        report_generator = TailorReportGenerator(
-            tailor=tailor,
-            date_from=date_from,
-            date_to=date_to,
-            generated_by=request.user
+        date_from, date_to = resolve_report_period(
+            request.GET.get('period', 'last_month'),
+            request.GET.get('date_from'),
+            request.GET.get('date_to'),
+            all_time_start=tailor.user.date_joined.date(),
         )
 
-        pdf_data = report_generator.generate_report()
-        filename = report_generator.get_filename()
-
-        # Return PDF response
-        response = HttpResponse(pdf_data, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = len(pdf_data)
-
-        return response
+        # Generate report (served from the report cache when the data is unchanged)
+        params = tailor_report_params(tailor, date_from, date_to)
+        report = render_report('TAILOR', 'tailor', params, request.user)
+        return report_response(request, report)
 
     except Exception as e:
         return HttpResponse(f"Error generating report: {str(e)}", status=500)
@@ -1198,52 +1188,21 @@ def tailor_report_api(request, tailor_id=None):
                 return Response({'error': 'Access denied. You are not registered as a tailor.'}, status=403)
 
         # Get parameters
-        period = request.GET.get('period', 'last_month')
-        date_from_str = request.GET.get('date_from')
-        date_to_str = request.GET.get('date_to')
-
-        # Parse date range (same logic as above)
-        if date_from_str and date_to_str:
-            try:
-                date_from = datetime.strptime(date_from_str, '%Y-%m-%d').date()
-                date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=400)
-        else:
-            today = timezone.now().date()
-            if period == 'last_week':
-                date_from = today - timedelta(days=7)
-                date_to = today
-            elif period == 'last_month':
-                date_from = today - timedelta(days=30)
-                date_to = today
-            elif period == 'last_quarter':
-                date_from = today - timedelta(days=90)
-                date_to = today
-            elif period == 'ytd':
-                date_from = today.replace(month=1, day=1)
-                date_to = today
-            elif period == 'all_time':
-                date_from = tailor.user.date_joined.date()
-                date_to = today
-            else:
-                date_from = today - timedelta(days=30)
-                date_to = today
-
-        # Convert to datetime with timezone
-        date_from = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
-        date_to = timezone.make_aware(datetime.combine(date_to, datetime.max.time()))
+        try:
+            date_from, date_to = resolve_report_period(
+                request.GET.get('period', 'last_month'),
+                request.GET.get('date_from'),
+                request.GET.get('date_to'),
+                all_time_start=tailor.user.date_joined.date(),
+            )
+        except ValueError:
+            return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=400)
 
         # Generate report
-        report_generator = TailorReportGenerator(
-            tailor=tailor,
-            date_from=date_from,
-            date_to=date_to,
-            generated_by=request.user
-        )
-
-        pdf_data = report_generator.generate_report()
-        filename = report_generator.get_filename()
+        params = tailor_report_params(tailor, date_from, date_to)
+        report = render_report('TAILOR', 'tailor', params, request.user)
+        pdf_data = report.read()
+        filename = report.filename
 
         # Return PDF as base64 for API consumption
         import base64
@@ -148,6 +148,20 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10
 }
 
+# Seconds that order-derived summaries (e.g. the payment summary) may be
+# served from cache; any Order save/delete invalidates them sooner. 0 disables.
+ORDERS_CACHE_TIMEOUT = 30
+
+# Generated PDF/CSV reports are cached on disk, keyed by their parameters and
+# a watermark of the underlying data; least recently used files are evicted
+# beyond REPORT_CACHE_MAX_BYTES. 0 disables the cache.
+REPORT_CACHE_DIR = os.path.join(BASE_DIR, 'report_cache')
+REPORT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Worker processes used to render batch tailor report exports; None uses one
+# per CPU core.
+REPORT_BATCH_WORKERS = None
+
 # Authentication settings
 LOGIN_URL = 'etailoring:login'
 LOGIN_REDIRECT_URL = 'etailoring:homepage'
@@ -156,4 +170,35 @@ LOGOUT_REDIRECT_URL = 'etailoring:homepage'
 # Semaphore SMS Configuration
 # Replace 'your-api-key-here' with your actual Semaphore API key
 SEMAPHORE_API_KEY = os.getenv('SEMAPHORE_API_KEY', 'fa0f4ff77ba74de0b8e74be14735e951')
-SEMAPHORE_SENDER_NAME = 'elsenior'
\ No newline at end of file
+SEMAPHORE_SENDER_NAME = 'elsenior'
+
+# Requests per minute allowed by Semaphore, shared by all processes through a
+# database-backed token bucket; sends beyond it wait for their turn. Up to
+# SEMAPHORE_RATE_LIMIT_BURST of them may go out back to back. 0 disables.
+SEMAPHORE_RATE_LIMIT = 120
+SEMAPHORE_RATE_LIMIT_BURST = 10
+# Recipients per request for SemaphoreSMS.send_bulk (Semaphore allows 1000)
+SEMAPHORE_BULK_CHUNK_SIZE = 1000
+
+# Where SMS go (see etailoring/sms_backends.py): 'semaphore' (live API),
+# 'http_stub' (manage.py run_sms_stub at SMS_STUB_URL), 'console' or
+# 'memory'. The memory backend waits SMS_MEMORY_LATENCY seconds per request
+# and fails SMS_MEMORY_FAILURE_RATE of them, for offline load tests.
+SMS_BACKEND = os.getenv('SMS_BACKEND', 'semaphore')
+SMS_STUB_URL = 'http://127.0.0.1:8025/api/v4/messages'
+SMS_MEMORY_LATENCY = 0
+SMS_MEMORY_FAILURE_RATE = 0
+
+# SMS outbox (see etailoring/sms_outbox.py): failed sends are retried after
+# SMS_OUTBOX_RETRY_DELAY seconds, doubling up to SMS_OUTBOX_MAX_RETRY_DELAY,
+# until SMS_OUTBOX_MAX_ATTEMPTS. SMS_DISPATCH_ON_COMMIT also sends each message
+# from a background thread as soon as its transaction commits, for setups
+# without a running dispatch_sms_outbox worker.
+SMS_OUTBOX_MAX_ATTEMPTS = 5
+SMS_OUTBOX_RETRY_DELAY = 60
+SMS_OUTBOX_MAX_RETRY_DELAY = 3600
+SMS_DISPATCH_ON_COMMIT = False
+
+# Days an approved order may wait unclaimed before manage.py send_reminders
+# queues a pickup reminder for it.
+SMS_PICKUP_REMINDER_DAYS = 3
\ No newline at end of file